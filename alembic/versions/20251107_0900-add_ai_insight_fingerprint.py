@@ -0,0 +1,41 @@
+"""add_ai_insight_fingerprint
+
+Revision ID: add_ai_insight_fingerprint
+Revises: add_text_library
+Create Date: 2025-11-07 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_ai_insight_fingerprint'
+down_revision: Union[str, None] = 'add_text_library'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ai_insights', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.create_index(
+        'idx_ai_insights_professional_fingerprint',
+        'ai_insights',
+        ['professional_id', 'fingerprint', 'created_at'],
+    )
+    op.create_index(
+        'idx_ai_insights_related_students_gin',
+        'ai_insights',
+        ['related_students'],
+        postgresql_using='gin',
+    )
+    op.create_index('ix_ai_insights_expires_at', 'ai_insights', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_insights_expires_at', table_name='ai_insights')
+    op.drop_index('idx_ai_insights_related_students_gin', table_name='ai_insights')
+    op.drop_index('idx_ai_insights_professional_fingerprint', table_name='ai_insights')
+    op.drop_column('ai_insights', 'fingerprint')
@@ -0,0 +1,31 @@
+"""add_cache_versions_table
+
+Revision ID: add_cache_versions
+Revises: add_ai_insight_fingerprint
+Create Date: 2025-11-07 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_cache_versions'
+down_revision: Union[str, None] = 'add_ai_insight_fingerprint'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=100), primary_key=True, nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
@@ -0,0 +1,47 @@
+"""add_text_library_search
+
+Revision ID: add_text_library_search
+Revises: add_cache_versions
+Create Date: 2025-11-07 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_text_library_search'
+down_revision: Union[str, None] = 'add_cache_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(subtitle, '')), 'B') || "
+    "setweight(to_tsvector('portuguese', coalesce(content, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    op.add_column(
+        'text_library',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+    )
+    
+    op.create_index(
+        'idx_text_library_search_vector',
+        'text_library',
+        ['search_vector'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_text_library_search_vector', table_name='text_library')
+    op.drop_column('text_library', 'search_vector')
@@ -0,0 +1,48 @@
+"""add_text_indexing_columns
+
+Revision ID: add_text_indexing_columns
+Revises: add_text_library_search
+Create Date: 2025-11-07 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_text_indexing_columns'
+down_revision: Union[str, None] = 'add_text_library_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('text_library', 'trail_stories')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('syllable_count', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('readability_score', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('letter_frequency', postgresql.JSONB(), nullable=True))
+        op.add_column(table, sa.Column('grapheme_frequency', postgresql.JSONB(), nullable=True))
+        
+        op.create_index(f'ix_{table}_readability_score', table, ['readability_score'])
+        op.create_index(
+            f'idx_{table}_grapheme_frequency_gin',
+            table,
+            ['grapheme_frequency'],
+            postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f'idx_{table}_grapheme_frequency_gin', table_name=table)
+        op.drop_index(f'ix_{table}_readability_score', table_name=table)
+        op.drop_column(table, 'grapheme_frequency')
+        op.drop_column(table, 'letter_frequency')
+        op.drop_column(table, 'readability_score')
+        op.drop_column(table, 'syllable_count')
@@ -0,0 +1,39 @@
+"""add_revoked_tokens_table
+
+Revision ID: add_revoked_tokens
+Revises: add_text_indexing_columns
+Create Date: 2025-11-07 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_revoked_tokens'
+down_revision: Union[str, None] = 'add_text_indexing_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(length=64), primary_key=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_revoked_tokens_user_id', 'revoked_tokens', ['user_id'])
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_user_id', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
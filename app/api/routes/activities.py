@@ -23,7 +23,11 @@ async def create_activity(
     current_user: User = Depends(get_current_active_user),
 ):
     service = ActivityService(db)
-    activity = await service.create_activity(current_user.id, data)
+    activity = await service.create_activity(
+        current_user.id,
+        data,
+        scope_to_professional=current_user.role.value == "professional",
+    )
     return activity
 
 
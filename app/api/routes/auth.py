@@ -1,9 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.services.auth_service import AuthService
-from app.schemas.auth import LoginRequest, Token, UserResponse, RefreshTokenRequest
-from app.utils.dependencies import get_current_active_user
+from app.schemas.auth import LoginRequest, LogoutRequest, Token, UserResponse, RefreshTokenRequest
+from app.utils.dependencies import (
+    get_current_active_user,
+    get_current_admin,
+    get_token_payload,
+    limit_login_attempts,
+    login_rate_limiter,
+)
+from app.utils.password import password_pool
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["autenticação"])
@@ -13,12 +21,20 @@ router = APIRouter(prefix="/auth", tags=["autenticação"])
 async def login(
     login_data: LoginRequest,
     db: AsyncSession = Depends(get_db),
+    rate_limit_key: str = Depends(limit_login_attempts),
 ):
     auth_service = AuthService(db)
-    result = await auth_service.authenticate_user(
-        email=login_data.email,
-        password=login_data.password,
-    )
+    try:
+        result = await auth_service.authenticate_user(
+            email=login_data.email,
+            password=login_data.password,
+        )
+    except HTTPException as exc:
+        # Só falhas de credencial contam para o limite
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            login_rate_limiter.record(rate_limit_key)
+        raise
+    login_rate_limiter.reset(rate_limit_key)
     return result
 
 
@@ -32,6 +48,18 @@ async def refresh_token(
     return result
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    data: Optional[LogoutRequest] = None,
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+):
+    """Revoga o access token atual e, se informado, o refresh token."""
+    auth_service = AuthService(db)
+    await auth_service.logout(payload, data.refresh_token if data else None)
+    return None
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: User = Depends(get_current_active_user),
@@ -43,3 +71,10 @@ async def get_current_user_info(
         role=current_user.role.value,
     )
 
+
+@router.get("/password-pool", response_model=dict)
+async def get_password_pool_stats(
+    current_user: User = Depends(get_current_admin),
+):
+    """Fila do pool de bcrypt deste worker (somente administradores)."""
+    return password_pool.stats()
@@ -7,9 +7,11 @@ from app.schemas.professional import (
     ProfessionalUpdate,
     ProfessionalResponse,
     ProfessionalListResponse,
+    ProfessionalDashboardResponse,
 )
-from app.utils.dependencies import get_current_admin
+from app.utils.dependencies import get_current_admin, get_current_active_user
 from app.models.user import User
+import uuid
 
 router = APIRouter(prefix="/professionals", tags=["profissionais"])
 
@@ -48,6 +50,32 @@ async def get_professional(
     return professional
 
 
+@router.get("/{professional_id}/dashboard", response_model=ProfessionalDashboardResponse)
+async def get_professional_dashboard(
+    professional_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Visão geral da turma: indicadores de todos os alunos em uma única consulta."""
+    try:
+        professional_uuid = uuid.UUID(professional_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ID do profissional inválido"
+        )
+    
+    # Se for professional, só pode ver o próprio painel
+    if current_user.role.value == "professional" and str(professional_uuid) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para acessar este painel"
+        )
+    
+    service = ProfessionalService(db)
+    return await service.get_dashboard(str(professional_uuid))
+
+
 @router.put("/{professional_id}", response_model=ProfessionalResponse)
 async def update_professional(
     professional_id: str,
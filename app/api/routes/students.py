@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.services.student_service import StudentService
+from app.services.genai.service import GeminiService, GeminiServiceError
+from app.services.recommendation_service import RecommendationService
+from app.services.student_import_service import StudentImportService, IMPORT_FORMATS
 from app.schemas.student import (
     StudentCreate,
     StudentUpdate,
     StudentResponse,
     StudentListResponse,
+    StudentSearchResponse,
     StudentTrackingResponse,
+    StudentFeedbackRequest,
+    StudentFeedbackResponse,
+    StudentImportResponse,
 )
-from app.utils.dependencies import get_current_active_user
+from app.schemas.recommendation import StudentRecommendationResponse
+from app.models.trail import TrailDifficulty
+from app.utils.dependencies import get_current_active_user, get_current_user_claims, TokenUser
 from app.models.user import User
-from typing import Optional
+from typing import AsyncIterator, Optional
+import json
+import os
 import uuid
 
 router = APIRouter(prefix="/students", tags=["alunos"])
 
 
+def _professional_scope(current_user: User | TokenUser) -> Optional[uuid.UUID]:
+    """Profissionais só enxergam os próprios alunos; a posse entra no WHERE das consultas."""
+    if current_user.role.value == "professional":
+        return current_user.id
+    return None
+
+
 @router.post("/", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
 async def create_student(
     data: StudentCreate,
@@ -28,11 +47,54 @@ async def create_student(
     return student
 
 
+@router.post("/import", response_model=StudentImportResponse)
+async def import_students(
+    file: UploadFile = File(..., description="Arquivo CSV (com cabeçalho) ou JSONL"),
+    professional_id: Optional[str] = Query(None, description="Profissional padrão para linhas sem professional_id"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Cadastra alunos em lote e devolve o relatório de erros por linha."""
+    _, extension = os.path.splitext(file.filename or "")
+    extension = extension.lower().lstrip(".")
+    if extension == "ndjson" or file.content_type in ("application/x-ndjson", "application/jsonl"):
+        extension = "jsonl"
+    if extension not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato não suportado. Envie um arquivo CSV ou JSONL"
+        )
+    
+    # Se for professional, todos os alunos ficam vinculados a ele
+    is_professional = current_user.role.value == "professional"
+    default_professional_id = current_user.id if is_professional else None
+    if not is_professional and professional_id:
+        try:
+            default_professional_id = uuid.UUID(professional_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ID do profissional inválido"
+            )
+    
+    service = StudentImportService(db)
+    return await service.import_file(
+        file.file,
+        extension,
+        created_by_id=current_user.id,
+        default_professional_id=default_professional_id,
+        restrict_to_professional=is_professional,
+    )
+
+
 @router.get("/", response_model=StudentListResponse)
 async def list_students(
     professional_id: Optional[str] = Query(None, description="Filtrar por profissional"),
+    search: Optional[str] = Query(None, min_length=2, max_length=100, description="Parte do nome do aluno"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    limit: int = Query(100, ge=1, le=500, description="Quantidade máxima de alunos"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User | TokenUser = Depends(get_current_user_claims),
 ):
     service = StudentService(db)
     
@@ -50,15 +112,46 @@ async def list_students(
                 detail="ID do profissional inválido"
             )
     
-    result = await service.get_all_students(filter_professional_id)
+    result = await service.get_all_students(
+        filter_professional_id,
+        search=search.strip() if search else None,
+        cursor=cursor,
+        limit=limit,
+    )
     return result
 
 
+@router.get("/search", response_model=StudentSearchResponse)
+async def search_students(
+    q: str = Query(..., min_length=2, max_length=100, description="Nome (ou parte do nome) do aluno"),
+    professional_id: Optional[str] = Query(None, description="Filtrar por profissional"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User | TokenUser = Depends(get_current_user_claims),
+):
+    service = StudentService(db)
+    
+    # Se for professional, só pode buscar entre seus próprios alunos
+    filter_professional_id = None
+    if current_user.role.value == "professional":
+        filter_professional_id = current_user.id
+    elif professional_id:
+        try:
+            filter_professional_id = uuid.UUID(professional_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ID do profissional inválido"
+            )
+    
+    return await service.search_students(q.strip(), filter_professional_id, limit)
+
+
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User | TokenUser = Depends(get_current_user_claims),
 ):
     try:
         student_uuid = uuid.UUID(student_id)
@@ -69,23 +162,14 @@ async def get_student(
         )
     
     service = StudentService(db)
-    student = await service.get_student_by_id(student_uuid)
-    
-    # Se for professional, só pode ver seus próprios alunos
-    if current_user.role.value == "professional" and str(student.professional_id) != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Você não tem permissão para acessar este aluno"
-        )
-    
-    return student
+    return await service.get_student_by_id(student_uuid, _professional_scope(current_user))
 
 
 @router.get("/{student_id}/tracking", response_model=StudentTrackingResponse)
 async def get_student_tracking(
     student_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User | TokenUser = Depends(get_current_user_claims),
 ):
     try:
         student_uuid = uuid.UUID(student_id)
@@ -96,15 +180,104 @@ async def get_student_tracking(
         )
 
     service = StudentService(db)
-    student = await service.get_student_by_id(student_uuid)
+    return await service.get_student_tracking(student_uuid, _professional_scope(current_user))
+
 
-    if current_user.role.value == "professional" and str(student.professional_id) != str(current_user.id):
+async def _ensure_student_access(
+    student_id: str,
+    db: AsyncSession,
+    current_user: User | TokenUser,
+) -> uuid.UUID:
+    try:
+        student_uuid = uuid.UUID(student_id)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Você não tem permissão para acessar este aluno"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ID do aluno inválido"
         )
 
-    return await service.get_student_tracking(student_uuid)
+    await StudentService(db).get_student_by_id(student_uuid, _professional_scope(current_user))
+    return student_uuid
+
+
+@router.post("/{student_id}/feedback", response_model=StudentFeedbackResponse)
+async def generate_student_feedback(
+    student_id: str,
+    data: StudentFeedbackRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    student_uuid = await _ensure_student_access(student_id, db, current_user)
+    try:
+        answer = await GeminiService(db).generate_student_feedback(
+            str(student_uuid), data.question, model=data.model
+        )
+    except GeminiServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        )
+    return StudentFeedbackResponse(student_id=str(student_uuid), answer=answer)
+
+
+@router.post("/{student_id}/feedback/stream")
+async def stream_student_feedback(
+    student_id: str,
+    data: StudentFeedbackRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Envia a resposta do Gemini como server-sent events à medida que é gerada."""
+    student_uuid = await _ensure_student_access(student_id, db, current_user)
+    try:
+        chunks = await GeminiService(db).stream_student_feedback(
+            str(student_uuid), data.question, model=data.model
+        )
+    except GeminiServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(exc),
+        )
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for text in chunks:
+                yield f"data: {json.dumps({'text': text}, ensure_ascii=False)}\n\n"
+        except GeminiServiceError as exc:
+            yield f"event: error\ndata: {json.dumps({'detail': str(exc)}, ensure_ascii=False)}\n\n"
+            return
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{student_id}/recommendations", response_model=StudentRecommendationResponse)
+async def get_student_recommendations(
+    student_id: str,
+    limit: int = Query(10, ge=1, le=50, description="Quantidade de textos recomendados"),
+    difficulty: Optional[str] = Query(None, description="Filtrar por dificuldade"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User | TokenUser = Depends(get_current_user_claims),
+):
+    """Textos e histórias cujos grafemas mais se parecem com os erros recentes do aluno."""
+    student_uuid = await _ensure_student_access(student_id, db, current_user)
+    
+    difficulty_enum = None
+    if difficulty:
+        try:
+            difficulty_enum = TrailDifficulty(difficulty)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Dificuldade inválida. Use: beginner, intermediate ou advanced"
+            )
+    
+    service = RecommendationService(db)
+    return await service.recommend_for_student(student_uuid, limit=limit, difficulty=difficulty_enum)
 
 
 @router.put("/{student_id}", response_model=StudentResponse)
@@ -123,16 +296,9 @@ async def update_student(
         )
     
     service = StudentService(db)
-    
-    # Verificar se o aluno existe e se o usuário tem permissão
-    existing_student = await service.get_student_by_id(student_uuid)
-    if current_user.role.value == "professional" and str(existing_student.professional_id) != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Você não tem permissão para editar este aluno"
-        )
-    
-    student = await service.update_student(student_uuid, data, current_user.id)
+    student = await service.update_student(
+        student_uuid, data, current_user.id, _professional_scope(current_user)
+    )
     return student
 
 
@@ -151,15 +317,6 @@ async def delete_student(
         )
     
     service = StudentService(db)
-    
-    # Verificar se o aluno existe e se o usuário tem permissão
-    existing_student = await service.get_student_by_id(student_uuid)
-    if current_user.role.value == "professional" and str(existing_student.professional_id) != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Você não tem permissão para excluir este aluno"
-        )
-    
-    await service.delete_student(student_uuid)
+    await service.delete_student(student_uuid, _professional_scope(current_user))
     return None
 
@@ -7,11 +7,13 @@ from app.schemas.text_library import (
     TextLibraryUpdate,
     TextLibraryResponse,
     TextLibraryListResponse,
+    TextLibrarySummaryListResponse,
+    TextLibrarySearchResponse,
 )
 from app.utils.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.trail import TrailDifficulty
-from typing import Optional, List
+from typing import Optional, List, Literal, Union
 import uuid
 
 router = APIRouter(prefix="/text-library", tags=["biblioteca-de-textos"])
@@ -28,13 +30,20 @@ async def create_text(
     return text
 
 
-@router.get("/", response_model=TextLibraryListResponse)
+@router.get("/", response_model=Union[TextLibraryListResponse, TextLibrarySummaryListResponse])
 async def list_texts(
     difficulty: Optional[str] = Query(None, description="Filtrar por dificuldade"),
     is_public: Optional[bool] = Query(None, description="Filtrar por textos públicos"),
     age_range_min: Optional[int] = Query(None, description="Idade mínima"),
     age_range_max: Optional[int] = Query(None, description="Idade máxima"),
     letters_focus: Optional[str] = Query(None, description="Letras trabalhadas (separadas por vírgula)"),
+    graphemes: Optional[str] = Query(None, description="Grafemas presentes no texto, ex.: lh,nh (separados por vírgula)"),
+    readability_min: Optional[float] = Query(None, ge=0, le=100, description="Índice de legibilidade mínimo (0-100)"),
+    fields: Optional[Literal["summary"]] = Query(
+        None, description="Use 'summary' para omitir o conteúdo dos textos"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    limit: int = Query(50, ge=1, le=200, description="Quantidade máxima de textos"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -54,6 +63,10 @@ async def list_texts(
     if letters_focus:
         letters_list = [letter.strip().upper() for letter in letters_focus.split(",")]
     
+    graphemes_list = None
+    if graphemes:
+        graphemes_list = [grapheme.strip().upper() for grapheme in graphemes.split(",") if grapheme.strip()]
+    
     filter_created_by = None
     if current_user.role.value == "professional":
         filter_created_by = current_user.id
@@ -65,10 +78,67 @@ async def list_texts(
         age_range_min=age_range_min,
         age_range_max=age_range_max,
         letters_focus=letters_list,
+        graphemes=graphemes_list,
+        readability_min=readability_min,
+        cursor=cursor,
+        limit=limit,
+        summary=fields == "summary",
     )
     return result
 
 
+@router.get("/search", response_model=TextLibrarySearchResponse)
+async def search_texts(
+    q: str = Query(..., min_length=2, max_length=200, description="Termos de busca"),
+    difficulty: Optional[str] = Query(None, description="Filtrar por dificuldade"),
+    age_range_min: Optional[int] = Query(None, description="Idade mínima"),
+    age_range_max: Optional[int] = Query(None, description="Idade máxima"),
+    letters_focus: Optional[str] = Query(None, description="Letras trabalhadas (separadas por vírgula)"),
+    graphemes: Optional[str] = Query(None, description="Grafemas presentes no texto, ex.: lh,nh (separados por vírgula)"),
+    readability_min: Optional[float] = Query(None, ge=0, le=100, description="Índice de legibilidade mínimo (0-100)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado pela página anterior"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    service = TextLibraryService(db)
+    
+    difficulty_enum = None
+    if difficulty:
+        try:
+            difficulty_enum = TrailDifficulty(difficulty)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Dificuldade inválida. Use: beginner, intermediate ou advanced"
+            )
+    
+    letters_list = None
+    if letters_focus:
+        letters_list = [letter.strip().upper() for letter in letters_focus.split(",")]
+    
+    graphemes_list = None
+    if graphemes:
+        graphemes_list = [grapheme.strip().upper() for grapheme in graphemes.split(",") if grapheme.strip()]
+    
+    filter_created_by = None
+    if current_user.role.value == "professional":
+        filter_created_by = current_user.id
+    
+    return await service.search_texts(
+        q.strip(),
+        created_by=filter_created_by,
+        difficulty=difficulty_enum,
+        age_range_min=age_range_min,
+        age_range_max=age_range_max,
+        letters_focus=letters_list,
+        graphemes=graphemes_list,
+        readability_min=readability_min,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
 @router.get("/{text_id}", response_model=TextLibraryResponse)
 async def get_text(
     text_id: str,
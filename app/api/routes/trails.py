@@ -2,11 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.services.trail_service import TrailService
+from app.services.progress_service import TrailProgressService
+from app.schemas.progress import StudentTrailProgressListResponse
 from app.schemas.trail import (
     TrailCreate,
     TrailUpdate,
     TrailResponse,
     TrailListResponse,
+    TrailSummaryListResponse,
     TrailStoryCreate,
     TrailStoryUpdate,
     TrailStoryResponse,
@@ -14,7 +17,7 @@ from app.schemas.trail import (
 from app.utils.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.trail import TrailDifficulty
-from typing import Optional
+from typing import Literal, Optional, Union
 import uuid
 
 router = APIRouter(prefix="/trails", tags=["trilhas"])
@@ -31,12 +34,17 @@ async def create_trail(
     return trail
 
 
-@router.get("/", response_model=TrailListResponse)
+@router.get("/", response_model=Union[TrailListResponse, TrailSummaryListResponse])
 async def list_trails(
     difficulty: Optional[str] = Query(None, description="Filtrar por dificuldade"),
     is_default: Optional[bool] = Query(None, description="Filtrar por trilhas padrão"),
     age_range_min: Optional[int] = Query(None, description="Idade mínima"),
     age_range_max: Optional[int] = Query(None, description="Idade máxima"),
+    fields: Optional[Literal["summary"]] = Query(
+        None, description="Use 'summary' para omitir o conteúdo das histórias"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    limit: int = Query(100, ge=1, le=500, description="Quantidade máxima de trilhas"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -62,6 +70,9 @@ async def list_trails(
         is_default=is_default,
         age_range_min=age_range_min,
         age_range_max=age_range_max,
+        cursor=cursor,
+        limit=limit,
+        summary=fields == "summary",
     )
     return result
 
@@ -85,6 +96,30 @@ async def get_trail(
     return trail
 
 
+@router.get("/{trail_id}/progress", response_model=StudentTrailProgressListResponse)
+async def get_trail_progress(
+    trail_id: str,
+    professional_id: Optional[str] = Query(None, description="Filtrar por profissional (admin)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    try:
+        trail_uuid = uuid.UUID(trail_id)
+        professional_uuid = uuid.UUID(professional_id) if professional_id else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ID inválido"
+        )
+
+    # Profissionais só veem o progresso dos próprios alunos
+    if current_user.role.value == "professional":
+        professional_uuid = current_user.id
+
+    service = TrailProgressService(db)
+    return await service.get_class_progress(professional_uuid, trail_uuid)
+
+
 @router.put("/{trail_id}", response_model=TrailResponse)
 async def update_trail(
     trail_id: str,
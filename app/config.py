@@ -22,6 +22,28 @@ class Settings(BaseSettings):
     google_genai_api_key: str | None = None
     google_genai_model: str = "gemini-1.5-flash"
     google_genai_location: str | None = None
+    google_genai_prompt_token_budget: int = 4000
+    # Modelos que o cliente pode escolher em /students/{id}/feedback, além de GOOGLE_GENAI_MODEL
+    google_genai_allowed_models: List[str] = []
+    ai_insights_batch_enabled: bool = False
+    ai_insights_batch_size: int = 10
+    ai_insights_ttl_days: int = 90
+    ai_insights_dedup_window_hours: int = 72
+    ai_insights_purge_batch_size: int = 1000
+    default_trails_cache_check_seconds: float = 5.0
+    recommendation_refresh_seconds: float = 30.0
+    recommendation_error_window: int = 20
+    activity_copy_threshold: int = 1000
+    student_import_chunk_size: int = 500
+    auth_user_cache_ttl_seconds: float = 30.0
+    auth_user_cache_max_entries: int = 1024
+    auth_trust_token_claims: bool = False
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    login_rate_limit_attempts: int = 10  # falhas por (IP, email) na janela
+    login_rate_limit_window_seconds: float = 60.0
+    token_verify_cache_size: int = 4096
+    token_revocation_refresh_seconds: float = 15.0
     
     model_config = SettingsConfigDict(
         env_file=".env",
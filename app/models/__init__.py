@@ -8,6 +8,8 @@ from app.models.diagnostic import Diagnostic, DiagnosticType
 from app.models.text_library import TextLibrary
 from app.models.report import Report, ReportType, ReportFormat
 from app.models.ai_insight import AIInsight, InsightType, InsightPriority
+from app.models.cache_version import CacheVersion
+from app.models.revoked_token import RevokedToken
 
 __all__ = [
     "User",
@@ -36,5 +38,7 @@ __all__ = [
     "AIInsight",
     "InsightType",
     "InsightPriority",
+    "CacheVersion",
+    "RevokedToken",
 ]
 
@@ -30,7 +30,13 @@ class AIInsight(Base):
     related_students = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
     is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    fingerprint = Column(String(64), nullable=True)
 
     professional = relationship("User", foreign_keys=[professional_id])
 
+    __table_args__ = (
+        Index("idx_ai_insights_professional_fingerprint", "professional_id", "fingerprint", "created_at"),
+        Index("idx_ai_insights_related_students_gin", "related_students", postgresql_using="gin"),
+    )
+
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, func
+from app.database import Base
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, String, Text, Enum, Integer, Boolean, ForeignKey, DateTime, Index, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Enum, Integer, Float, Boolean, ForeignKey, DateTime, Index, Computed, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.database import Base
 from app.models.trail import TrailDifficulty
 
 
+TEXT_LIBRARY_SEARCH_CONFIG = "portuguese"
+
+TEXT_LIBRARY_SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(subtitle, '')), 'B') || "
+    "setweight(to_tsvector('portuguese', coalesce(content, '')), 'C')"
+)
+
+
 class TextLibrary(Base):
     __tablename__ = "text_library"
 
@@ -19,16 +28,24 @@ class TextLibrary(Base):
     letters_focus = Column(ARRAY(String), nullable=True)
     tags = Column(JSONB, nullable=True)
     word_count = Column(Integer, nullable=True)
+    syllable_count = Column(Integer, nullable=True)
+    readability_score = Column(Float, nullable=True, index=True)
+    letter_frequency = Column(JSONB, nullable=True)
+    grapheme_frequency = Column(JSONB, nullable=True)
     is_public = Column(Boolean, default=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Usado só dentro do SQL da busca; não é carregado com a entidade
+    search_vector = deferred(Column(TSVECTOR, Computed(TEXT_LIBRARY_SEARCH_VECTOR, persisted=True)))
 
     creator = relationship("User", foreign_keys=[created_by])
     updater = relationship("User", foreign_keys=[updated_by])
 
     __table_args__ = (
         Index("idx_text_library_title_gin", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("idx_text_library_search_vector", "search_vector", postgresql_using="gin"),
+        Index("idx_text_library_grapheme_frequency_gin", "grapheme_frequency", postgresql_using="gin"),
     )
 
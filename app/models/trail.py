@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Enum, Boolean, Integer, ForeignKey, DateTime, func, Index
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Text, Enum, Boolean, Integer, Float, ForeignKey, DateTime, func, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 from app.database import Base
@@ -29,7 +29,12 @@ class Trail(Base):
 
     creator = relationship("User", foreign_keys=[created_by])
     updater = relationship("User", foreign_keys=[updated_by])
-    stories = relationship("TrailStory", back_populates="trail", cascade="all, delete-orphan")
+    stories = relationship(
+        "TrailStory",
+        back_populates="trail",
+        cascade="all, delete-orphan",
+        order_by="TrailStory.order_position",
+    )
     student_progress = relationship("StudentTrailProgress", back_populates="trail")
 
 
@@ -46,6 +51,10 @@ class TrailStory(Base):
     order_position = Column(Integer, nullable=False)
     difficulty = Column(Enum(TrailDifficulty), nullable=True)
     word_count = Column(Integer, nullable=True)
+    syllable_count = Column(Integer, nullable=True)
+    readability_score = Column(Float, nullable=True, index=True)
+    letter_frequency = Column(JSONB, nullable=True)
+    grapheme_frequency = Column(JSONB, nullable=True)
     estimated_time = Column(Integer, nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -59,5 +68,6 @@ class TrailStory(Base):
 
     __table_args__ = (
         Index("idx_trail_stories_order", "trail_id", "order_position"),
+        Index("idx_trail_stories_grapheme_frequency_gin", "grapheme_frequency", postgresql_using="gin"),
     )
 
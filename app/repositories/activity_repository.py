@@ -1,10 +1,16 @@
 from sqlalchemy import select, func, and_, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.models.activity import Activity, ActivityStatus, StudentActivity
-from typing import Optional, List
+from typing import Optional, List, Dict
 import uuid
 
 
+# 4 parâmetros por linha; mantém cada INSERT abaixo do limite de 32767 do asyncpg
+INSERT_BATCH_SIZE = 5000
+
+
 class ActivityRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -14,18 +20,55 @@ class ActivityRepository:
         self.session.add(activity)
         await self.session.flush()
 
-        for student_id in student_ids:
-            student_activity = StudentActivity(
-                student_id=student_id,
-                activity_id=activity.id,
-                status=ActivityStatus.pending
-            )
-            self.session.add(student_activity)
+        await self.add_students(activity.id, student_ids, new_activity=True)
 
         await self.session.commit()
         await self.session.refresh(activity)
         return activity
 
+    async def add_students(
+        self,
+        activity_id: uuid.UUID,
+        student_ids: List[uuid.UUID],
+        new_activity: bool = False
+    ) -> None:
+        """Vincula alunos à atividade sem criar objetos ORM.
+
+        Atividades recém-criadas com muitos alunos usam COPY (não há conflitos possíveis);
+        nos demais casos, INSERT em lote com ON CONFLICT DO NOTHING.
+        """
+        if not student_ids:
+            return
+
+        if new_activity and len(student_ids) >= settings.activity_copy_threshold:
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                StudentActivity.__tablename__,
+                records=[
+                    (uuid.uuid4(), student_id, activity_id, ActivityStatus.pending.value)
+                    for student_id in student_ids
+                ],
+                columns=["id", "student_id", "activity_id", "status"],
+            )
+            return
+
+        for start in range(0, len(student_ids), INSERT_BATCH_SIZE):
+            await self.session.execute(
+                insert(StudentActivity)
+                .values(
+                    [
+                        {
+                            "student_id": student_id,
+                            "activity_id": activity_id,
+                            "status": ActivityStatus.pending,
+                        }
+                        for student_id in student_ids[start:start + INSERT_BATCH_SIZE]
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="unique_student_activity")
+            )
+
     async def get_by_id(self, activity_id: uuid.UUID) -> Optional[Activity]:
         result = await self.session.execute(
             select(Activity).where(Activity.id == activity_id)
@@ -40,6 +83,21 @@ class ActivityRepository:
         )
         return [row[0] for row in result.all()]
 
+    async def get_student_ids_by_activity(
+        self, activity_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, List[uuid.UUID]]:
+        student_ids: Dict[uuid.UUID, List[uuid.UUID]] = {activity_id: [] for activity_id in activity_ids}
+        if not activity_ids:
+            return student_ids
+        result = await self.session.execute(
+            select(StudentActivity.activity_id, StudentActivity.student_id).where(
+                StudentActivity.activity_id.in_(activity_ids)
+            )
+        )
+        for activity_id, student_id in result.all():
+            student_ids[activity_id].append(student_id)
+        return student_ids
+
     async def get_all(
         self,
         professional_id: Optional[uuid.UUID] = None,
@@ -62,23 +120,19 @@ class ActivityRepository:
         )
         return list(result.scalars().all())
 
-    async def count_all(self, professional_id: Optional[uuid.UUID] = None) -> int:
-        query = select(func.count(Activity.id))
-        if professional_id:
-            query = query.where(Activity.created_by == professional_id)
-        result = await self.session.execute(query)
-        return result.scalar_one()
-
-    async def count_by_status(
-        self,
-        status: ActivityStatus,
-        professional_id: Optional[uuid.UUID] = None
-    ) -> int:
-        query = select(func.count(Activity.id)).where(Activity.status == status)
+    async def count_summary(self, professional_id: Optional[uuid.UUID] = None) -> Dict[str, int]:
+        """Total e quantidade por status em uma única consulta (``count(*) FILTER``)."""
+        query = select(
+            func.count(Activity.id).label("total"),
+            *[
+                func.count(Activity.id).filter(Activity.status == activity_status).label(activity_status.value)
+                for activity_status in ActivityStatus
+            ],
+        )
         if professional_id:
             query = query.where(Activity.created_by == professional_id)
         result = await self.session.execute(query)
-        return result.scalar_one()
+        return dict(result.one()._mapping)
 
     async def update(
         self,
@@ -99,25 +153,16 @@ class ActivityRepository:
                 setattr(activity, key, value)
 
         if student_ids is not None:
-            existing_student_activities_result = await self.session.execute(
-                select(StudentActivity).where(
-                    StudentActivity.activity_id == activity_id
-                )
-            )
-            existing_student_activities = existing_student_activities_result.scalars().all()
-            existing_ids = {sa.student_id for sa in existing_student_activities}
+            existing_ids = set(await self.get_student_ids(activity_id))
             new_ids = set(student_ids)
 
             ids_to_add = new_ids - existing_ids
             ids_to_remove = existing_ids - new_ids
 
-            for student_id in ids_to_add:
-                student_activity = StudentActivity(
-                    student_id=student_id,
-                    activity_id=activity_id,
-                    status=ActivityStatus.pending
-                )
-                self.session.add(student_activity)
+            await self.add_students(
+                activity_id,
+                [student_id for student_id in student_ids if student_id in ids_to_add]
+            )
 
             if ids_to_remove:
                 await self.session.execute(
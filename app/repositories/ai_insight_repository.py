@@ -1,10 +1,16 @@
-from typing import Optional, List, Sequence
+from datetime import datetime
+from typing import Any, Dict, Optional, List, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy import select, update, delete, insert, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.ai_insight import AIInsight, InsightType, InsightPriority
+from app.utils.text import text_fingerprint
+
+
+def insight_fingerprint(title: str, description: str) -> str:
+    return text_fingerprint(title, description)
 
 
 class AIInsightRepository:
@@ -31,12 +37,104 @@ class AIInsightRepository:
             related_students=related_students or [],
             expires_at=expires_at,
             is_read=is_read,
+            fingerprint=insight_fingerprint(title, description),
         )
         self.session.add(insight)
         await self.session.flush()
         await self.session.refresh(insight)
         return insight
 
+    async def create_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        dedupe_since: Optional[datetime] = None,
+    ) -> int:
+        values = []
+        seen = set()
+        for row in rows:
+            fingerprint = insight_fingerprint(row["title"], row["description"])
+            related_students = row.get("related_students") or []
+            key = (row["professional_id"], fingerprint, tuple(related_students))
+            if key in seen:
+                continue
+            seen.add(key)
+            values.append(
+                {
+                    "professional_id": row["professional_id"],
+                    "insight_type": row["insight_type"],
+                    "priority": row["priority"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "related_students": related_students,
+                    "expires_at": row.get("expires_at"),
+                    "is_read": row.get("is_read", False),
+                    "fingerprint": fingerprint,
+                }
+            )
+
+        if values and dedupe_since is not None:
+            existing = await self.session.execute(
+                select(
+                    AIInsight.professional_id,
+                    AIInsight.fingerprint,
+                    AIInsight.related_students,
+                ).where(
+                    AIInsight.fingerprint.in_({value["fingerprint"] for value in values}),
+                    AIInsight.created_at >= dedupe_since,
+                )
+            )
+            recent = {
+                (professional_id, fingerprint, student_id)
+                for professional_id, fingerprint, students in existing.all()
+                for student_id in students or [None]
+            }
+            values = [
+                value
+                for value in values
+                if not any(
+                    (value["professional_id"], value["fingerprint"], student_id) in recent
+                    for student_id in value["related_students"] or [None]
+                )
+            ]
+
+        if not values:
+            return 0
+        await self.session.execute(insert(AIInsight).values(values))
+        return len(values)
+
+    async def has_recent_duplicate(
+        self,
+        *,
+        professional_id: UUID,
+        student_id: UUID,
+        title: str,
+        description: str,
+        since: datetime,
+    ) -> bool:
+        result = await self.session.execute(
+            select(AIInsight.id)
+            .where(
+                AIInsight.professional_id == professional_id,
+                AIInsight.fingerprint == insight_fingerprint(title, description),
+                AIInsight.created_at >= since,
+                AIInsight.related_students.contains([student_id]),
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
+    async def delete_expired(self, batch_size: int = 1000) -> int:
+        expired_ids = (
+            select(AIInsight.id)
+            .where(AIInsight.expires_at.isnot(None), AIInsight.expires_at <= func.now())
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(AIInsight).where(AIInsight.id.in_(expired_ids))
+        )
+        return result.rowcount or 0
+
     async def get_by_id(self, insight_id: UUID) -> Optional[AIInsight]:
         result = await self.session.execute(
             select(AIInsight).where(AIInsight.id == insight_id)
@@ -56,7 +154,7 @@ class AIInsightRepository:
     ) -> Sequence[AIInsight]:
         query = select(AIInsight)
 
-        filters = []
+        filters = [or_(AIInsight.expires_at.is_(None), AIInsight.expires_at > func.now())]
         if professional_id:
             filters.append(AIInsight.professional_id == professional_id)
         if student_id:
@@ -71,8 +169,7 @@ class AIInsightRepository:
         if is_read is not None:
             filters.append(AIInsight.is_read == is_read)
 
-        if filters:
-            query = query.where(and_(*filters))
+        query = query.where(and_(*filters))
 
         query = query.order_by(AIInsight.created_at.desc())
         if skip:
@@ -94,7 +191,7 @@ class AIInsightRepository:
     ) -> int:
         query = select(func.count()).select_from(AIInsight)
 
-        filters = []
+        filters = [or_(AIInsight.expires_at.is_(None), AIInsight.expires_at > func.now())]
         if professional_id:
             filters.append(AIInsight.professional_id == professional_id)
         if student_id:
@@ -109,8 +206,7 @@ class AIInsightRepository:
         if is_read is not None:
             filters.append(AIInsight.is_read == is_read)
 
-        if filters:
-            query = query.where(and_(*filters))
+        query = query.where(and_(*filters))
 
         result = await self.session.execute(query)
         return result.scalar_one()
@@ -146,6 +242,14 @@ class AIInsightRepository:
         if not update_data:
             return await self.get_by_id(insight_id)
 
+        if "title" in update_data or "description" in update_data:
+            current = await self.get_by_id(insight_id)
+            if current:
+                update_data["fingerprint"] = insight_fingerprint(
+                    update_data.get("title", current.title),
+                    update_data.get("description", current.description),
+                )
+
         await self.session.execute(
             update(AIInsight)
             .where(AIInsight.id == insight_id)
@@ -0,0 +1,29 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cache_version import CacheVersion
+
+
+class CacheVersionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_version(self, name: str) -> int:
+        result = await self.session.execute(
+            select(CacheVersion.version).where(CacheVersion.name == name)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self, name: str) -> int:
+        """Incrementa a versão na transação atual; o commit fica com quem chama."""
+        stmt = (
+            insert(CacheVersion)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[CacheVersion.name],
+                set_={"version": CacheVersion.version + 1, "updated_at": func.now()},
+            )
+            .returning(CacheVersion.version)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
@@ -0,0 +1,94 @@
+from sqlalchemy import select, func, case, literal, and_
+from sqlalchemy.dialects.postgresql import insert, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.progress import StudentTrailProgress
+from app.models.student import Student
+from app.models.trail import TrailStory
+from typing import Optional, List
+import uuid
+
+
+class StudentTrailProgressRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def count_stories(self, trail_id: uuid.UUID) -> int:
+        result = await self.session.execute(
+            select(func.count(TrailStory.id)).where(TrailStory.trail_id == trail_id)
+        )
+        return result.scalar_one()
+
+    async def mark_story_completed(
+        self,
+        student_id: uuid.UUID,
+        trail_id: uuid.UUID,
+        story_id: uuid.UUID,
+        story_count: int,
+    ) -> StudentTrailProgress:
+        """Upsert único: anexa a história ao array (sem repetir) e recalcula o percentual."""
+        story = literal(story_id, type_=UUID(as_uuid=True))
+        completed = StudentTrailProgress.completed_stories
+        new_completed = case(
+            (completed.any(story_id), completed),
+            else_=func.array_append(completed, story),
+        )
+        new_total = func.cardinality(new_completed)
+        first_percentage = min(100.0, 100.0 / story_count)
+
+        stmt = (
+            insert(StudentTrailProgress)
+            .values(
+                student_id=student_id,
+                trail_id=trail_id,
+                current_story_id=story_id,
+                completed_stories=[story_id],
+                progress_percentage=first_percentage,
+                completed_at=func.now() if story_count <= 1 else None,
+            )
+            .on_conflict_do_update(
+                constraint="unique_student_trail",
+                set_={
+                    "completed_stories": new_completed,
+                    "progress_percentage": func.least(100.0, new_total * 100.0 / story_count),
+                    "current_story_id": story_id,
+                    "last_accessed_at": func.now(),
+                    "completed_at": case(
+                        (
+                            new_total >= story_count,
+                            func.coalesce(StudentTrailProgress.completed_at, func.now()),
+                        ),
+                        else_=StudentTrailProgress.completed_at,
+                    ),
+                },
+            )
+            .returning(StudentTrailProgress)
+        )
+        result = await self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return result.one()
+
+    async def get_for_students(
+        self,
+        *,
+        professional_id: Optional[uuid.UUID] = None,
+        student_ids: Optional[List[uuid.UUID]] = None,
+        trail_id: Optional[uuid.UUID] = None,
+    ) -> List[StudentTrailProgress]:
+        query = (
+            select(StudentTrailProgress)
+            .join(Student, Student.id == StudentTrailProgress.student_id)
+            .where(Student.deleted_at.is_(None))
+        )
+        conditions = []
+        if professional_id:
+            conditions.append(Student.professional_id == professional_id)
+        if student_ids is not None:
+            conditions.append(StudentTrailProgress.student_id.in_(student_ids))
+        if trail_id:
+            conditions.append(StudentTrailProgress.trail_id == trail_id)
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = query.order_by(Student.name.asc(), StudentTrailProgress.trail_id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
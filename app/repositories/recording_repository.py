@@ -1,8 +1,9 @@
 from sqlalchemy import select, update, delete, func, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.recording import Recording, RecordingStatus
+from app.models.recording import Recording, RecordingAnalysis, RecordingStatus
 from typing import Optional, List
+from datetime import datetime
 import uuid
 
 
@@ -77,6 +78,42 @@ class RecordingRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_completed_between(
+        self,
+        start: datetime,
+        end: datetime,
+    ) -> List[Recording]:
+        result = await self.session.execute(
+            select(Recording)
+            .options(
+                selectinload(Recording.analysis),
+                selectinload(Recording.story),
+                selectinload(Recording.student),
+            )
+            .where(
+                Recording.recorded_at >= start,
+                Recording.recorded_at < end,
+                Recording.status == RecordingStatus.completed,
+                Recording.transcription.isnot(None),
+            )
+            .order_by(Recording.student_id, Recording.recorded_at)
+        )
+        return list(result.scalars().all())
+
+    async def get_recent_errors(self, student_id: uuid.UUID, limit: int = 20) -> List[list]:
+        """``errors_detected`` das análises mais recentes do aluno."""
+        result = await self.session.execute(
+            select(RecordingAnalysis.errors_detected)
+            .join(Recording, Recording.id == RecordingAnalysis.recording_id)
+            .where(
+                Recording.student_id == student_id,
+                RecordingAnalysis.errors_detected.isnot(None),
+            )
+            .order_by(Recording.recorded_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def update(
         self,
         recording_id: uuid.UUID,
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.revoked_token import RevokedToken
+import uuid
+
+
+class RevokedTokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def revoke(self, jti: str, expires_at: datetime, user_id: Optional[uuid.UUID] = None) -> None:
+        stmt = (
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def get_active(self, revoked_since: Optional[datetime] = None) -> List:
+        """Revogações ainda não expiradas, opcionalmente só as registradas a partir de ``revoked_since``."""
+        query = select(
+            RevokedToken.jti,
+            RevokedToken.expires_at,
+            RevokedToken.revoked_at,
+        ).where(RevokedToken.expires_at > func.now())
+        if revoked_since is not None:
+            query = query.where(RevokedToken.revoked_at >= revoked_since)
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def delete_expired(self) -> int:
+        result = await self.session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= func.now())
+        )
+        await self.session.commit()
+        return result.rowcount or 0
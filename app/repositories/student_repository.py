@@ -1,7 +1,11 @@
-from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, any_, literal, tuple_, type_coerce, Float
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array, array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.student import Student, StudentStatus
-from typing import Optional
+from app.models.recording import Recording, RecordingAnalysis
+from app.models.activity import StudentActivity, ActivityStatus
+from app.models.ai_insight import AIInsight
+from typing import Optional, List, Set, Dict, Tuple
 import uuid
 
 
@@ -9,21 +13,125 @@ class StudentRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self, professional_id: Optional[uuid.UUID] = None) -> list[Student]:
-        query = select(Student).where(Student.deleted_at.is_(None))
+    def _list_conditions(
+        self,
+        professional_id: Optional[uuid.UUID] = None,
+        search: Optional[str] = None,
+    ) -> list:
+        conditions = [Student.deleted_at.is_(None)]
         if professional_id:
-            query = query.where(Student.professional_id == professional_id)
+            conditions.append(Student.professional_id == professional_id)
+        if search:
+            # ILIKE com curingas é atendido pelo índice trigram idx_students_name_gin
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(Student.name.ilike(f"%{escaped}%"))
+        return conditions
+
+    def _status_counts(self, window: bool = False) -> list:
+        def count(status: Optional[StudentStatus] = None):
+            expression = func.count()
+            if status is not None:
+                expression = expression.filter(Student.status == status)
+            return expression.over() if window else expression
+
+        return [
+            count().label("total"),
+            count(StudentStatus.active).label("active"),
+            count(StudentStatus.inactive).label("inactive"),
+        ]
+
+    async def get_page(
+        self,
+        professional_id: Optional[uuid.UUID] = None,
+        search: Optional[str] = None,
+        after: Optional[Tuple[str, uuid.UUID]] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Student], Optional[Dict[str, int]]]:
+        """Página ordenada por ``(name, id)`` com os totais por status do conjunto filtrado.
+
+        Os totais vêm de ``count(*) FILTER (...) OVER ()`` na mesma consulta; são ``None``
+        quando a página volta vazia.
+        """
+        filtered = (
+            select(Student.id, Student.name, *self._status_counts(window=True))
+            .where(and_(*self._list_conditions(professional_id, search)))
+            .subquery()
+        )
+        query = select(
+            Student, filtered.c.total, filtered.c.active, filtered.c.inactive
+        ).join(filtered, filtered.c.id == Student.id)
+        if after is not None:
+            query = query.where(tuple_(filtered.c.name, filtered.c.id) > tuple_(*after))
+        query = query.order_by(filtered.c.name.asc(), filtered.c.id.asc()).limit(limit)
+
         result = await self.session.execute(query)
-        return result.scalars().all()
+        rows = result.all()
+        if not rows:
+            return [], None
+        first = rows[0]
+        counts = {"total": first.total, "active": first.active, "inactive": first.inactive}
+        return [row[0] for row in rows], counts
+
+    async def search_by_name(
+        self,
+        search: str,
+        professional_id: Optional[uuid.UUID] = None,
+        limit: int = 20,
+    ) -> List[Tuple[Student, float]]:
+        """Alunos ordenados por similaridade de trigramas com o nome (``%`` e ``<%`` usam o índice GIN)."""
+        term = literal(search)
+        score = func.greatest(
+            func.similarity(Student.name, term),
+            func.word_similarity(term, Student.name),
+        ).label("score")
+        conditions = self._list_conditions(professional_id)
+        conditions.append(or_(Student.name.op("%")(term), term.op("<%")(Student.name)))
+        query = (
+            select(Student, score)
+            .where(and_(*conditions))
+            .order_by(score.desc(), Student.name.asc(), Student.id.asc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [(student, float(student_score)) for student, student_score in result.all()]
+
+    def _scoped(self, student_id: uuid.UUID, professional_id: Optional[uuid.UUID] = None) -> list:
+        """Filtro por id; com ``professional_id`` a posse do aluno vira parte do WHERE."""
+        conditions = [Student.id == student_id, Student.deleted_at.is_(None)]
+        if professional_id:
+            conditions.append(Student.professional_id == professional_id)
+        return conditions
 
-    async def get_by_id(self, student_id: uuid.UUID) -> Optional[Student]:
+    async def get_by_id(
+        self,
+        student_id: uuid.UUID,
+        professional_id: Optional[uuid.UUID] = None,
+    ) -> Optional[Student]:
         result = await self.session.execute(
-            select(Student).where(
-                and_(Student.id == student_id, Student.deleted_at.is_(None))
-            )
+            select(Student).where(and_(*self._scoped(student_id, professional_id)))
         )
         return result.scalar_one_or_none()
 
+    async def exists(self, student_id: uuid.UUID) -> bool:
+        result = await self.session.execute(
+            select(select(Student.id).where(and_(*self._scoped(student_id))).exists())
+        )
+        return result.scalar_one()
+
+    async def get_missing_ids(
+        self,
+        student_ids: List[uuid.UUID],
+        professional_id: Optional[uuid.UUID] = None,
+    ) -> Set[uuid.UUID]:
+        """Ids que não existem, foram excluídos ou (se informado) não pertencem ao profissional."""
+        if not student_ids:
+            return set()
+        conditions = [Student.id == any_(array(student_ids)), Student.deleted_at.is_(None)]
+        if professional_id:
+            conditions.append(Student.professional_id == professional_id)
+        result = await self.session.execute(select(Student.id).where(and_(*conditions)))
+        return set(student_ids) - set(result.scalars().all())
+
     async def create(self, student_data: dict) -> Student:
         student = Student(**student_data)
         self.session.add(student)
@@ -31,12 +139,23 @@ class StudentRepository:
         await self.session.refresh(student)
         return student
 
-    async def update(self, student_id: uuid.UUID, student_data: dict) -> Optional[Student]:
+    async def create_batch(self, students_data: List[dict], commit: bool = True) -> int:
+        if not students_data:
+            return 0
+        await self.session.execute(insert(Student).values(students_data))
+        if commit:
+            await self.session.commit()
+        return len(students_data)
+
+    async def update(
+        self,
+        student_id: uuid.UUID,
+        student_data: dict,
+        professional_id: Optional[uuid.UUID] = None,
+    ) -> Optional[Student]:
         stmt = (
             update(Student)
-            .where(
-                and_(Student.id == student_id, Student.deleted_at.is_(None))
-            )
+            .where(and_(*self._scoped(student_id, professional_id)))
             .values(**student_data)
             .returning(Student)
         )
@@ -44,48 +163,97 @@ class StudentRepository:
         await self.session.commit()
         return result.scalar_one_or_none()
 
-    async def delete(self, student_id: uuid.UUID) -> bool:
+    async def delete(
+        self,
+        student_id: uuid.UUID,
+        professional_id: Optional[uuid.UUID] = None,
+    ) -> bool:
         from datetime import datetime
         stmt = (
             update(Student)
-            .where(
-                and_(Student.id == student_id, Student.deleted_at.is_(None))
-            )
+            .where(and_(*self._scoped(student_id, professional_id)))
             .values(deleted_at=datetime.utcnow())
-            .returning(Student)
+            .returning(Student.id)
         )
         result = await self.session.execute(stmt)
         await self.session.commit()
-        return result.rowcount > 0
+        return result.scalar_one_or_none() is not None
 
-    async def count_all(self, professional_id: Optional[uuid.UUID] = None) -> int:
-        query = select(func.count(Student.id)).where(Student.deleted_at.is_(None))
-        if professional_id:
-            query = query.where(Student.professional_id == professional_id)
+    async def count_summary(
+        self,
+        professional_id: Optional[uuid.UUID] = None,
+        search: Optional[str] = None,
+    ) -> Dict[str, int]:
+        query = select(*self._status_counts()).where(
+            and_(*self._list_conditions(professional_id, search))
+        )
         result = await self.session.execute(query)
-        return result.scalar_one()
+        return dict(result.one()._mapping)
 
-    async def count_active(self, professional_id: Optional[uuid.UUID] = None) -> int:
-        query = select(func.count(Student.id)).where(
-            and_(
-                Student.deleted_at.is_(None),
-                Student.status == StudentStatus.active
+    async def get_dashboard_rows(self, professional_id: uuid.UUID) -> list:
+        """Indicadores de todos os alunos do profissional em uma única consulta agregada."""
+        latest_wpm = array_agg(
+            aggregate_order_by(RecordingAnalysis.speed_wpm, Recording.recorded_at.desc())
+        ).filter(RecordingAnalysis.speed_wpm.isnot(None))
+        recordings = (
+            select(
+                Recording.student_id.label("student_id"),
+                func.count(Recording.id).label("recording_count"),
+                func.avg(RecordingAnalysis.accuracy_score).label("average_accuracy"),
+                type_coerce(latest_wpm, ARRAY(Float))[1].label("latest_ppm"),
+                func.max(Recording.recorded_at).label("last_recorded_at"),
             )
+            .join(Student, Student.id == Recording.student_id)
+            .outerjoin(RecordingAnalysis, RecordingAnalysis.recording_id == Recording.id)
+            .where(Student.professional_id == professional_id)
+            .group_by(Recording.student_id)
+            .subquery()
+        )
+        activities = (
+            select(
+                StudentActivity.student_id.label("student_id"),
+                func.count(StudentActivity.id).label("completed_activities"),
+            )
+            .join(Student, Student.id == StudentActivity.student_id)
+            .where(
+                Student.professional_id == professional_id,
+                StudentActivity.status == ActivityStatus.completed,
+            )
+            .group_by(StudentActivity.student_id)
+            .subquery()
+        )
+        related_student = func.unnest(AIInsight.related_students).label("student_id")
+        unread = (
+            select(related_student, func.count().label("unread_insights"))
+            .where(
+                AIInsight.professional_id == professional_id,
+                AIInsight.is_read.is_(False),
+                or_(AIInsight.expires_at.is_(None), AIInsight.expires_at > func.now()),
+            )
+            .group_by(related_student)
+            .subquery()
         )
-        if professional_id:
-            query = query.where(Student.professional_id == professional_id)
-        result = await self.session.execute(query)
-        return result.scalar_one()
 
-    async def count_inactive(self, professional_id: Optional[uuid.UUID] = None) -> int:
-        query = select(func.count(Student.id)).where(
-            and_(
+        query = (
+            select(
+                Student.id,
+                Student.name,
+                Student.status,
+                func.coalesce(recordings.c.recording_count, 0).label("recording_count"),
+                recordings.c.average_accuracy,
+                recordings.c.latest_ppm,
+                recordings.c.last_recorded_at,
+                func.coalesce(activities.c.completed_activities, 0).label("completed_activities"),
+                func.coalesce(unread.c.unread_insights, 0).label("unread_insights"),
+            )
+            .outerjoin(recordings, recordings.c.student_id == Student.id)
+            .outerjoin(activities, activities.c.student_id == Student.id)
+            .outerjoin(unread, unread.c.student_id == Student.id)
+            .where(
+                Student.professional_id == professional_id,
                 Student.deleted_at.is_(None),
-                Student.status == StudentStatus.inactive
             )
+            .order_by(Student.name.asc())
         )
-        if professional_id:
-            query = query.where(Student.professional_id == professional_id)
         result = await self.session.execute(query)
-        return result.scalar_one()
-
+        return result.all()
@@ -1,8 +1,11 @@
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, update, delete, func, and_, or_, cast, tuple_, Float
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.text_library import TextLibrary
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import defer
+from app.models.text_library import TextLibrary, TEXT_LIBRARY_SEARCH_CONFIG
 from app.models.trail import TrailDifficulty
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from datetime import datetime
 import uuid
 
 
@@ -10,7 +13,7 @@ class TextLibraryRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(
+    def _build_conditions(
         self,
         created_by: Optional[uuid.UUID] = None,
         difficulty: Optional[TrailDifficulty] = None,
@@ -18,9 +21,9 @@ class TextLibraryRepository:
         age_range_min: Optional[int] = None,
         age_range_max: Optional[int] = None,
         letters_focus: Optional[List[str]] = None,
-    ) -> List[TextLibrary]:
-        query = select(TextLibrary)
-        
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
+    ) -> list:
         conditions = []
         
         if created_by:
@@ -59,11 +62,134 @@ class TextLibraryRepository:
                 TextLibrary.letters_focus.overlap(letters_focus)
             )
         
-        if conditions:
-            query = query.where(and_(*conditions))
+        if graphemes:
+            conditions.append(TextLibrary.grapheme_frequency.has_all(array(graphemes)))
+        
+        if readability_min is not None:
+            conditions.append(TextLibrary.readability_score >= readability_min)
         
+        return conditions
+
+    async def get_page(
+        self,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        is_public: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        letters_focus: Optional[List[str]] = None,
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: int = 50,
+        with_content: bool = True,
+    ) -> Tuple[List[TextLibrary], Optional[int]]:
+        """Página de textos ordenada por ``(created_at, id)`` decrescente.
+
+        O total de textos que atendem aos filtros vem de ``count(*) OVER ()`` na mesma
+        consulta; é ``None`` quando a página volta vazia.
+        """
+        filtered = select(
+            TextLibrary.id,
+            TextLibrary.created_at,
+            func.count().over().label("total"),
+        )
+        conditions = self._build_conditions(
+            created_by, difficulty, is_public, age_range_min, age_range_max, letters_focus,
+            graphemes, readability_min,
+        )
+        if conditions:
+            filtered = filtered.where(and_(*conditions))
+        filtered = filtered.subquery()
+
+        query = select(TextLibrary, filtered.c.total).join(filtered, filtered.c.id == TextLibrary.id)
+        if not with_content:
+            query = query.options(defer(TextLibrary.content), defer(TextLibrary.search_vector))
+        if after is not None:
+            query = query.where(tuple_(filtered.c.created_at, filtered.c.id) < tuple_(*after))
+        query = query.order_by(filtered.c.created_at.desc(), filtered.c.id.desc()).limit(limit)
+
         result = await self.session.execute(query)
-        return result.scalars().all()
+        rows = result.all()
+        total = rows[0].total if rows else None
+        return [text for text, _ in rows], total
+
+    async def search(
+        self,
+        search_text: str,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        letters_focus: Optional[List[str]] = None,
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
+        after: Optional[Tuple[float, uuid.UUID]] = None,
+        limit: int = 20,
+    ) -> List[Tuple[TextLibrary, float, str]]:
+        """Busca textual (tsvector em português) combinada com similaridade por trigramas no título.
+
+        Retorna ``(texto, relevância, trecho destacado)`` ordenado por relevância.
+        """
+        ts_query = func.websearch_to_tsquery(TEXT_LIBRARY_SEARCH_CONFIG, search_text)
+        rank = cast(
+            func.ts_rank_cd(TextLibrary.search_vector, ts_query)
+            + func.similarity(TextLibrary.title, search_text),
+            Float,
+        ).label("rank")
+        headline = func.ts_headline(
+            TEXT_LIBRARY_SEARCH_CONFIG,
+            TextLibrary.content,
+            ts_query,
+            "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2",
+        ).label("headline")
+
+        conditions = self._build_conditions(
+            created_by, difficulty, None, age_range_min, age_range_max, letters_focus,
+            graphemes, readability_min,
+        )
+        conditions.append(
+            or_(
+                TextLibrary.search_vector.op("@@")(ts_query),
+                TextLibrary.title.op("%")(search_text),
+            )
+        )
+        if after is not None:
+            conditions.append(tuple_(rank, TextLibrary.id) < tuple_(*after))
+
+        query = (
+            select(TextLibrary, rank, headline)
+            .options(defer(TextLibrary.content), defer(TextLibrary.search_vector))
+            .where(and_(*conditions))
+            .order_by(rank.desc(), TextLibrary.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [(text, rank_value, snippet) for text, rank_value, snippet in result.all()]
+
+    async def get_index_rows(self, updated_since: Optional[datetime] = None) -> list:
+        """Colunas de indexação (sem o conteúdo) dos textos já indexados."""
+        query = select(
+            TextLibrary.id,
+            TextLibrary.title,
+            TextLibrary.difficulty,
+            TextLibrary.readability_score,
+            TextLibrary.letter_frequency,
+            TextLibrary.grapheme_frequency,
+            TextLibrary.is_public,
+            TextLibrary.created_by,
+            TextLibrary.updated_at,
+        ).where(TextLibrary.letter_frequency.isnot(None))
+        if updated_since is not None:
+            query = query.where(TextLibrary.updated_at >= updated_since)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def count_indexed(self) -> int:
+        result = await self.session.execute(
+            select(func.count(TextLibrary.id)).where(TextLibrary.letter_frequency.isnot(None))
+        )
+        return result.scalar_one()
 
     async def get_by_id(self, text_id: uuid.UUID) -> Optional[TextLibrary]:
         result = await self.session.execute(
@@ -100,29 +226,20 @@ class TextLibraryRepository:
         created_by: Optional[uuid.UUID] = None,
         difficulty: Optional[TrailDifficulty] = None,
         is_public: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        letters_focus: Optional[List[str]] = None,
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
     ) -> int:
         query = select(func.count(TextLibrary.id))
         
-        conditions = []
-        
-        if created_by:
-            conditions.append(
-                or_(
-                    TextLibrary.is_public == True,
-                    TextLibrary.created_by == created_by
-                )
-            )
-        elif is_public is None:
-            conditions.append(TextLibrary.is_public == True)
-        elif is_public is not None:
-            conditions.append(TextLibrary.is_public == is_public)
-        
-        if difficulty:
-            conditions.append(TextLibrary.difficulty == difficulty)
-        
+        conditions = self._build_conditions(
+            created_by, difficulty, is_public, age_range_min, age_range_max, letters_focus,
+            graphemes, readability_min,
+        )
         if conditions:
             query = query.where(and_(*conditions))
         
         result = await self.session.execute(query)
         return result.scalar_one()
-
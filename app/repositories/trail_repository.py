@@ -1,7 +1,9 @@
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.models.trail import Trail, TrailStory, TrailDifficulty
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from datetime import datetime
 import uuid
 
 
@@ -9,16 +11,14 @@ class TrailRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(
+    def _build_conditions(
         self,
         created_by: Optional[uuid.UUID] = None,
         difficulty: Optional[TrailDifficulty] = None,
         is_default: Optional[bool] = None,
         age_range_min: Optional[int] = None,
         age_range_max: Optional[int] = None,
-    ) -> List[Trail]:
-        query = select(Trail)
-        
+    ) -> list:
         conditions = []
         
         if created_by and not (is_default is True):
@@ -73,14 +73,82 @@ class TrailRepository:
                     )
                 )
         
+        return conditions
+
+    def _paginate(
+        self,
+        query,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: Optional[int] = None,
+    ):
+        if after is not None:
+            query = query.where(tuple_(Trail.created_at, Trail.id) < tuple_(*after))
+        query = query.order_by(Trail.created_at.desc(), Trail.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    async def get_all(
+        self,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        is_default: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Trail]:
+        query = select(Trail).options(selectinload(Trail.stories))
+        
+        conditions = self._build_conditions(
+            created_by, difficulty, is_default, age_range_min, age_range_max
+        )
         if conditions:
             query = query.where(and_(*conditions))
         
-        query = query.order_by(Trail.created_at.desc())
+        query = self._paginate(query, after, limit)
         
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_summaries(
+        self,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        is_default: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Trail, int, int]]:
+        """Trilhas com quantidade de histórias e total de palavras, sem carregar o conteúdo."""
+        story_words = func.coalesce(
+            TrailStory.word_count,
+            func.array_length(
+                func.regexp_split_to_array(func.btrim(TrailStory.content), r"\s+"), 1
+            ),
+        )
+        query = (
+            select(
+                Trail,
+                func.count(TrailStory.id).label("story_count"),
+                func.coalesce(func.sum(story_words), 0).label("total_words"),
+            )
+            .outerjoin(TrailStory, TrailStory.trail_id == Trail.id)
+            .group_by(Trail.id)
+        )
+
+        conditions = self._build_conditions(
+            created_by, difficulty, is_default, age_range_min, age_range_max
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        query = self._paginate(query, after, limit)
+
+        result = await self.session.execute(query)
+        return [(trail, story_count, int(total_words)) for trail, story_count, total_words in result.all()]
+
     async def get_by_id(self, trail_id: uuid.UUID) -> Optional[Trail]:
         result = await self.session.execute(
             select(Trail).where(Trail.id == trail_id)
@@ -94,7 +162,24 @@ class TrailRepository:
         await self.session.refresh(trail)
         return trail
 
-    async def update(self, trail_id: uuid.UUID, trail_data: dict) -> Optional[Trail]:
+    async def create_with_stories(
+        self, trail_data: dict, stories_data: List[dict], commit: bool = True
+    ) -> Tuple[Trail, List[TrailStory]]:
+        """Cria a trilha e as histórias na mesma transação, com um INSERT ... RETURNING cada."""
+        trail_id = trail_data.get("id") or uuid.uuid4()
+        result = await self.session.scalars(
+            insert(Trail).values(**{**trail_data, "id": trail_id}).returning(Trail)
+        )
+        trail = result.one()
+        stories = await TrailStoryRepository(self.session).create_batch(
+            [{**story, "trail_id": trail_id} for story in stories_data],
+            commit=False,
+        )
+        if commit:
+            await self.session.commit()
+        return trail, sorted(stories, key=lambda story: story.order_position)
+
+    async def update(self, trail_id: uuid.UUID, trail_data: dict, commit: bool = True) -> Optional[Trail]:
         stmt = (
             update(Trail)
             .where(Trail.id == trail_id)
@@ -102,34 +187,32 @@ class TrailRepository:
             .returning(Trail)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        trail = result.scalar_one_or_none()
+        if commit:
+            await self.session.commit()
+        return trail
 
-    async def delete(self, trail_id: uuid.UUID) -> bool:
-        stmt = delete(Trail).where(Trail.id == trail_id).returning(Trail)
+    async def delete(self, trail_id: uuid.UUID, commit: bool = True) -> bool:
+        stmt = delete(Trail).where(Trail.id == trail_id).returning(Trail.id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
+        deleted = result.scalar_one_or_none() is not None
+        if commit:
+            await self.session.commit()
+        return deleted
 
     async def count_all(
         self,
         created_by: Optional[uuid.UUID] = None,
         difficulty: Optional[TrailDifficulty] = None,
         is_default: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
     ) -> int:
         query = select(func.count(Trail.id))
         
-        conditions = []
-        
-        if created_by:
-            conditions.append(Trail.created_by == created_by)
-        
-        if difficulty:
-            conditions.append(Trail.difficulty == difficulty)
-        
-        if is_default is not None:
-            conditions.append(Trail.is_default == is_default)
-        
+        conditions = self._build_conditions(
+            created_by, difficulty, is_default, age_range_min, age_range_max
+        )
         if conditions:
             query = query.where(and_(*conditions))
         
@@ -150,28 +233,65 @@ class TrailStoryRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_index_rows(self, updated_since: Optional[datetime] = None) -> list:
+        """Colunas de indexação das histórias já indexadas, com a visibilidade da trilha."""
+        query = (
+            select(
+                TrailStory.id,
+                TrailStory.trail_id,
+                TrailStory.title,
+                func.coalesce(TrailStory.difficulty, Trail.difficulty).label("difficulty"),
+                TrailStory.readability_score,
+                TrailStory.letter_frequency,
+                TrailStory.grapheme_frequency,
+                Trail.is_default.label("is_public"),
+                Trail.created_by,
+                func.greatest(TrailStory.updated_at, Trail.updated_at).label("updated_at"),
+            )
+            .join(Trail, Trail.id == TrailStory.trail_id)
+            .where(TrailStory.letter_frequency.isnot(None))
+        )
+        if updated_since is not None:
+            query = query.where(
+                or_(TrailStory.updated_at >= updated_since, Trail.updated_at >= updated_since)
+            )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def count_indexed(self) -> int:
+        result = await self.session.execute(
+            select(func.count(TrailStory.id)).where(TrailStory.letter_frequency.isnot(None))
+        )
+        return result.scalar_one()
+
     async def get_by_id(self, story_id: uuid.UUID) -> Optional[TrailStory]:
         result = await self.session.execute(
             select(TrailStory).where(TrailStory.id == story_id)
         )
         return result.scalar_one_or_none()
 
-    async def create(self, story_data: dict) -> TrailStory:
+    async def create(self, story_data: dict, commit: bool = True) -> TrailStory:
         story = TrailStory(**story_data)
         self.session.add(story)
-        await self.session.commit()
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
         await self.session.refresh(story)
         return story
 
-    async def create_batch(self, stories_data: List[dict]) -> List[TrailStory]:
-        stories = [TrailStory(**data) for data in stories_data]
-        self.session.add_all(stories)
-        await self.session.commit()
-        for story in stories:
-            await self.session.refresh(story)
+    async def create_batch(self, stories_data: List[dict], commit: bool = True) -> List[TrailStory]:
+        if not stories_data:
+            return []
+        result = await self.session.scalars(
+            insert(TrailStory).values(stories_data).returning(TrailStory)
+        )
+        stories = list(result.all())
+        if commit:
+            await self.session.commit()
         return stories
 
-    async def update(self, story_id: uuid.UUID, story_data: dict) -> Optional[TrailStory]:
+    async def update(self, story_id: uuid.UUID, story_data: dict, commit: bool = True) -> Optional[TrailStory]:
         stmt = (
             update(TrailStory)
             .where(TrailStory.id == story_id)
@@ -179,14 +299,18 @@ class TrailStoryRepository:
             .returning(TrailStory)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        story = result.scalar_one_or_none()
+        if commit:
+            await self.session.commit()
+        return story
 
-    async def delete(self, story_id: uuid.UUID) -> bool:
-        stmt = delete(TrailStory).where(TrailStory.id == story_id).returning(TrailStory)
+    async def delete(self, story_id: uuid.UUID, commit: bool = True) -> bool:
+        stmt = delete(TrailStory).where(TrailStory.id == story_id).returning(TrailStory.id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
+        deleted = result.scalar_one_or_none() is not None
+        if commit:
+            await self.session.commit()
+        return deleted
 
     async def delete_by_trail(self, trail_id: uuid.UUID) -> int:
         stmt = delete(TrailStory).where(TrailStory.trail_id == trail_id).returning(TrailStory)
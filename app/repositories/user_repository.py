@@ -1,7 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.user import User
-from typing import Optional
+from app.models.user import User, UserRole
+from typing import Optional, Iterable, Set
 import uuid
 
 
@@ -26,4 +26,13 @@ class UserRepository:
             select(User).where(User.username == username)
         )
         return result.scalar_one_or_none()
-
+    
+    async def get_professional_ids(self, user_ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+        """Subconjunto dos ids informados que pertence a profissionais."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        result = await self.session.execute(
+            select(User.id).where(User.id.in_(user_ids), User.role == UserRole.professional)
+        )
+        return set(result.scalars().all())
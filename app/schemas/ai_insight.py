@@ -51,3 +51,18 @@ class AIInsightListResponse(BaseModel):
     insights: List[AIInsightResponse]
     total: int
 
+
+
+class GeneratedInsight(BaseModel):
+    type: InsightType
+    priority: InsightPriority
+    title: str
+    description: str
+
+
+class GeneratedStudentInsight(GeneratedInsight):
+    student_id: str
+
+
+class GeneratedInsightBatch(BaseModel):
+    insights: List[GeneratedStudentInsight]
@@ -16,6 +16,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class TokenData(BaseModel):
     user_id: str
     email: str
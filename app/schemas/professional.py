@@ -41,3 +41,21 @@ class ProfessionalListResponse(BaseModel):
     inactive: int
     professionals: list[ProfessionalResponse]
 
+
+
+class ProfessionalDashboardStudent(BaseModel):
+    student_id: str
+    name: str
+    status: str
+    latest_ppm: Optional[float] = None
+    average_accuracy: Optional[float] = None
+    recording_count: int
+    completed_activities: int
+    unread_insights: int
+    last_recorded_at: Optional[datetime] = None
+
+
+class ProfessionalDashboardResponse(BaseModel):
+    professional_id: str
+    total_students: int
+    students: list[ProfessionalDashboardStudent]
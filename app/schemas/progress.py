@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class StudentTrailProgressResponse(BaseModel):
+    id: str
+    student_id: str
+    trail_id: str
+    current_story_id: Optional[str] = None
+    completed_stories: List[str]
+    progress_percentage: float
+    started_at: Optional[datetime] = None
+    last_accessed_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StudentTrailProgressListResponse(BaseModel):
+    total: int
+    progress: List[StudentTrailProgressResponse]
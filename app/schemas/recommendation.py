@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from app.models.trail import TrailDifficulty
+
+
+class RecommendedTextResponse(BaseModel):
+    source: str
+    id: str
+    title: str
+    trail_id: Optional[str] = None
+    difficulty: Optional[TrailDifficulty] = None
+    readability_score: Optional[float] = None
+    score: float
+
+
+class StudentRecommendationResponse(BaseModel):
+    student_id: str
+    misread_words: int
+    weak_graphemes: Dict[str, int]
+    recommendations: List[RecommendedTextResponse]
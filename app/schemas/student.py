@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Literal
 from datetime import date, datetime
+from app.config import settings
 from app.models.student import StudentStatus, Gender
 
 
@@ -33,6 +34,10 @@ class StudentUpdate(BaseModel):
     professional_id: Optional[str] = None
 
 
+class StudentImportRow(StudentBase):
+    professional_id: Optional[str] = None
+
+
 class StudentResponse(StudentBase):
     id: str
     professional_id: str
@@ -49,6 +54,33 @@ class StudentListResponse(BaseModel):
     active: int
     inactive: int
     students: list[StudentResponse]
+    next_cursor: Optional[str] = None
+
+
+class StudentSearchResult(BaseModel):
+    id: str
+    professional_id: str
+    name: str
+    registration: Optional[str] = None
+    status: StudentStatus
+    similarity: float
+
+
+class StudentSearchResponse(BaseModel):
+    total: int
+    results: List[StudentSearchResult]
+
+
+class StudentImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class StudentImportResponse(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    errors: List[StudentImportError]
 
 
 class StudentTrackingPPMPoint(BaseModel):
@@ -88,3 +120,29 @@ class StudentTrackingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+def _model_name(model: str) -> str:
+    return model.strip().removeprefix("models/")
+
+
+class StudentFeedbackRequest(BaseModel):
+    question: str = Field(..., min_length=1, max_length=2000)
+    model: Optional[str] = None
+
+    @field_validator("model")
+    @classmethod
+    def check_allowed_model(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        allowed = {
+            _model_name(model)
+            for model in [settings.google_genai_model, *settings.google_genai_allowed_models]
+        }
+        if _model_name(value) not in allowed:
+            raise ValueError(f"Modelo não permitido. Use um de: {', '.join(sorted(allowed))}")
+        return _model_name(value)
+
+
+class StudentFeedbackResponse(BaseModel):
+    student_id: str
+    answer: str
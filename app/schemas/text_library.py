@@ -48,4 +48,41 @@ class TextLibraryResponse(TextLibraryBase):
 class TextLibraryListResponse(BaseModel):
     total: int
     texts: List[TextLibraryResponse]
+    next_cursor: Optional[str] = None
 
+
+
+class TextLibrarySummaryResponse(BaseModel):
+    id: str
+    title: str
+    subtitle: Optional[str] = None
+    difficulty: TrailDifficulty
+    age_range_min: Optional[int] = None
+    age_range_max: Optional[int] = None
+    letters_focus: Optional[List[str]] = None
+    tags: Optional[dict] = None
+    word_count: Optional[int] = None
+    is_public: bool = True
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_by: Optional[str] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TextLibrarySummaryListResponse(BaseModel):
+    total: int
+    texts: List[TextLibrarySummaryResponse]
+    next_cursor: Optional[str] = None
+
+
+class TextLibrarySearchResult(TextLibrarySummaryResponse):
+    rank: float
+    headline: str
+
+
+class TextLibrarySearchResponse(BaseModel):
+    results: List[TextLibrarySearchResult]
+    next_cursor: Optional[str] = None
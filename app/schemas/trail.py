@@ -79,7 +79,24 @@ class TrailResponse(TrailBase):
         from_attributes = True
 
 
+class TrailSummaryResponse(TrailBase):
+    id: str
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_by: Optional[str] = None
+    updated_at: datetime
+    story_count: int
+    total_words: int
+
+
 class TrailListResponse(BaseModel):
     total: int
     trails: List[TrailResponse]
+    next_cursor: Optional[str] = None
+
+
+class TrailSummaryListResponse(BaseModel):
+    total: int
+    trails: List[TrailSummaryResponse]
+    next_cursor: Optional[str] = None
 
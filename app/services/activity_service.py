@@ -5,7 +5,7 @@ from app.repositories.student_repository import StudentRepository
 from app.schemas.activity import ActivityCreate, ActivityUpdate, ActivityResponse, ActivityListResponse
 from app.models.activity import ActivityStatus
 from app.models.user import UserRole
-from typing import Optional
+from typing import Optional, List
 import uuid
 
 
@@ -14,10 +14,37 @@ class ActivityService:
         self.activity_repository = ActivityRepository(session)
         self.student_repository = StudentRepository(session)
 
+    async def _validate_student_ids(
+        self,
+        student_ids: List[str],
+        professional_id: Optional[uuid.UUID] = None
+    ) -> List[uuid.UUID]:
+        student_uuids = []
+        for student_id_str in student_ids:
+            try:
+                student_uuid = uuid.UUID(student_id_str)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"ID de aluno inválido: {student_id_str}"
+                )
+            if student_uuid not in student_uuids:
+                student_uuids.append(student_uuid)
+
+        missing = await self.student_repository.get_missing_ids(student_uuids, professional_id)
+        if missing:
+            missing_ids = ", ".join(str(sid) for sid in student_uuids if sid in missing)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Aluno não encontrado: {missing_ids}"
+            )
+        return student_uuids
+
     async def create_activity(
         self,
         professional_id: uuid.UUID,
-        data: ActivityCreate
+        data: ActivityCreate,
+        scope_to_professional: bool = True
     ) -> ActivityResponse:
         if not data.student_ids:
             raise HTTPException(
@@ -25,22 +52,10 @@ class ActivityService:
                 detail="É necessário selecionar pelo menos um aluno"
             )
 
-        student_uuids = []
-        for student_id_str in data.student_ids:
-            try:
-                student_uuid = uuid.UUID(student_id_str)
-                student = await self.student_repository.get_by_id(student_uuid)
-                if not student:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Aluno não encontrado: {student_id_str}"
-                    )
-                student_uuids.append(student_uuid)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"ID de aluno inválido: {student_id_str}"
-                )
+        student_uuids = await self._validate_student_ids(
+            data.student_ids,
+            professional_id if scope_to_professional else None,
+        )
 
         activity_data = data.model_dump(exclude={"student_ids"})
         activity_data["created_by"] = professional_id
@@ -110,9 +125,13 @@ class ActivityService:
             limit
         )
 
+        student_ids_by_activity = await self.activity_repository.get_student_ids_by_activity(
+            [activity.id for activity in activities]
+        )
+
         activities_with_students = []
         for activity in activities:
-            student_ids = await self.activity_repository.get_student_ids(activity.id)
+            student_ids = student_ids_by_activity[activity.id]
             activities_with_students.append(
                 ActivityResponse(
                     id=str(activity.id),
@@ -132,25 +151,13 @@ class ActivityService:
                 )
             )
 
-        total = await self.activity_repository.count_all(filter_professional_id)
-        pending = await self.activity_repository.count_by_status(
-            ActivityStatus.pending,
-            filter_professional_id
-        )
-        in_progress = await self.activity_repository.count_by_status(
-            ActivityStatus.in_progress,
-            filter_professional_id
-        )
-        completed = await self.activity_repository.count_by_status(
-            ActivityStatus.completed,
-            filter_professional_id
-        )
+        counts = await self.activity_repository.count_summary(filter_professional_id)
 
         return ActivityListResponse(
-            total=total,
-            pending=pending,
-            in_progress=in_progress,
-            completed=completed,
+            total=counts["total"],
+            pending=counts[ActivityStatus.pending.value],
+            in_progress=counts[ActivityStatus.in_progress.value],
+            completed=counts[ActivityStatus.completed.value],
             activities=activities_with_students,
         )
 
@@ -226,22 +233,10 @@ class ActivityService:
         student_ids_uuid = None
 
         if data.student_ids is not None:
-            student_ids_uuid = []
-            for student_id_str in data.student_ids:
-                try:
-                    student_uuid = uuid.UUID(student_id_str)
-                    student = await self.student_repository.get_by_id(student_uuid)
-                    if not student:
-                        raise HTTPException(
-                            status_code=status.HTTP_404_NOT_FOUND,
-                            detail=f"Aluno não encontrado: {student_id_str}"
-                        )
-                    student_ids_uuid.append(student_uuid)
-                except ValueError:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"ID de aluno inválido: {student_id_str}"
-                    )
+            student_ids_uuid = await self._validate_student_ids(
+                data.student_ids,
+                user_id if user_role == UserRole.professional.value else None,
+            )
 
         updated_activity = await self.activity_repository.update(
             activity_id,
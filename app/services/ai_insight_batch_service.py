@@ -0,0 +1,107 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.recording import Recording
+from app.repositories.ai_insight_repository import AIInsightRepository
+from app.repositories.recording_repository import RecordingRepository
+from app.services.ai_insight_service import AIInsightService
+from app.services.genai.service import GeminiService, GeminiServiceError
+
+
+logger = logging.getLogger(__name__)
+
+
+class AIInsightBatchService:
+    """Gera insights do dia agrupando as gravações por profissional."""
+
+    def __init__(self, session: AsyncSession, batch_size: Optional[int] = None):
+        self.session = session
+        self.recording_repository = RecordingRepository(session)
+        self.ai_insight_repository = AIInsightRepository(session)
+        self.batch_size = max(1, batch_size or settings.ai_insights_batch_size)
+
+    @staticmethod
+    def _day_bounds(day: date) -> tuple[datetime, datetime]:
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        return start, start + timedelta(days=1)
+
+    @staticmethod
+    def _group_by_professional(
+        recordings: List[Recording],
+    ) -> Dict[uuid.UUID, Dict[uuid.UUID, List[Recording]]]:
+        grouped: Dict[uuid.UUID, Dict[uuid.UUID, List[Recording]]] = defaultdict(dict)
+        for recording in recordings:
+            student = recording.student
+            if not student or student.deleted_at is not None:
+                continue
+            owner_id = student.professional_id or recording.created_by
+            if not owner_id:
+                continue
+            grouped[owner_id].setdefault(student.id, []).append(recording)
+        return grouped
+
+    def _chunk_students(
+        self, recordings_by_student: Dict[uuid.UUID, List[Recording]]
+    ) -> List[Dict[uuid.UUID, List[Recording]]]:
+        items = list(recordings_by_student.items())
+        return [
+            dict(items[index:index + self.batch_size])
+            for index in range(0, len(items), self.batch_size)
+        ]
+
+    async def generate_for_day(self, day: Optional[date] = None) -> int:
+        target_day = day or (datetime.now(timezone.utc).date() - timedelta(days=1))
+        start, end = self._day_bounds(target_day)
+        recordings = await self.recording_repository.get_completed_between(start, end)
+        if not recordings:
+            return 0
+
+        gemini_service = GeminiService(self.session)
+        expires_at = AIInsightService.default_expiration()
+        rows = []
+        for professional_id, recordings_by_student in self._group_by_professional(recordings).items():
+            for batch in self._chunk_students(recordings_by_student):
+                try:
+                    insights = await gemini_service.generate_batch_recording_insights(batch)
+                except GeminiServiceError as exc:
+                    logger.warning(
+                        "GeminiServiceError ao gerar insights em lote para o profissional %s: %s",
+                        professional_id,
+                        exc,
+                        exc_info=True,
+                    )
+                    continue
+
+                missing = len(batch) - len(insights)
+                if missing:
+                    logger.info(
+                        "Gemini não retornou insight para %s de %s alunos do profissional %s",
+                        missing,
+                        len(batch),
+                        professional_id,
+                    )
+
+                for student_id, payload in insights.items():
+                    rows.append(
+                        {
+                            "professional_id": professional_id,
+                            "insight_type": payload["type"],
+                            "priority": payload["priority"],
+                            "title": payload["title"],
+                            "description": payload["description"],
+                            "related_students": [student_id],
+                            "expires_at": expires_at,
+                        }
+                    )
+
+        created = await self.ai_insight_repository.create_batch(
+            rows, dedupe_since=AIInsightService.dedup_window_start()
+        )
+        await self.session.commit()
+        return created
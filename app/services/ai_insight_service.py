@@ -1,8 +1,10 @@
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.ai_insight import InsightType, InsightPriority
 from app.repositories.ai_insight_repository import AIInsightRepository
 from app.schemas.ai_insight import (
@@ -18,6 +20,16 @@ class AIInsightService:
         self.session = session
         self.repository = AIInsightRepository(session)
 
+    @staticmethod
+    def default_expiration() -> Optional[datetime]:
+        if settings.ai_insights_ttl_days <= 0:
+            return None
+        return datetime.now(timezone.utc) + timedelta(days=settings.ai_insights_ttl_days)
+
+    @staticmethod
+    def dedup_window_start() -> datetime:
+        return datetime.now(timezone.utc) - timedelta(hours=settings.ai_insights_dedup_window_hours)
+
     @staticmethod
     def _parse_uuid(value: Optional[str]) -> Optional[UUID]:
         if not value:
@@ -53,7 +65,7 @@ class AIInsightService:
             title=data.title,
             description=data.description,
             related_students=self._parse_uuid_list(data.related_students),
-            expires_at=data.expires_at,
+            expires_at=data.expires_at or self.default_expiration(),
             is_read=data.is_read,
         )
         await self.session.commit()
@@ -121,3 +133,13 @@ class AIInsightService:
             await self.session.commit()
         return deleted
 
+    async def purge_expired(self, batch_size: Optional[int] = None) -> int:
+        """Remove insights expirados em lotes curtos, com um commit por lote."""
+        batch_size = batch_size or settings.ai_insights_purge_batch_size
+        total = 0
+        while True:
+            deleted = await self.repository.delete_expired(batch_size)
+            await self.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
@@ -1,15 +1,19 @@
 from datetime import timedelta
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.repositories.user_repository import UserRepository
-from app.utils.password import verify_password
+from app.utils.password import PasswordPoolBusy, verify_password_async
 from app.utils.jwt import create_access_token, create_refresh_token, decode_refresh_token
+from app.utils.token_revocation import revocation_list
 from app.schemas.auth import TokenData
 from app.config import settings
+import uuid
 
 
 class AuthService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.user_repository = UserRepository(session)
     
     async def authenticate_user(self, email: str, password: str) -> dict:
@@ -22,7 +26,16 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        if not verify_password(password, user.password_hash):
+        try:
+            password_ok = await verify_password_async(password, user.password_hash)
+        except PasswordPoolBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Muitos logins simultâneos. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+        
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email ou senha incorretos",
@@ -61,6 +74,7 @@ class AuthService:
         }
     
     async def refresh_access_token(self, refresh_token: str) -> dict:
+        await revocation_list.refresh(self.session)
         payload = decode_refresh_token(refresh_token)
         
         if not payload:
@@ -101,3 +115,16 @@ class AuthService:
             "token_type": "bearer",
         }
 
+    async def logout(self, access_payload: dict, refresh_token: Optional[str] = None) -> None:
+        """Revoga o access token usado na requisição e, se enviado, o refresh token do mesmo usuário."""
+        user_id = uuid.UUID(access_payload["sub"])
+        payloads = [access_payload]
+        if refresh_token:
+            refresh_payload = decode_refresh_token(refresh_token)
+            if refresh_payload and refresh_payload.get("sub") == access_payload["sub"]:
+                payloads.append(refresh_payload)
+        
+        # Tokens emitidos antes da revogação existir não têm jti e expiram sozinhos
+        for payload in payloads:
+            if payload.get("jti"):
+                await revocation_list.revoke(self.session, payload["jti"], payload["exp"], user_id)
@@ -0,0 +1,81 @@
+import json
+from typing import Optional
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _strip_code_fence(text: str) -> str:
+    content = text.strip()
+    if content.startswith("```"):
+        first_newline = content.find("\n")
+        content = content[first_newline + 1:] if first_newline != -1 else ""
+        if content.rstrip().endswith("```"):
+            content = content.rstrip()[:-3]
+    return content.strip()
+
+
+def parse_partial_json(raw_text: str) -> Optional[dict]:
+    """Interpreta um objeto JSON possivelmente truncado (resposta parcial ou em streaming).
+
+    Percorre o texto uma única vez a partir do primeiro ``{`` acompanhando strings e
+    aninhamento; se o objeto não terminar, descarta o último par chave/valor incompleto
+    (uma string sem aspas de fechamento nunca vira valor pronto) e fecha os colchetes
+    pendentes.
+    """
+    content = _strip_code_fence(raw_text)
+    start = content.find("{")
+    if start == -1:
+        return None
+
+    stack = []
+    in_string = False
+    escaped = False
+    last_safe = None
+    for index in range(start, len(content)):
+        char = content[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            if not stack:
+                return None
+            stack.pop()
+            if not stack:
+                return _loads_dict(content[start:index + 1])
+        elif char == ",":
+            last_safe = (index, list(stack))
+
+    candidates = []
+    if not in_string:
+        tail = content[start:].rstrip().rstrip(",")
+        # Um número no fim pode ter sido cortado ("12" de "125"); só fecha valores completos
+        if tail and not tail[-1].isdigit():
+            candidates.append(tail + "".join(_CLOSERS[c] for c in reversed(stack)))
+    if last_safe is not None:
+        index, safe_stack = last_safe
+        candidates.append(
+            content[start:index] + "".join(_CLOSERS[c] for c in reversed(safe_stack))
+        )
+    for candidate in candidates:
+        data = _loads_dict(candidate)
+        if data is not None:
+            return data
+    return None
+
+
+def _loads_dict(text: str) -> Optional[dict]:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
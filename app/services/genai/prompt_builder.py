@@ -0,0 +1,79 @@
+import math
+from dataclasses import dataclass, field
+from typing import List
+
+
+# Média aproximada para texto em português nos tokenizadores do Gemini.
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = " [...]"
+MIN_SECTION_TOKENS = 24
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK))
+    cut = text[:max_chars]
+    last_space = cut.rfind(" ")
+    if last_space > max_chars // 2:
+        cut = cut[:last_space]
+    return cut.rstrip() + TRUNCATION_MARK
+
+
+@dataclass
+class PromptSection:
+    title: str
+    body: str
+    priority: int
+    rank: int = 0
+    order: int = 0
+
+    def render(self, body: str) -> str:
+        return f"{self.title}:\n{body}" if self.title else body
+
+
+@dataclass
+class PromptBuilder:
+    """Monta o contexto de um prompt respeitando um orçamento de tokens.
+
+    As seções são escolhidas por prioridade (menor valor = mais importante) e, dentro
+    da mesma prioridade, por ``rank``. A que não couber inteira é truncada se sobrar
+    espaço útil; as seguintes ainda entram se couberem no que restar. O texto final
+    preserva a ordem de inserção.
+    """
+
+    budget_tokens: int
+    sections: List[PromptSection] = field(default_factory=list)
+
+    def add_section(self, title: str, body: str, priority: int, rank: int = 0) -> None:
+        body = (body or "").strip()
+        if not body:
+            return
+        self.sections.append(
+            PromptSection(title=title, body=body, priority=priority, rank=rank, order=len(self.sections))
+        )
+
+    def build(self, reserved_tokens: int = 0) -> str:
+        remaining = self.budget_tokens - reserved_tokens
+        selected: List[tuple[PromptSection, str]] = []
+        for section in sorted(self.sections, key=lambda item: (item.priority, item.rank, item.order)):
+            cost = estimate_tokens(section.render(section.body))
+            if cost <= remaining:
+                selected.append((section, section.body))
+                remaining -= cost
+                continue
+            body_budget = remaining - estimate_tokens(section.render(""))
+            if body_budget >= MIN_SECTION_TOKENS:
+                body = truncate_to_tokens(section.body, body_budget)
+                selected.append((section, body))
+                remaining -= estimate_tokens(section.render(body))
+        selected.sort(key=lambda item: item[0].order)
+        return "\n\n".join(section.render(body) for section, body in selected)
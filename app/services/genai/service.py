@@ -1,17 +1,33 @@
-import json
-import re
+import asyncio
+import logging
+import time
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple, Type, TypeVar
 
+from google.genai import types
+from pydantic import BaseModel, ValidationError
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models.ai_insight import InsightPriority, InsightType
 from app.models.diagnostic import Diagnostic
 from app.models.recording import Recording, RecordingAnalysis
 from app.models.student import Student
+from app.schemas.ai_insight import GeneratedInsight, GeneratedInsightBatch
 from app.services.genai.client import get_genai_client, get_genai_model_config
+from app.services.genai.json_parser import parse_partial_json
+from app.services.genai.prompt_builder import PromptBuilder, estimate_tokens, truncate_to_tokens
+
+
+logger = logging.getLogger(__name__)
+
+# Transcrições anteriores à mais recente entram resumidas no prompt.
+OLDER_TRANSCRIPT_TOKENS = 120
+
+T = TypeVar("T")
 
 
 class GeminiServiceError(RuntimeError):
@@ -24,14 +40,19 @@ class GeminiService:
         self.client = get_genai_client()
         self.model_config = get_genai_model_config()
 
-    async def _fetch_student(self, student_id: uuid.UUID) -> Optional[Student]:
-        result = await self.session.execute(
+    async def _fetch_student(
+        self, student_id: uuid.UUID, session: Optional[AsyncSession] = None
+    ) -> Optional[Student]:
+        result = await (session or self.session).execute(
             select(Student).where(Student.id == student_id)
         )
         return result.scalar_one_or_none()
 
     async def _fetch_recent_recordings(
-        self, student_id: uuid.UUID, limit: int = 5
+        self,
+        student_id: uuid.UUID,
+        limit: int = 5,
+        session: Optional[AsyncSession] = None,
     ) -> List[Recording]:
         stmt = (
             select(Recording)
@@ -46,13 +67,16 @@ class GeminiService:
             .order_by(Recording.recorded_at.desc())
             .limit(limit)
         )
-        result = await self.session.execute(stmt)
+        result = await (session or self.session).execute(stmt)
         return list(result.scalars().all())
 
     async def _fetch_recent_diagnostics(
-        self, student_id: uuid.UUID, limit: int = 3
+        self,
+        student_id: uuid.UUID,
+        limit: int = 3,
+        session: Optional[AsyncSession] = None,
     ) -> List[Diagnostic]:
-        result = await self.session.execute(
+        result = await (session or self.session).execute(
             select(Diagnostic)
             .where(Diagnostic.student_id == student_id)
             .order_by(Diagnostic.created_at.desc())
@@ -60,20 +84,51 @@ class GeminiService:
         )
         return list(result.scalars().all())
 
-    def _format_recordings(self, recordings: List[Recording]) -> str:
-        if not recordings:
-            return ""
-        entries = []
-        for recording in recordings:
-            title = recording.story.title if recording.story else "Leitura"
-            transcript = recording.transcription or ""
-            metrics_block = self._format_metrics(recording.analysis)
-            entries.append(
-                f"Título: {title}\nData: {recording.recorded_at}\n"
-                f"Dados técnicos:\n{metrics_block}\n"
-                f"Transcrição:\n{transcript.strip()}"
+    @staticmethod
+    async def _in_own_session(fetch: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Uma AsyncSession não aceita consultas simultâneas; cada consulta paralela usa a sua."""
+        async with AsyncSessionLocal() as session:
+            return await fetch(*args, session=session)
+
+    def _format_recording(self, recording: Recording, transcript_tokens: Optional[int] = None) -> str:
+        title = recording.story.title if recording.story else "Leitura"
+        transcript = (recording.transcription or "").strip()
+        if transcript_tokens is not None:
+            transcript = truncate_to_tokens(transcript, transcript_tokens)
+        metrics_block = self._format_metrics(recording.analysis)
+        return (
+            f"Título: {title}\nData: {recording.recorded_at}\n"
+            f"Dados técnicos:\n{metrics_block}\n"
+            f"Transcrição:\n{transcript}"
+        )
+
+    def _add_recording_sections(
+        self,
+        builder: PromptBuilder,
+        title: str,
+        recordings: List[Recording],
+        priority: int,
+        older_priority: int,
+    ) -> None:
+        """Mais recentes primeiro: a primeira entra completa com ``priority``; as demais,
+        resumidas, ficam em ``older_priority`` ordenadas pela recência."""
+        for index, recording in enumerate(recordings):
+            transcript_tokens = None if index == 0 else OLDER_TRANSCRIPT_TOKENS
+            builder.add_section(
+                f"{title} ({index + 1}/{len(recordings)})",
+                self._format_recording(recording, transcript_tokens),
+                priority if index == 0 else older_priority,
+                rank=index,
             )
-        return "\n\n".join(entries)
+
+    def _log_prompt_tokens(self, purpose: str, prompt: str, response: Any = None) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        logger.info(
+            "Prompt %s: %s tokens estimados, %s tokens reportados pelo Gemini",
+            purpose,
+            estimate_tokens(prompt),
+            getattr(usage, "prompt_token_count", None),
+        )
 
     def _format_diagnostics(self, diagnostics: List[Diagnostic]) -> str:
         if not diagnostics:
@@ -125,53 +180,56 @@ class GeminiService:
             details.append("Pontos de melhoria: " + ", ".join(improvements[:3]))
         return "\n".join(details) if details else "Sem métricas disponíveis"
 
-    async def generate_student_feedback(
-        self,
-        student_id: str,
-        question: str,
-        model: Optional[str] = None,
-    ) -> str:
+    async def _build_student_feedback_prompt(self, student_id: str, question: str) -> str:
         try:
             student_uuid = uuid.UUID(student_id)
         except ValueError as exc:
             raise GeminiServiceError("Identificador de estudante inválido") from exc
 
-        student = await self._fetch_student(student_uuid)
+        student, recordings, diagnostics = await asyncio.gather(
+            self._in_own_session(self._fetch_student, student_uuid),
+            self._in_own_session(self._fetch_recent_recordings, student_uuid),
+            self._in_own_session(self._fetch_recent_diagnostics, student_uuid),
+        )
         if not student:
             raise GeminiServiceError("Estudante não encontrado")
 
-        recordings = await self._fetch_recent_recordings(student_uuid)
-        diagnostics = await self._fetch_recent_diagnostics(student_uuid)
-
-        context_sections = []
+        builder = PromptBuilder(settings.google_genai_prompt_token_budget)
         if student.observations:
-            context_sections.append(
-                f"Observações do professor:\n{student.observations.strip()}"
-            )
+            builder.add_section("Observações do professor", student.observations, priority=0)
+        self._add_recording_sections(builder, "Transcrição de leitura", recordings, priority=1, older_priority=3)
+        builder.add_section("Diagnósticos recentes", self._format_diagnostics(diagnostics), priority=2)
 
-        diagnostics_text = self._format_diagnostics(diagnostics)
-        if diagnostics_text:
-            context_sections.append(f"Diagnósticos recentes:\n{diagnostics_text}")
-
-        recordings_text = self._format_recordings(recordings)
-        if recordings_text:
-            context_sections.append(f"Transcrições de leituras:\n{recordings_text}")
-
-        context = "\n\n".join(context_sections) if context_sections else "Sem contexto adicional."
-
-        prompt = (
+        header = (
             "Você é um assistente pedagógico especializado em alfabetização. "
             "Use o contexto fornecido para responder de forma objetiva, em português do Brasil.\n\n"
             f"Dados do estudante: {student.name} (idade: {student.age or 'não informada'})\n"
-            f"Contexto disponível:\n{context}\n\n"
-            f"Pergunta: {question}\n\n"
-            "Resposta:"
+        )
+        question_block = f"Pergunta: {question}\n\nResposta:"
+        context = builder.build(reserved_tokens=estimate_tokens(header + question_block))
+
+        return (
+            f"{header}"
+            f"Contexto disponível:\n{context or 'Sem contexto adicional.'}\n\n"
+            f"{question_block}"
         )
 
+    def _resolve_model(self, model: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
         config = self.model_config.copy()
-        model_id = model or config.pop("model", "models/gemini-2.5-flash")
+        default_model = config.pop("model", "models/gemini-2.5-flash")
+        model_id = model or default_model
         if not model_id.startswith("models/"):
             model_id = f"models/{model_id}"
+        return model_id, config
+
+    async def generate_student_feedback(
+        self,
+        student_id: str,
+        question: str,
+        model: Optional[str] = None,
+    ) -> str:
+        prompt = await self._build_student_feedback_prompt(student_id, question)
+        model_id, config = self._resolve_model(model)
 
         try:
             response = self.client.models.generate_content(
@@ -181,25 +239,95 @@ class GeminiService:
             )
         except Exception as exc:  # noqa: BLE001
             raise GeminiServiceError("Falha ao gerar conteúdo com o Gemini") from exc
+        self._log_prompt_tokens("feedback", prompt, response)
 
         answer = getattr(response, "text", None)
         if not answer:
             raise GeminiServiceError("Resposta vazia recebida do Gemini")
         return answer.strip()
 
+    async def stream_student_feedback(
+        self,
+        student_id: str,
+        question: str,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Monta o contexto antes de retornar, para que erros de validação cheguem antes do stream."""
+        prompt = await self._build_student_feedback_prompt(student_id, question)
+        model_id, config = self._resolve_model(model)
+        self._log_prompt_tokens("feedback-stream", prompt)
+
+        async def chunks() -> AsyncIterator[str]:
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=model_id,
+                    contents=prompt,
+                    **config,
+                )
+                async for chunk in stream:
+                    text = getattr(chunk, "text", None)
+                    if text:
+                        yield text
+            except Exception as exc:  # noqa: BLE001
+                raise GeminiServiceError("Falha ao gerar conteúdo com o Gemini") from exc
+
+        return chunks()
+
     def _extract_json_payload(self, raw_text: str) -> Optional[dict]:
-        content = raw_text.strip()
-        if "```" in content:
-            match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", content, re.DOTALL)
-            if match:
-                content = match.group(1)
+        return parse_partial_json(raw_text)
+
+    def _generate_structured(
+        self,
+        prompt: str,
+        schema: Type[BaseModel],
+        error_message: str,
+    ) -> Optional[dict]:
+        model_id, config = self._resolve_model()
+
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            return None
-        if not isinstance(data, dict):
-            return None
-        return data
+            response = self.client.models.generate_content(
+                model=model_id,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=schema,
+                ),
+                **config,
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise GeminiServiceError(error_message) from exc
+        self._log_prompt_tokens(schema.__name__, prompt, response)
+
+        started = time.perf_counter()
+        parsed = getattr(response, "parsed", None)
+        source = "schema"
+        if isinstance(parsed, BaseModel):
+            payload: Optional[dict] = parsed.model_dump(mode="json")
+        else:
+            source = "partial"
+            payload = None
+            answer = getattr(response, "text", None)
+            if answer:
+                payload = self._extract_json_payload(answer)
+                if payload is not None:
+                    try:
+                        payload = schema.model_validate(payload).model_dump(mode="json")
+                    except ValidationError as exc:
+                        logger.warning(
+                            "Resposta estruturada %s descartada: não passou na validação (%s)",
+                            schema.__name__,
+                            exc.error_count(),
+                        )
+                        source = "partial-invalid"
+                        payload = None
+        logger.info(
+            "Resposta estruturada %s interpretada em %.2f ms (origem: %s, sucesso: %s)",
+            schema.__name__,
+            (time.perf_counter() - started) * 1000,
+            source,
+            payload is not None,
+        )
+        return payload
 
     def _normalize_insight_payload(self, payload: dict) -> Optional[dict]:
         raw_type = str(payload.get("type", "suggestion")).strip()
@@ -227,6 +355,82 @@ class GeminiService:
             "description": description,
         }
 
+    def _format_batch_student(
+        self,
+        student: Student,
+        recordings: List[Recording],
+        transcript_tokens: int,
+    ) -> str:
+        lines = [
+            f"student_id: {student.id}",
+            f"Aluno: {student.name} (idade: {student.age or 'não informada'})",
+        ]
+        if student.observations:
+            lines.append(f"Observações do professor: {student.observations.strip()}")
+        for recording in recordings:
+            title = recording.story.title if recording.story else "Leitura"
+            lines.append(
+                f"- Leitura \"{title}\" em {recording.recorded_at} "
+                f"({recording.duration_seconds:.1f} s)\n"
+                f"{self._format_metrics(recording.analysis)}"
+            )
+        latest = recordings[-1]
+        if latest.transcription:
+            transcript = truncate_to_tokens(latest.transcription.strip(), transcript_tokens)
+            lines.append(f"Transcrição mais recente:\n{transcript}")
+        return "\n".join(lines)
+
+    async def generate_batch_recording_insights(
+        self,
+        recordings_by_student: Dict[uuid.UUID, List[Recording]],
+    ) -> Dict[uuid.UUID, dict]:
+        # Metade do orçamento fica para as métricas; a outra metade é dividida entre as transcrições.
+        transcript_tokens = settings.google_genai_prompt_token_budget // (2 * max(1, len(recordings_by_student)))
+        students_blocks = []
+        for recordings in recordings_by_student.values():
+            student = recordings[0].student if recordings else None
+            if not student:
+                continue
+            students_blocks.append(self._format_batch_student(student, recordings, transcript_tokens))
+        if not students_blocks:
+            return {}
+
+        prompt = (
+            "Você é um especialista em alfabetização auxiliando um profissional da educação. "
+            "Avalie as leituras do dia de cada aluno abaixo e produza um insight pedagógico útil "
+            "para cada um. Mantenha um tom encorajador e prático.\n\n"
+            + "\n\n---\n\n".join(students_blocks)
+            + "\n\nResponda exclusivamente em JSON, com um item por aluno:\n"
+            '{"insights": [{"student_id": "uuid do aluno", '
+            '"type": "progress|attention_needed|suggestion", '
+            '"priority": "low|medium|high", '
+            '"title": "frase curta", "description": "parágrafo breve com orientação prática"}]}\n'
+            "Não inclua texto fora do JSON."
+        )
+
+        payload = self._generate_structured(
+            prompt,
+            GeneratedInsightBatch,
+            "Falha ao gerar insights em lote com o Gemini",
+        )
+        if not payload or not isinstance(payload.get("insights"), list):
+            return {}
+
+        insights: Dict[uuid.UUID, dict] = {}
+        for item in payload["insights"]:
+            if not isinstance(item, dict):
+                continue
+            try:
+                student_uuid = uuid.UUID(str(item.get("student_id", "")).strip())
+            except ValueError:
+                continue
+            if student_uuid not in recordings_by_student:
+                continue
+            normalized = self._normalize_insight_payload(item)
+            if normalized:
+                insights[student_uuid] = normalized
+        return insights
+
     async def generate_recording_insight(self, recording: Recording) -> Optional[dict]:
         if not recording.transcription:
             return None
@@ -236,67 +440,56 @@ class GeminiService:
             return None
 
         diagnostics = await self._fetch_recent_diagnostics(recording.student_id)
-        previous_recordings = await self._fetch_recent_recordings(recording.student_id)
-        diagnostics_text = self._format_diagnostics(diagnostics)
-        recordings_text = self._format_recordings(previous_recordings)
-        current_analysis_text = self._format_metrics(recording.analysis)
-
-        context_sections = []
+        previous_recordings = [
+            item
+            for item in await self._fetch_recent_recordings(recording.student_id)
+            if item.id != recording.id
+        ]
+        budget = settings.google_genai_prompt_token_budget
+
+        builder = PromptBuilder(budget)
+        builder.add_section("Métricas da leitura atual", self._format_metrics(recording.analysis), priority=0)
         if student.observations:
-            context_sections.append(f"Observações do professor:\n{student.observations.strip()}")
-        if diagnostics_text:
-            context_sections.append(f"Diagnósticos recentes:\n{diagnostics_text}")
-        if recordings_text:
-            context_sections.append(f"Leituras anteriores:\n{recordings_text}")
-
-        if current_analysis_text:
-            context_sections.append(f"Métricas da leitura atual:\n{current_analysis_text}")
-
-        context_summary = "\n\n".join(context_sections) if context_sections else "Sem contexto adicional."
+            builder.add_section("Observações do professor", student.observations, priority=1)
+        self._add_recording_sections(builder, "Leitura anterior", previous_recordings, priority=2, older_priority=4)
+        builder.add_section("Diagnósticos recentes", self._format_diagnostics(diagnostics), priority=3)
 
         new_recording_block = (
             f"Nova gravação:\n"
             f"- História ID: {recording.story_id}\n"
             f"- Data/hora: {recording.recorded_at}\n"
             f"- Duração: {recording.duration_seconds:.1f} segundos\n"
-            f"- Transcrição completa:\n{recording.transcription.strip()}\n"
+            f"- Transcrição completa:\n"
+            f"{truncate_to_tokens(recording.transcription.strip(), budget // 2)}\n"
         )
-
-        prompt = (
+        header = (
             "Você é um especialista em alfabetização auxiliando um profissional da educação. "
             "Avalie a nova gravação do aluno com base no contexto e produza um insight pedagógico útil. "
             "Mantenha um tom encorajador e prático.\n\n"
             f"Aluno: {student.name} (idade: {student.age or 'não informada'})\n"
             f"{new_recording_block}\n"
-            f"Contexto adicional:\n{context_summary}\n\n"
+        )
+        instructions = (
             "Responda exclusivamente em JSON com os campos obrigatórios:\n"
             '{"type": "progress|attention_needed|suggestion", '
             '"priority": "low|medium|high", '
             '"title": "frase curta", "description": "parágrafo breve com orientação prática"}\n'
             "Não inclua texto fora do JSON."
         )
+        context_summary = builder.build(reserved_tokens=estimate_tokens(header + instructions))
 
-        config = self.model_config.copy()
-        model_id = config.pop("model", "models/gemini-2.5-flash")
-        if not model_id.startswith("models/"):
-            model_id = f"models/{model_id}"
-
-        try:
-            response = self.client.models.generate_content(
-                model=model_id,
-                contents=prompt,
-                **config,
-            )
-        except Exception as exc:  # noqa: BLE001
-            raise GeminiServiceError("Falha ao gerar insight com o Gemini") from exc
-
-        answer = getattr(response, "text", None)
-        if not answer:
-            return None
+        prompt = (
+            f"{header}"
+            f"Contexto adicional:\n{context_summary or 'Sem contexto adicional.'}\n\n"
+            f"{instructions}"
+        )
 
-        payload = self._extract_json_payload(answer)
+        payload = self._generate_structured(
+            prompt,
+            GeneratedInsight,
+            "Falha ao gerar insight com o Gemini",
+        )
         if not payload:
             return None
 
         return self._normalize_insight_payload(payload)
-
@@ -2,8 +2,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.repositories.professional_repository import ProfessionalRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.student_repository import StudentRepository
 from app.schemas.professional import ProfessionalCreate, ProfessionalUpdate
-from app.utils.password import hash_password
+from app.utils.password import PasswordPoolBusy, hash_password_async
+from app.utils.user_cache import user_cache
 from app.models.user import UserRole
 import uuid
 
@@ -12,7 +14,18 @@ class ProfessionalService:
     def __init__(self, session: AsyncSession):
         self.professional_repository = ProfessionalRepository(session)
         self.user_repository = UserRepository(session)
-    
+        self.student_repository = StudentRepository(session)
+
+    async def _hash_password(self, password: str) -> str:
+        try:
+            return await hash_password_async(password)
+        except PasswordPoolBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+
     async def create_professional(self, data: ProfessionalCreate) -> dict:
         existing_user = await self.user_repository.get_by_email(data.email)
         if existing_user:
@@ -31,7 +44,7 @@ class ProfessionalService:
         
         user_data = {
             "email": data.email,
-            "password_hash": hash_password(data.password),
+            "password_hash": await self._hash_password(data.password),
             "name": data.name,
             "role": UserRole.professional,
             "function": data.function,
@@ -111,7 +124,7 @@ class ProfessionalService:
         if data.username is not None:
             update_data["username"] = data.username
         if data.password is not None:
-            update_data["password_hash"] = hash_password(data.password)
+            update_data["password_hash"] = await self._hash_password(data.password)
         
         professional = await self.professional_repository.update(uuid.UUID(professional_id), update_data)
         
@@ -121,6 +134,8 @@ class ProfessionalService:
                 detail="Profissional não encontrado"
             )
         
+        user_cache.invalidate(professional.id)
+        
         return {
             "id": str(professional.id),
             "email": professional.email,
@@ -138,5 +153,34 @@ class ProfessionalService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profissional não encontrado"
             )
+        user_cache.invalidate(professional_id)
         return True
 
+    async def get_dashboard(self, professional_id: str) -> dict:
+        professional = await self.professional_repository.get_by_id(uuid.UUID(professional_id))
+        if not professional:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profissional não encontrado"
+            )
+        
+        rows = await self.student_repository.get_dashboard_rows(professional.id)
+        
+        return {
+            "professional_id": str(professional.id),
+            "total_students": len(rows),
+            "students": [
+                {
+                    "student_id": str(row.id),
+                    "name": row.name,
+                    "status": row.status.value,
+                    "latest_ppm": round(row.latest_ppm, 2) if row.latest_ppm is not None else None,
+                    "average_accuracy": round(float(row.average_accuracy), 2) if row.average_accuracy is not None else None,
+                    "recording_count": row.recording_count,
+                    "completed_activities": row.completed_activities,
+                    "unread_insights": row.unread_insights,
+                    "last_recorded_at": row.last_recorded_at,
+                }
+                for row in rows
+            ],
+        }
@@ -0,0 +1,75 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.progress import StudentTrailProgress
+from app.models.trail import TrailStory
+from app.repositories.progress_repository import StudentTrailProgressRepository
+from app.schemas.progress import StudentTrailProgressResponse, StudentTrailProgressListResponse
+from app.services.versioned_cache import VersionedCache
+from typing import Optional
+import uuid
+
+
+trail_story_count_cache = VersionedCache(
+    "trail_story_counts",
+    check_interval=settings.default_trails_cache_check_seconds,
+    max_entries=4096,
+)
+
+
+class TrailProgressService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.progress_repository = StudentTrailProgressRepository(session)
+
+    @staticmethod
+    def _to_response(progress: StudentTrailProgress) -> StudentTrailProgressResponse:
+        return StudentTrailProgressResponse(
+            id=str(progress.id),
+            student_id=str(progress.student_id),
+            trail_id=str(progress.trail_id),
+            current_story_id=str(progress.current_story_id) if progress.current_story_id else None,
+            completed_stories=[str(story_id) for story_id in progress.completed_stories or []],
+            progress_percentage=progress.progress_percentage,
+            started_at=progress.started_at,
+            last_accessed_at=progress.last_accessed_at,
+            completed_at=progress.completed_at,
+        )
+
+    async def _story_count(self, trail_id: uuid.UUID) -> int:
+        cached, generation = await trail_story_count_cache.get(self.session, trail_id)
+        if cached is not None:
+            return cached
+        count = await self.progress_repository.count_stories(trail_id)
+        trail_story_count_cache.set(trail_id, count, generation)
+        return count
+
+    async def record_story_completion(
+        self, student_id: uuid.UUID, story_id: uuid.UUID
+    ) -> Optional[StudentTrailProgress]:
+        """Registra a história como concluída; o commit fica a cargo de quem chama."""
+        story = await self.session.get(TrailStory, story_id)
+        if not story:
+            return None
+        story_count = await self._story_count(story.trail_id)
+        if story_count <= 0:
+            return None
+        return await self.progress_repository.mark_story_completed(
+            student_id=student_id,
+            trail_id=story.trail_id,
+            story_id=story_id,
+            story_count=story_count,
+        )
+
+    async def get_class_progress(
+        self,
+        professional_id: Optional[uuid.UUID] = None,
+        trail_id: Optional[uuid.UUID] = None,
+    ) -> StudentTrailProgressListResponse:
+        rows = await self.progress_repository.get_for_students(
+            professional_id=professional_id,
+            trail_id=trail_id,
+        )
+        return StudentTrailProgressListResponse(
+            total=len(rows),
+            progress=[self._to_response(row) for row in rows],
+        )
@@ -0,0 +1,220 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.trail import TrailDifficulty
+from app.repositories.recording_repository import RecordingRepository
+from app.repositories.student_repository import StudentRepository
+from app.repositories.text_library_repository import TextLibraryRepository
+from app.repositories.trail_repository import TrailStoryRepository
+from app.schemas.recommendation import RecommendedTextResponse, StudentRecommendationResponse
+from app.services.text_indexing import GRAPHEMES, index_text
+
+
+LETTER_KEYS = [chr(code) for code in range(ord("A"), ord("Z") + 1)]
+GRAPHEME_KEYS = [grapheme.upper() for grapheme in GRAPHEMES]
+VECTOR_SIZE = len(LETTER_KEYS) + len(GRAPHEME_KEYS)
+# Grafemas dizem mais sobre a dificuldade do que letras isoladas
+GRAPHEME_WEIGHT = 2.0
+
+
+def frequency_vector(letter_frequency: Dict[str, int], grapheme_frequency: Dict[str, int]) -> np.ndarray:
+    """Vetor unitário letras + grafemas; cada bloco é normalizado antes de aplicar o peso."""
+    letters = np.array([letter_frequency.get(key, 0) for key in LETTER_KEYS], dtype=np.float32)
+    graphemes = np.array([grapheme_frequency.get(key, 0) for key in GRAPHEME_KEYS], dtype=np.float32)
+    blocks = []
+    for block, weight in ((letters, 1.0), (graphemes, GRAPHEME_WEIGHT)):
+        norm = np.linalg.norm(block)
+        blocks.append(block * (weight / norm) if norm else block)
+    vector = np.concatenate(blocks)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class IndexedText:
+    source: str
+    id: uuid.UUID
+    title: str
+    difficulty: Optional[TrailDifficulty]
+    readability_score: Optional[float]
+    trail_id: Optional[uuid.UUID] = None
+
+
+class TextVectorIndex:
+    """Vetores de grafemas da biblioteca e das histórias numa matriz NumPy em memória.
+
+    A cada ``refresh_interval`` segundos busca só as linhas alteradas desde a última
+    leitura (com uma margem para transações lentas); se a quantidade de linhas no banco
+    divergir da matriz, houve remoções e o índice é reconstruído.
+    """
+
+    OVERLAP = timedelta(minutes=1)
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._matrix = np.zeros((0, VECTOR_SIZE), dtype=np.float32)
+        self._entries: List[IndexedText] = []
+        self._shared = np.zeros(0, dtype=bool)
+        self._owners = np.empty(0, dtype=object)
+        self._difficulties = np.empty(0, dtype=object)
+        self._positions: Dict[Tuple[str, uuid.UUID], int] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return self._loaded and time.monotonic() - self._refreshed_at < self.refresh_interval
+
+    async def refresh(self, session: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            text_repository = TextLibraryRepository(session)
+            story_repository = TrailStoryRepository(session)
+            since = self._watermark - self.OVERLAP if self._watermark else None
+
+            self._apply("text_library", await text_repository.get_index_rows(since))
+            self._apply("trail_story", await story_repository.get_index_rows(since))
+
+            expected = await text_repository.count_indexed() + await story_repository.count_indexed()
+            if since is not None and expected != len(self._entries):
+                self._reset()
+                self._apply("text_library", await text_repository.get_index_rows())
+                self._apply("trail_story", await story_repository.get_index_rows())
+
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+    def _apply(self, source: str, rows: list) -> None:
+        new_vectors, new_shared, new_owners, new_difficulties = [], [], [], []
+        for row in rows:
+            vector = frequency_vector(row.letter_frequency or {}, row.grapheme_frequency or {})
+            entry = IndexedText(
+                source=source,
+                id=row.id,
+                title=row.title,
+                difficulty=row.difficulty,
+                readability_score=row.readability_score,
+                trail_id=getattr(row, "trail_id", None),
+            )
+            shared = bool(row.is_public)
+            position = self._positions.get((source, row.id))
+            if position is None:
+                self._positions[(source, row.id)] = len(self._entries)
+                self._entries.append(entry)
+                new_vectors.append(vector)
+                new_shared.append(shared)
+                new_owners.append(row.created_by)
+                new_difficulties.append(row.difficulty)
+            else:
+                self._entries[position] = entry
+                self._matrix[position] = vector
+                self._shared[position] = shared
+                self._owners[position] = row.created_by
+                self._difficulties[position] = row.difficulty
+            if row.updated_at and (self._watermark is None or row.updated_at > self._watermark):
+                self._watermark = row.updated_at
+
+        if new_vectors:
+            self._matrix = np.vstack([self._matrix, np.stack(new_vectors)])
+            self._shared = np.concatenate([self._shared, np.array(new_shared, dtype=bool)])
+            self._owners = np.concatenate([self._owners, np.array(new_owners, dtype=object)])
+            self._difficulties = np.concatenate([self._difficulties, np.array(new_difficulties, dtype=object)])
+
+    def top_k(
+        self,
+        weakness: np.ndarray,
+        owner_id: Optional[uuid.UUID],
+        limit: int,
+        difficulty: Optional[TrailDifficulty] = None,
+    ) -> List[Tuple[IndexedText, float]]:
+        if not self._entries:
+            return []
+        mask = self._shared.copy()
+        if owner_id is not None:
+            mask |= self._owners == owner_id
+        if difficulty is not None:
+            # O NumPy trata o enum (subclasse de str) como escalar de texto; compara pelo valor
+            mask &= self._difficulties == TrailDifficulty(difficulty).value
+        scores = np.where(mask, self._matrix @ weakness, -1.0)
+
+        k = min(limit, int(mask.sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._entries[index], float(scores[index])) for index in top if scores[index] > 0]
+
+
+text_vector_index = TextVectorIndex(refresh_interval=settings.recommendation_refresh_seconds)
+
+
+class RecommendationService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.student_repository = StudentRepository(session)
+        self.recording_repository = RecordingRepository(session)
+
+    async def recommend_for_student(
+        self,
+        student_id: uuid.UUID,
+        limit: int = 10,
+        difficulty: Optional[TrailDifficulty] = None,
+    ) -> StudentRecommendationResponse:
+        student = await self.student_repository.get_by_id(student_id)
+        if not student:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Aluno não encontrado",
+            )
+
+        error_batches = await self.recording_repository.get_recent_errors(
+            student_id, settings.recommendation_error_window
+        )
+        misread = [
+            error["expected"]
+            for errors in error_batches
+            if isinstance(errors, list)
+            for error in errors
+            if isinstance(error, dict) and error.get("expected")
+        ]
+        profile = index_text(" ".join(misread))
+
+        recommendations: List[RecommendedTextResponse] = []
+        if misread:
+            await text_vector_index.refresh(self.session)
+            weakness = frequency_vector(profile.letter_frequency, profile.grapheme_frequency)
+            for entry, score in text_vector_index.top_k(weakness, student.professional_id, limit, difficulty):
+                recommendations.append(
+                    RecommendedTextResponse(
+                        source=entry.source,
+                        id=str(entry.id),
+                        title=entry.title,
+                        trail_id=str(entry.trail_id) if entry.trail_id else None,
+                        difficulty=entry.difficulty,
+                        readability_score=entry.readability_score,
+                        score=round(score, 4),
+                    )
+                )
+
+        return StudentRecommendationResponse(
+            student_id=str(student.id),
+            misread_words=len(misread),
+            weak_graphemes=profile.grapheme_frequency,
+            recommendations=recommendations,
+        )
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.repositories.recording_repository import RecordingRepository
 from app.repositories.ai_insight_repository import AIInsightRepository
 from app.schemas.recording import (
@@ -20,7 +21,9 @@ from app.models.recording import Recording, RecordingStatus, RecordingAnalysis
 from app.models.ai_insight import AIInsight
 from app.models.student import Student
 from app.models.trail import TrailStory
+from app.services.ai_insight_service import AIInsightService
 from app.services.genai.service import GeminiService, GeminiServiceError
+from app.services.progress_service import TrailProgressService
 from app.services.reading_analysis import analyze_reading
 
 
@@ -31,6 +34,7 @@ class RecordingService:
         self.session = session
         self.recording_repository = RecordingRepository(session)
         self.ai_insight_repository = AIInsightRepository(session)
+        self.progress_service = TrailProgressService(session)
         self.uploads_dir = Path("uploads/recordings")
         try:
             self.uploads_dir.mkdir(parents=True, exist_ok=True)
@@ -59,6 +63,7 @@ class RecordingService:
         )
 
         await self._upsert_recording_analysis(recording)
+        await self.progress_service.record_story_completion(student_id, story_id)
         await self.session.commit()
         await self.session.refresh(recording)
 
@@ -86,6 +91,8 @@ class RecordingService:
     ) -> None:
         if not recording.transcription:
             return
+        if settings.ai_insights_batch_enabled:
+            return
         try:
             student: Optional[Student] = await self.session.get(Student, recording.student_id)
             if not student:
@@ -102,6 +109,15 @@ class RecordingService:
             if not insight_payload:
                 return
 
+            if await self.ai_insight_repository.has_recent_duplicate(
+                professional_id=owner_professional_id,
+                student_id=student.id,
+                title=insight_payload["title"],
+                description=insight_payload["description"],
+                since=AIInsightService.dedup_window_start(),
+            ):
+                return
+
             await self.ai_insight_repository.create(
                 professional_id=owner_professional_id,
                 insight_type=insight_payload["type"],
@@ -109,6 +125,7 @@ class RecordingService:
                 title=insight_payload["title"],
                 description=insight_payload["description"],
                 related_students=[student.id],
+                expires_at=AIInsightService.default_expiration(),
             )
             await self.session.commit()
         except GeminiServiceError as exc:
@@ -392,6 +409,10 @@ class RecordingService:
             return None
 
         await self._upsert_recording_analysis(recording)
+        if data.status == RecordingStatus.completed:
+            await self.progress_service.record_story_completion(
+                recording.student_id, recording.story_id
+            )
         await self.session.commit()
 
         return RecordingResponse(
@@ -0,0 +1,275 @@
+import csv
+import json
+import logging
+import uuid
+from itertools import chain, islice
+from typing import BinaryIO, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.repositories.student_repository import StudentRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.student import StudentImportError, StudentImportResponse, StudentImportRow
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+READ_BLOCK_SIZE = 64 * 1024
+
+# Linha do arquivo e conteúdo já decodificado, ou a mensagem de erro de leitura
+ParsedRow = Tuple[int, dict | str]
+
+
+class _LineDecoder:
+    """Decodifica o arquivo linha a linha, sem substituir bytes inválidos.
+
+    A codificação é detectada no primeiro bloco: UTF-8 (com ou sem BOM) ou, se o bloco
+    não for UTF-8 válido, Windows-1252, comum em planilhas exportadas no Excel em pt-BR.
+    Linhas que não decodificam viram linhas vazias e ficam em ``invalid_lines``.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.head = file.read(READ_BLOCK_SIZE)
+        self.encoding = _detect_encoding(self.head)
+        self.invalid_lines: List[int] = []
+
+    def _byte_lines(self) -> Iterator[bytes]:
+        pending = self.head
+        while True:
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line + b"\n"
+            block = self.file.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            pending += block
+        if pending:
+            yield pending
+
+    def __iter__(self) -> Iterator[str]:
+        for line_number, raw in enumerate(self._byte_lines(), start=1):
+            try:
+                line = raw.decode(self.encoding)
+            except UnicodeDecodeError:
+                self.invalid_lines.append(line_number)
+                yield "\n"
+                continue
+            if line_number == 1:
+                line = line.lstrip("\ufeff")
+            yield line
+
+    def pop_invalid(self) -> Iterator[ParsedRow]:
+        for line_number in self.invalid_lines:
+            yield line_number, f"Caracteres inválidos para a codificação {self.encoding}; salve o arquivo em UTF-8"
+        self.invalid_lines.clear()
+
+
+def _detect_encoding(head: bytes) -> str:
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # Um caractere multibyte cortado no fim do bloco não indica outra codificação
+        if exc.reason != "unexpected end of data":
+            logger.info("Arquivo de importação não é UTF-8; lendo como Windows-1252")
+            return "cp1252"
+    return "utf-8"
+
+
+def _iter_csv(lines: _LineDecoder) -> Iterator[ParsedRow]:
+    line_iter = iter(lines)
+    header = next(line_iter, None)
+    if header is None:
+        return
+    # Planilhas exportadas em pt-BR costumam usar ponto e vírgula
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.DictReader(chain([header], line_iter), delimiter=delimiter)
+    for row in reader:
+        yield from lines.pop_invalid()
+        if None in row:
+            yield reader.line_num, "Quantidade de colunas maior que o cabeçalho"
+            continue
+        if any(value and value.strip() for value in row.values()):
+            yield reader.line_num, row
+    yield from lines.pop_invalid()
+
+
+def _iter_jsonl(lines: _LineDecoder) -> Iterator[ParsedRow]:
+    for line_number, line in enumerate(lines, start=1):
+        yield from lines.pop_invalid()
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, f"JSON inválido: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Cada linha deve ser um objeto JSON"
+            continue
+        yield line_number, row
+
+
+def iter_import_rows(file: BinaryIO, file_format: str) -> Iterator[ParsedRow]:
+    """Lê o arquivo de forma incremental, linha a linha, sem carregá-lo inteiro na memória."""
+    lines = _LineDecoder(file)
+    if file_format == "csv":
+        return _iter_csv(lines)
+    return _iter_jsonl(lines)
+
+
+def _clean(row: dict) -> dict:
+    cleaned = {}
+    for key, value in row.items():
+        if not key:
+            continue
+        key = key.strip().lower()
+        if isinstance(value, str):
+            value = value.strip() or None
+            if key == "special_needs" and value:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+        cleaned[key] = value
+    return cleaned
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class StudentImportService:
+    """Importa alunos de CSV ou JSONL em blocos, cada bloco em uma transação própria."""
+
+    def __init__(self, session: AsyncSession, chunk_size: Optional[int] = None):
+        self.session = session
+        self.student_repository = StudentRepository(session)
+        self.user_repository = UserRepository(session)
+        self.chunk_size = max(1, chunk_size or settings.student_import_chunk_size)
+        self._professionals: Set[uuid.UUID] = set()
+        self._not_professionals: Set[uuid.UUID] = set()
+
+    async def import_file(
+        self,
+        file: BinaryIO,
+        file_format: str,
+        created_by_id: uuid.UUID,
+        default_professional_id: Optional[uuid.UUID] = None,
+        restrict_to_professional: bool = False,
+    ) -> StudentImportResponse:
+        """Com ``restrict_to_professional`` todas as linhas ficam com ``default_professional_id``."""
+        rows = iter_import_rows(file, file_format)
+        total_rows = 0
+        created = 0
+        errors: List[StudentImportError] = []
+
+        while True:
+            chunk = await run_in_threadpool(lambda: list(islice(rows, self.chunk_size)))
+            if not chunk:
+                break
+            total_rows += len(chunk)
+
+            valid, chunk_errors = self._validate_chunk(
+                chunk, default_professional_id, restrict_to_professional
+            )
+            valid, professional_errors = await self._check_professionals(valid)
+            errors.extend(chunk_errors + professional_errors)
+
+            try:
+                created += await self.student_repository.create_batch(
+                    [
+                        {**student_data, "created_by": created_by_id}
+                        for _, student_data in valid
+                    ]
+                )
+            except SQLAlchemyError as exc:
+                await self.session.rollback()
+                logger.warning("Falha ao gravar bloco da importação de alunos: %s", exc, exc_info=True)
+                errors.extend(
+                    StudentImportError(row=line_number, detail="Erro ao gravar o bloco no banco de dados")
+                    for line_number, _ in valid
+                )
+
+        errors.sort(key=lambda error: error.row)
+        return StudentImportResponse(
+            total_rows=total_rows,
+            created=created,
+            failed=total_rows - created,
+            errors=errors,
+        )
+
+    def _validate_chunk(
+        self,
+        chunk: List[ParsedRow],
+        default_professional_id: Optional[uuid.UUID],
+        restrict_to_professional: bool,
+    ) -> Tuple[List[Tuple[int, dict]], List[StudentImportError]]:
+        valid: List[Tuple[int, dict]] = []
+        errors: List[StudentImportError] = []
+
+        for line_number, raw in chunk:
+            if isinstance(raw, str):
+                errors.append(StudentImportError(row=line_number, detail=raw))
+                continue
+
+            row = _clean(raw)
+            try:
+                data = StudentImportRow.model_validate(row)
+            except ValidationError as exc:
+                errors.append(StudentImportError(row=line_number, detail=_validation_detail(exc)))
+                continue
+
+            professional_id = default_professional_id
+            if data.professional_id:
+                try:
+                    row_professional_id = uuid.UUID(data.professional_id)
+                except ValueError:
+                    errors.append(StudentImportError(row=line_number, detail="ID do profissional inválido"))
+                    continue
+                if restrict_to_professional and row_professional_id != default_professional_id:
+                    errors.append(
+                        StudentImportError(
+                            row=line_number,
+                            detail="Você só pode importar alunos para o seu próprio cadastro",
+                        )
+                    )
+                    continue
+                professional_id = row_professional_id
+
+            if not professional_id:
+                errors.append(StudentImportError(row=line_number, detail="professional_id é obrigatório"))
+                continue
+
+            student_data = data.model_dump(exclude={"professional_id"})
+            student_data["professional_id"] = professional_id
+            valid.append((line_number, student_data))
+
+        return valid, errors
+
+    async def _check_professionals(
+        self, valid: List[Tuple[int, dict]]
+    ) -> Tuple[List[Tuple[int, dict]], List[StudentImportError]]:
+        unknown = {
+            student_data["professional_id"] for _, student_data in valid
+        } - self._professionals - self._not_professionals
+        if unknown:
+            found = await self.user_repository.get_professional_ids(unknown)
+            self._professionals |= found
+            self._not_professionals |= unknown - found
+
+        accepted: List[Tuple[int, dict]] = []
+        errors: List[StudentImportError] = []
+        for line_number, student_data in valid:
+            if student_data["professional_id"] in self._professionals:
+                accepted.append((line_number, student_data))
+            else:
+                errors.append(StudentImportError(row=line_number, detail="Profissional não encontrado"))
+        return accepted, errors
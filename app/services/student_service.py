@@ -8,6 +8,8 @@ from app.schemas.student import (
     StudentUpdate,
     StudentResponse,
     StudentListResponse,
+    StudentSearchResult,
+    StudentSearchResponse,
     StudentTrackingResponse,
     StudentTrackingPPMPoint,
     StudentAttentionPoint,
@@ -17,6 +19,7 @@ from app.models.user import UserRole
 from app.models.recording import Recording, RecordingAnalysis
 from app.models.activity import StudentActivity, ActivityStatus
 from app.models.ai_insight import AIInsight
+from app.utils.pagination import decode_cursor, encode_cursor
 from typing import Optional, List
 import uuid
 from datetime import date
@@ -72,18 +75,36 @@ class StudentService:
 
     async def get_all_students(
         self, 
-        professional_id: Optional[uuid.UUID] = None
+        professional_id: Optional[uuid.UUID] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
     ) -> StudentListResponse:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+
         prof_id = professional_id if professional_id else None
-        students = await self.student_repository.get_all(prof_id)
-        total = await self.student_repository.count_all(prof_id)
-        active = await self.student_repository.count_active(prof_id)
-        inactive = await self.student_repository.count_inactive(prof_id)
+        # Uma linha a mais só para saber se existe próxima página
+        students, counts = await self.student_repository.get_page(prof_id, search, after, limit + 1)
+        if counts is None:
+            # Página vazia: os totais não vieram junto com as linhas
+            counts = await self.student_repository.count_summary(prof_id, search)
+
+        next_cursor = None
+        if len(students) > limit:
+            students = students[:limit]
+            next_cursor = encode_cursor(students[-1].name, students[-1].id)
 
         return StudentListResponse(
-            total=total,
-            active=active,
-            inactive=inactive,
+            total=counts["total"],
+            active=counts["active"],
+            inactive=counts["inactive"],
+            next_cursor=next_cursor,
             students=[
                 StudentResponse(
                     id=str(s.id),
@@ -105,15 +126,55 @@ class StudentService:
             ]
         )
 
-    async def get_student_by_id(self, student_id: uuid.UUID | str) -> StudentResponse:
+    async def search_students(
+        self,
+        search: str,
+        professional_id: Optional[uuid.UUID] = None,
+        limit: int = 20,
+    ) -> StudentSearchResponse:
+        rows = await self.student_repository.search_by_name(search, professional_id, limit)
+        return StudentSearchResponse(
+            total=len(rows),
+            results=[
+                StudentSearchResult(
+                    id=str(s.id),
+                    professional_id=str(s.professional_id),
+                    name=s.name,
+                    registration=s.registration,
+                    status=s.status,
+                    similarity=round(similarity, 4),
+                )
+                for s, similarity in rows
+            ],
+        )
+
+    async def _raise_missing(
+        self,
+        student_id: uuid.UUID,
+        forbidden_detail: str = "Você não tem permissão para acessar este aluno"
+    ) -> None:
+        # Só roda quando a consulta com escopo não encontra o aluno: distingue 403 de 404
+        if await self.student_repository.exists(student_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=forbidden_detail
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Aluno não encontrado"
+        )
+
+    async def get_student_by_id(
+        self,
+        student_id: uuid.UUID | str,
+        professional_id: Optional[uuid.UUID] = None
+    ) -> StudentResponse:
+        """Com ``professional_id``, só encontra alunos daquele profissional."""
         if isinstance(student_id, str):
             student_id = uuid.UUID(student_id)
-        student = await self.student_repository.get_by_id(student_id)
+        student = await self.student_repository.get_by_id(student_id, professional_id)
         if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Aluno não encontrado"
-            )
+            await self._raise_missing(student_id)
 
         return StudentResponse(
             id=str(student.id),
@@ -136,7 +197,8 @@ class StudentService:
         self, 
         student_id: uuid.UUID, 
         data: StudentUpdate,
-        updated_by_id: uuid.UUID
+        updated_by_id: uuid.UUID,
+        professional_id: Optional[uuid.UUID] = None
     ) -> StudentResponse:
         update_data = data.model_dump(exclude_unset=True)
         
@@ -153,12 +215,9 @@ class StudentService:
 
         update_data["updated_by"] = updated_by_id
         
-        student = await self.student_repository.update(student_id, update_data)
+        student = await self.student_repository.update(student_id, update_data, professional_id)
         if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Aluno não encontrado"
-            )
+            await self._raise_missing(student_id, "Você não tem permissão para editar este aluno")
 
         return StudentResponse(
             id=str(student.id),
@@ -177,27 +236,29 @@ class StudentService:
             deleted_at=student.deleted_at,
         )
 
-    async def delete_student(self, student_id: uuid.UUID) -> bool:
-        deleted = await self.student_repository.delete(student_id)
+    async def delete_student(
+        self,
+        student_id: uuid.UUID,
+        professional_id: Optional[uuid.UUID] = None
+    ) -> bool:
+        deleted = await self.student_repository.delete(student_id, professional_id)
         if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Aluno não encontrado"
-            )
+            await self._raise_missing(student_id, "Você não tem permissão para excluir este aluno")
         return True
 
-    async def get_student_tracking(self, student_id: uuid.UUID | str) -> StudentTrackingResponse:
+    async def get_student_tracking(
+        self,
+        student_id: uuid.UUID | str,
+        professional_id: Optional[uuid.UUID] = None
+    ) -> StudentTrackingResponse:
         if isinstance(student_id, str):
             student_uuid = uuid.UUID(student_id)
         else:
             student_uuid = student_id
 
-        student = await self.student_repository.get_by_id(student_uuid)
+        student = await self.student_repository.get_by_id(student_uuid, professional_id)
         if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Aluno não encontrado"
-            )
+            await self._raise_missing(student_uuid)
 
         total_recordings_stmt = await self.session.execute(
             select(func.count(Recording.id)).where(Recording.student_id == student_uuid)
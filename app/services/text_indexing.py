@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from collections import Counter
+import re
+import unicodedata
+from typing import Dict, List
+
+from app.services.reading_analysis import WORD_PATTERN
+
+
+VOWELS = set("aeiouáéíóúâêôãõàü")
+STRONG_VOWELS = set("aeoáéóâêôãõà")
+STRESSED_WEAK_VOWELS = set("íú")
+WEAK_VOWELS = set("iuü")
+VOWEL_GROUP_PATTERN = re.compile("[" + "".join(sorted(VOWELS)) + "]+")
+
+# Dígrafos, nasais e encontros consonantais trabalhados na alfabetização
+GRAPHEMES = (
+    "lh", "nh", "ch", "rr", "ss", "qu", "gu", "sc", "xc", "ç",
+    "ão", "õe", "ãe",
+    "bl", "br", "cl", "cr", "dr", "fl", "fr", "gl", "gr", "pl", "pr", "tr", "vr",
+)
+GRAPHEME_PATTERN = re.compile("|".join(sorted(GRAPHEMES, key=len, reverse=True)))
+SENTENCE_PATTERN = re.compile(r"[.!?]+|\n+")
+
+
+@dataclass
+class TextIndex:
+    word_count: int
+    syllable_count: int
+    readability_score: float | None
+    letter_frequency: Dict[str, int]
+    grapheme_frequency: Dict[str, int]
+
+    def as_columns(self) -> dict:
+        return {
+            "word_count": self.word_count,
+            "syllable_count": self.syllable_count,
+            "readability_score": self.readability_score,
+            "letter_frequency": self.letter_frequency,
+            "grapheme_frequency": self.grapheme_frequency,
+        }
+
+
+def _vowel_groups(word: str):
+    """Sequências de vogais com a letra anterior e se terminam a palavra."""
+    for match in VOWEL_GROUP_PATTERN.finditer(word):
+        before = word[match.start() - 1] if match.start() else ""
+        yield match.group(), before, match.end() == len(word)
+
+
+def _group_nuclei(group: str, before: str, at_end: bool) -> int:
+    nuclei = 1
+    for index in range(1, len(group)):
+        previous, char = group[index - 1], group[index]
+        if previous in STRONG_VOWELS and char in STRONG_VOWELS:
+            # ão, õe, ãe são ditongos nasais
+            if not (previous in "ãõ" and char in "oe"):
+                nuclei += 1
+        elif char in STRESSED_WEAK_VOWELS:
+            # Hiato com i/u tônico: sa-ú-de, pa-ís
+            nuclei += 1
+        elif char in STRONG_VOWELS and index >= 2 and previous in WEAK_VOWELS:
+            # A semivogal de um ditongo decrescente abre a sílaba seguinte: prai-a, i-dei-a
+            nuclei += 1
+        elif char in WEAK_VOWELS and index >= 2 and previous in WEAK_VOWELS:
+            # Duas vogais fracas depois de outra vogal formam ditongo próprio: ca-iu, bu-iu,
+            # exceto depois do u mudo de gui/qui: se-guiu
+            if not (index == 2 and group[0] == "u" and before in "qg"):
+                nuclei += 1
+        elif index == len(group) - 1 and at_end and previous in WEAK_VOWELS and char in STRONG_VOWELS:
+            # Vogal fraca + forte átonas no fim da palavra formam hiato: ri-o, á-gu-a,
+            # exceto o u mudo de que/gue
+            if not (len(group) == 2 and previous == "u" and before in "qg" and char in "eé"):
+                nuclei += 1
+    return nuclei
+
+
+def count_syllables(word: str) -> int:
+    """Conta núcleos vocálicos separando hiatos e mantendo ditongos e tritongos juntos."""
+    word = word.lower()
+    syllables = sum(_group_nuclei(group, before, at_end) for group, before, at_end in _vowel_groups(word))
+    return max(syllables, 1)
+
+
+def _sentence_count(text: str) -> int:
+    sentences = [part for part in SENTENCE_PATTERN.split(text) if WORD_PATTERN.search(part)]
+    return max(len(sentences), 1)
+
+
+def _letter_frequency(words: List[str]) -> Dict[str, int]:
+    counter: Counter = Counter()
+    for word in words:
+        for char in unicodedata.normalize("NFKD", word):
+            if "a" <= char <= "z":
+                counter[char.upper()] += 1
+    return dict(sorted(counter.items()))
+
+
+def _grapheme_frequency(words: List[str]) -> Dict[str, int]:
+    counter: Counter = Counter()
+    for word in words:
+        counter.update(match.upper() for match in GRAPHEME_PATTERN.findall(word))
+    return dict(sorted(counter.items()))
+
+
+def index_text(content: str) -> TextIndex:
+    """Métricas de leitura de um texto em português.
+
+    A legibilidade usa o índice de Flesch adaptado ao português (Martins et al., 1996),
+    limitado ao intervalo 0–100: quanto maior, mais fácil a leitura.
+    """
+    words = WORD_PATTERN.findall((content or "").lower())
+    syllable_count = sum(count_syllables(word) for word in words)
+
+    readability_score = None
+    if words:
+        words_per_sentence = len(words) / _sentence_count(content)
+        syllables_per_word = syllable_count / len(words)
+        score = 248.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        readability_score = round(min(max(score, 0.0), 100.0), 2)
+
+    return TextIndex(
+        word_count=len(words),
+        syllable_count=syllable_count,
+        readability_score=readability_score,
+        letter_frequency=_letter_frequency(words),
+        grapheme_frequency=_grapheme_frequency(words),
+    )
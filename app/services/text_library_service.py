@@ -6,8 +6,14 @@ from app.schemas.text_library import (
     TextLibraryUpdate,
     TextLibraryResponse,
     TextLibraryListResponse,
+    TextLibrarySummaryResponse,
+    TextLibrarySummaryListResponse,
+    TextLibrarySearchResult,
+    TextLibrarySearchResponse,
 )
 from app.models.trail import TrailDifficulty
+from app.services.text_indexing import index_text
+from app.utils.pagination import decode_cursor, decode_datetime_cursor, encode_cursor
 from typing import Optional, List
 import uuid
 
@@ -28,7 +34,7 @@ class TextLibraryService:
             "age_range_max": data.age_range_max,
             "letters_focus": data.letters_focus,
             "tags": data.tags,
-            "word_count": data.word_count,
+            **index_text(data.content).as_columns(),
             "is_public": data.is_public,
             "created_by": created_by_id,
         }
@@ -61,23 +67,71 @@ class TextLibraryService:
         age_range_min: Optional[int] = None,
         age_range_max: Optional[int] = None,
         letters_focus: Optional[List[str]] = None,
-    ) -> TextLibraryListResponse:
-        texts = await self.text_library_repository.get_all(
-            created_by=created_by,
-            difficulty=difficulty,
-            is_public=is_public,
-            age_range_min=age_range_min,
-            age_range_max=age_range_max,
-            letters_focus=letters_focus,
-        )
-        total = await self.text_library_repository.count_all(
-            created_by=created_by,
-            difficulty=difficulty,
-            is_public=is_public,
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        summary: bool = False,
+    ) -> TextLibraryListResponse | TextLibrarySummaryListResponse:
+        try:
+            after = decode_datetime_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            )
+
+        filters = {
+            "created_by": created_by,
+            "difficulty": difficulty,
+            "is_public": is_public,
+            "age_range_min": age_range_min,
+            "age_range_max": age_range_max,
+            "letters_focus": letters_focus,
+            "graphemes": graphemes,
+            "readability_min": readability_min,
+        }
+        # Uma linha a mais só para saber se existe próxima página
+        texts, total = await self.text_library_repository.get_page(
+            **filters, after=after, limit=limit + 1, with_content=not summary
         )
+        if total is None:
+            # Página vazia: o total não veio junto com as linhas
+            total = await self.text_library_repository.count_all(**filters)
+
+        next_cursor = None
+        if len(texts) > limit:
+            texts = texts[:limit]
+            next_cursor = encode_cursor(texts[-1].created_at, texts[-1].id)
+
+        if summary:
+            return TextLibrarySummaryListResponse(
+                total=total,
+                next_cursor=next_cursor,
+                texts=[
+                    TextLibrarySummaryResponse(
+                        id=str(t.id),
+                        title=t.title,
+                        subtitle=t.subtitle,
+                        difficulty=t.difficulty,
+                        age_range_min=t.age_range_min,
+                        age_range_max=t.age_range_max,
+                        letters_focus=t.letters_focus,
+                        tags=t.tags,
+                        word_count=t.word_count,
+                        is_public=t.is_public,
+                        created_by=str(t.created_by) if t.created_by else None,
+                        created_at=t.created_at,
+                        updated_by=str(t.updated_by) if t.updated_by else None,
+                        updated_at=t.updated_at,
+                    )
+                    for t in texts
+                ],
+            )
 
         return TextLibraryListResponse(
             total=total,
+            next_cursor=next_cursor,
             texts=[
                 TextLibraryResponse(
                     id=str(t.id),
@@ -100,6 +154,72 @@ class TextLibraryService:
             ],
         )
 
+    async def search_texts(
+        self,
+        search_text: str,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        letters_focus: Optional[List[str]] = None,
+        graphemes: Optional[List[str]] = None,
+        readability_min: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> TextLibrarySearchResponse:
+        try:
+            decoded = decode_cursor(cursor)
+            after = (float(decoded[0]), decoded[1]) if decoded else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginação inválido",
+            )
+
+        rows = await self.text_library_repository.search(
+            search_text,
+            created_by=created_by,
+            difficulty=difficulty,
+            age_range_min=age_range_min,
+            age_range_max=age_range_max,
+            letters_focus=letters_focus,
+            graphemes=graphemes,
+            readability_min=readability_min,
+            after=after,
+            limit=limit + 1,
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_text, last_rank, _ = rows[-1]
+            next_cursor = encode_cursor(repr(last_rank), last_text.id)
+
+        return TextLibrarySearchResponse(
+            next_cursor=next_cursor,
+            results=[
+                TextLibrarySearchResult(
+                    id=str(t.id),
+                    title=t.title,
+                    subtitle=t.subtitle,
+                    difficulty=t.difficulty,
+                    age_range_min=t.age_range_min,
+                    age_range_max=t.age_range_max,
+                    letters_focus=t.letters_focus,
+                    tags=t.tags,
+                    word_count=t.word_count,
+                    is_public=t.is_public,
+                    created_by=str(t.created_by) if t.created_by else None,
+                    created_at=t.created_at,
+                    updated_by=str(t.updated_by) if t.updated_by else None,
+                    updated_at=t.updated_at,
+                    rank=rank,
+                    headline=headline or "",
+                )
+                for t, rank, headline in rows
+            ],
+        )
+
     async def get_text_by_id(
         self, text_id: uuid.UUID | str, user_id: Optional[uuid.UUID] = None
     ) -> TextLibraryResponse:
@@ -156,6 +276,8 @@ class TextLibraryService:
             )
 
         update_data = data.model_dump(exclude_unset=True)
+        if update_data.get("content"):
+            update_data.update(index_text(update_data["content"]).as_columns())
         update_data["updated_by"] = updated_by_id
 
         text = await self.text_library_repository.update(text_id, update_data)
@@ -6,17 +6,24 @@ from app.schemas.trail import (
     TrailUpdate,
     TrailResponse,
     TrailListResponse,
+    TrailSummaryListResponse,
+    TrailSummaryResponse,
     TrailStoryCreate,
     TrailStoryUpdate,
     TrailStoryResponse,
 )
 from app.models.trail import TrailDifficulty
-from typing import Optional
+from app.services.progress_service import trail_story_count_cache
+from app.services.text_indexing import index_text
+from app.services.versioned_cache import default_trails_cache
+from app.utils.pagination import decode_datetime_cursor, encode_cursor
+from typing import Optional, Tuple
 import uuid
 
 
 class TrailService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.trail_repository = TrailRepository(session)
         self.story_repository = TrailStoryRepository(session)
 
@@ -33,49 +40,30 @@ class TrailService:
             "created_by": created_by_id,
         }
 
-        trail = await self.trail_repository.create(trail_data)
-
-        stories = []
-        if data.stories:
-            stories_data = [
-                {
-                    "trail_id": trail.id,
-                    "title": story.title,
-                    "subtitle": story.subtitle,
-                    "content": story.content,
-                    "letters_focus": story.letters_focus,
-                    "phonemes_focus": story.phonemes_focus,
-                    "order_position": story.order_position,
-                    "difficulty": story.difficulty,
-                    "word_count": story.word_count,
-                    "estimated_time": story.estimated_time,
-                    "created_by": created_by_id,
-                }
-                for story in data.stories
-            ]
-            created_stories = await self.story_repository.create_batch(stories_data)
-            stories = [
-                TrailStoryResponse(
-                    id=str(s.id),
-                    trail_id=str(s.trail_id),
-                    title=s.title,
-                    subtitle=s.subtitle,
-                    content=s.content,
-                    letters_focus=s.letters_focus,
-                    phonemes_focus=s.phonemes_focus,
-                    order_position=s.order_position,
-                    difficulty=s.difficulty,
-                    word_count=s.word_count,
-                    estimated_time=s.estimated_time,
-                    created_by=str(s.created_by) if s.created_by else None,
-                    created_at=s.created_at,
-                    updated_by=str(s.updated_by) if s.updated_by else None,
-                    updated_at=s.updated_at,
-                )
-                for s in created_stories
-            ]
+        stories_data = [
+            {
+                "title": story.title,
+                "subtitle": story.subtitle,
+                "content": story.content,
+                "letters_focus": story.letters_focus,
+                "phonemes_focus": story.phonemes_focus,
+                "order_position": story.order_position,
+                "difficulty": story.difficulty,
+                **index_text(story.content).as_columns(),
+                "estimated_time": story.estimated_time,
+                "created_by": created_by_id,
+            }
+            for story in data.stories or []
+        ]
+
+        trail, trail_stories = await self.trail_repository.create_with_stories(
+            trail_data, stories_data, commit=False
+        )
+
+        if trail.is_default:
+            await default_trails_cache.invalidate(self.session)
+        await self.session.commit()
 
-        trail_stories = await self.story_repository.get_all_by_trail(trail.id)
         all_stories = [
             TrailStoryResponse(
                 id=str(s.id),
@@ -112,6 +100,13 @@ class TrailService:
             stories=all_stories,
         )
 
+    async def _invalidate_default_trails(self, *trail_ids: uuid.UUID) -> None:
+        for trail_id in set(trail_ids):
+            trail = await self.trail_repository.get_by_id(trail_id)
+            if trail and trail.is_default:
+                await default_trails_cache.invalidate(self.session)
+                return
+
     async def get_all_trails(
         self,
         created_by: Optional[uuid.UUID] = None,
@@ -119,35 +114,106 @@ class TrailService:
         is_default: Optional[bool] = None,
         age_range_min: Optional[int] = None,
         age_range_max: Optional[int] = None,
-    ) -> TrailListResponse:
-        # First try with age filters
-        trails = await self.trail_repository.get_all(
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        summary: bool = False,
+    ) -> TrailListResponse | TrailSummaryListResponse:
+        if is_default is not True:
+            return await self._query_trails(
+                created_by, difficulty, is_default, age_range_min, age_range_max, cursor, limit, summary
+            )
+
+        # Trilhas padrão são iguais para todos os profissionais (created_by é ignorado)
+        cache_key = (difficulty, age_range_min, age_range_max, cursor, limit, summary)
+        cached, generation = await default_trails_cache.get(self.session, cache_key)
+        if cached is not None:
+            return cached
+        result = await self._query_trails(
+            None, difficulty, is_default, age_range_min, age_range_max, cursor, limit, summary
+        )
+        default_trails_cache.set(cache_key, result, generation)
+        return result
+
+    async def _query_trails(
+        self,
+        created_by: Optional[uuid.UUID] = None,
+        difficulty: Optional[TrailDifficulty] = None,
+        is_default: Optional[bool] = None,
+        age_range_min: Optional[int] = None,
+        age_range_max: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        summary: bool = False,
+    ) -> TrailListResponse | TrailSummaryListResponse:
+        try:
+            after = decode_datetime_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            )
+
+        total = await self.trail_repository.count_all(
             created_by=created_by,
             difficulty=difficulty,
             is_default=is_default,
             age_range_min=age_range_min,
             age_range_max=age_range_max,
         )
-        
-        # If no trails found with age filter and age was specified, try without age filter
-        if len(trails) == 0 and (age_range_min is not None or age_range_max is not None) and is_default:
-            trails = await self.trail_repository.get_all(
+
+        # If no trails match the age filter for default trails, fall back to all ages
+        if total == 0 and (age_range_min is not None or age_range_max is not None) and is_default:
+            age_range_min = None
+            age_range_max = None
+            total = await self.trail_repository.count_all(
                 created_by=created_by,
                 difficulty=difficulty,
                 is_default=is_default,
-                age_range_min=None,
-                age_range_max=None,
             )
-        
-        total = await self.trail_repository.count_all(
-            created_by=created_by,
-            difficulty=difficulty,
-            is_default=is_default,
-        )
+
+        filters = {
+            "created_by": created_by,
+            "difficulty": difficulty,
+            "is_default": is_default,
+            "age_range_min": age_range_min,
+            "age_range_max": age_range_max,
+            "after": after,
+            # Uma linha a mais só para saber se existe próxima página
+            "limit": limit + 1 if limit else None,
+        }
+
+        if summary:
+            rows = await self.trail_repository.get_summaries(**filters)
+            rows, next_cursor = self._paginate(rows, limit, lambda row: row[0])
+            summaries = [
+                TrailSummaryResponse(
+                    id=str(trail.id),
+                    title=trail.title,
+                    description=trail.description,
+                    difficulty=trail.difficulty,
+                    is_default=trail.is_default,
+                    age_range_min=trail.age_range_min,
+                    age_range_max=trail.age_range_max,
+                    created_by=str(trail.created_by) if trail.created_by else None,
+                    created_at=trail.created_at,
+                    updated_by=str(trail.updated_by) if trail.updated_by else None,
+                    updated_at=trail.updated_at,
+                    story_count=story_count,
+                    total_words=total_words,
+                )
+                for trail, story_count, total_words in rows
+            ]
+            return TrailSummaryListResponse(
+                total=total,
+                trails=summaries,
+                next_cursor=next_cursor,
+            )
+
+        trails = await self.trail_repository.get_all(**filters)
+        trails, next_cursor = self._paginate(trails, limit)
 
         trails_response = []
         for trail in trails:
-            trail_stories = await self.story_repository.get_all_by_trail(trail.id)
             stories = [
                 TrailStoryResponse(
                     id=str(s.id),
@@ -166,7 +232,7 @@ class TrailService:
                     updated_by=str(s.updated_by) if s.updated_by else None,
                     updated_at=s.updated_at,
                 )
-                for s in trail_stories
+                for s in trail.stories
             ]
             trails_response.append(
                 TrailResponse(
@@ -185,7 +251,20 @@ class TrailService:
                 )
             )
 
-        return TrailListResponse(total=total, trails=trails_response)
+        return TrailListResponse(
+            total=total,
+            trails=trails_response,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _paginate(items: list, limit: Optional[int], trail_of=lambda item: item) -> Tuple[list, Optional[str]]:
+        """Corta a linha extra buscada além de ``limit``; só ela indica que há próxima página."""
+        if not limit or len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        last = trail_of(items[-1])
+        return items, encode_cursor(last.created_at, last.id)
 
     async def get_trail_by_id(
         self, trail_id: uuid.UUID | str
@@ -258,12 +337,15 @@ class TrailService:
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_by"] = updated_by_id
 
-        trail = await self.trail_repository.update(trail_id, update_data)
+        trail = await self.trail_repository.update(trail_id, update_data, commit=False)
         if not trail:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trilha não encontrada",
             )
+        if existing_trail.is_default or trail.is_default:
+            await default_trails_cache.invalidate(self.session)
+        await self.session.commit()
 
         trail_stories = await self.story_repository.get_all_by_trail(trail.id)
         stories = [
@@ -316,12 +398,15 @@ class TrailService:
                 detail="Você não tem permissão para excluir esta trilha",
             )
 
-        deleted = await self.trail_repository.delete(trail_id)
+        deleted = await self.trail_repository.delete(trail_id, commit=False)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Trilha não encontrada",
             )
+        if existing_trail.is_default:
+            await default_trails_cache.invalidate(self.session)
+        await self.session.commit()
         return True
 
     async def create_story(
@@ -336,12 +421,15 @@ class TrailService:
             "phonemes_focus": data.phonemes_focus,
             "order_position": data.order_position,
             "difficulty": data.difficulty,
-            "word_count": data.word_count,
+            **index_text(data.content).as_columns(),
             "estimated_time": data.estimated_time,
             "created_by": created_by_id,
         }
 
-        story = await self.story_repository.create(story_data)
+        story = await self.story_repository.create(story_data, commit=False)
+        await trail_story_count_cache.invalidate(self.session)
+        await self._invalidate_default_trails(story.trail_id)
+        await self.session.commit()
 
         return TrailStoryResponse(
             id=str(story.id),
@@ -383,14 +471,20 @@ class TrailService:
         update_data = data.model_dump(exclude_unset=True)
         if "trail_id" in update_data and update_data["trail_id"]:
             update_data["trail_id"] = uuid.UUID(update_data["trail_id"])
+        if update_data.get("content"):
+            update_data.update(index_text(update_data["content"]).as_columns())
         update_data["updated_by"] = updated_by_id
 
-        story = await self.story_repository.update(story_id, update_data)
+        story = await self.story_repository.update(story_id, update_data, commit=False)
         if not story:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="História não encontrada",
             )
+        if existing_story.trail_id != story.trail_id:
+            await trail_story_count_cache.invalidate(self.session)
+        await self._invalidate_default_trails(existing_story.trail_id, story.trail_id)
+        await self.session.commit()
 
         return TrailStoryResponse(
             id=str(story.id),
@@ -424,11 +518,14 @@ class TrailService:
                 detail="Você não tem permissão para excluir esta história",
             )
 
-        deleted = await self.story_repository.delete(story_id)
+        deleted = await self.story_repository.delete(story_id, commit=False)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="História não encontrada",
             )
+        await trail_story_count_cache.invalidate(self.session)
+        await self._invalidate_default_trails(existing_story.trail_id)
+        await self.session.commit()
         return True
 
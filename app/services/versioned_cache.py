@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.repositories.cache_version_repository import CacheVersionRepository
+
+
+class VersionedCache:
+    """Cache em memória do processo, invalidado por um contador de versão no banco.
+
+    Escritas locais limpam o cache na hora e incrementam a versão; os demais workers
+    percebem a mudança na próxima verificação, feita no máximo a cada
+    ``check_interval`` segundos.
+
+    ``get`` devolve também a geração local vista; ``set`` descarta o valor se o cache foi
+    limpo nesse meio tempo, para que um resultado lido antes de uma invalidação não
+    fique gravado sob a versão nova.
+    """
+
+    def __init__(self, name: str, check_interval: float, max_entries: int = 256):
+        self.name = name
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._generation = 0
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+
+    async def _sync_version(self, session: AsyncSession) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        generation = self._generation
+        version = await CacheVersionRepository(session).get_version(self.name)
+        if generation != self._generation:
+            # Uma invalidação local correu durante a leitura e já tem a versão mais nova
+            return
+        if version != self._version:
+            self._clear()
+            self._version = version
+        self._checked_at = now
+
+    async def get(self, session: AsyncSession, key: Hashable) -> Tuple[Optional[Any], int]:
+        await self._sync_version(session)
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value, self._generation
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, session: AsyncSession) -> None:
+        """Incrementa a versão dentro da transação da escrita; o serviço faz o commit.
+
+        O cache local é limpo agora e de novo quando o commit acontece, descartando o
+        que foi lido enquanto a escrita ainda não estava visível.
+        """
+        self._clear()
+        version = await CacheVersionRepository(session).bump(self.name)
+
+        def on_commit(_session) -> None:
+            self._clear()
+            self._version = version
+            self._checked_at = time.monotonic()
+
+        event.listen(session.sync_session, "after_commit", on_commit, once=True)
+
+
+default_trails_cache = VersionedCache(
+    "default_trails",
+    check_interval=settings.default_trails_cache_check_seconds,
+)
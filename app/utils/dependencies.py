@@ -1,60 +1,143 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.config import settings
 from app.database import get_db
 from app.repositories.user_repository import UserRepository
 from app.utils.jwt import decode_access_token
-from app.models.user import User
+from app.utils.rate_limit import RateLimiter
+from app.utils.token_revocation import revocation_list
+from app.utils.user_cache import user_cache
+from app.models.user import User, UserRole
+from app.schemas.auth import LoginRequest
+from typing import Optional, Tuple
+import uuid
 
 security = HTTPBearer()
 
+login_rate_limiter = RateLimiter(
+    max_attempts=settings.login_rate_limit_attempts,
+    window_seconds=settings.login_rate_limit_window_seconds,
+)
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """Usuário montado apenas com as claims do token, sem consultar o banco."""
+    id: uuid.UUID
+    email: Optional[str]
+    role: UserRole
+
+
+async def _decode_credentials(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> dict:
+    await revocation_list.refresh(db)
+    payload = decode_access_token(credentials.credentials)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user_id = payload.get("sub")
-    if user_id is None:
+
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    return payload
+
+
+def _user_snapshot(user: User) -> Tuple[Tuple[str, object], ...]:
+    """Valores das colunas, copiados enquanto a instância ainda está carregada."""
+    return tuple((attr.key, getattr(user, attr.key)) for attr in inspect(User).column_attrs)
+
+
+def _user_from_snapshot(snapshot: Tuple[Tuple[str, object], ...]) -> User:
+    # Instância nova e desanexada: não depende da sessão (nem do rollback) de outra requisição
+    user = User(**dict(snapshot))
+    make_transient_to_detached(user)
+    return user
+
+
+async def _load_user(payload: dict, db: AsyncSession) -> User:
+    user_id = payload["sub"]
+    cache_key = (user_id, payload.get("iat"))
+
+    cached = user_cache.get(cache_key)
+    if cached is not None:
+        return _user_from_snapshot(cached)
+
     user_repository = UserRepository(db)
     user = await user_repository.get_by_id(user_id)
-    
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário não encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    user_cache.set(cache_key, _user_snapshot(user))
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    payload = await _decode_credentials(credentials, db)
+    return await _load_user(payload, db)
+
+
+async def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    return await _decode_credentials(credentials, db)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     return current_user
 
 
+async def get_current_user_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User | TokenUser:
+    """Para endpoints somente leitura que usam apenas ``id`` e ``role`` do usuário.
+
+    Com ``AUTH_TRUST_TOKEN_CLAIMS`` ligado, confia nas claims do token e não consulta o banco.
+    """
+    payload = await _decode_credentials(credentials, db)
+
+    if settings.auth_trust_token_claims and payload.get("role"):
+        try:
+            return TokenUser(
+                id=uuid.UUID(payload["sub"]),
+                email=payload.get("email"),
+                role=UserRole(payload["role"]),
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    return await _load_user(payload, db)
+
+
 async def get_current_admin(
     current_user: User = Depends(get_current_user),
 ) -> User:
-    from app.models.user import UserRole
-    
     if current_user.role != UserRole.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -62,3 +145,19 @@ async def get_current_admin(
         )
     return current_user
 
+
+async def limit_login_attempts(request: Request, login_data: LoginRequest) -> str:
+    """Bloqueia o par (IP, email) após muitas falhas; devolve a chave para a rota registrar falhas.
+
+    Atrás de proxy o IP só é o do cliente se o uvicorn confiar no proxy (``FORWARDED_ALLOW_IPS``).
+    """
+    client_ip = request.client.host if request.client else "desconhecido"
+    key = f"{client_ip}|{login_data.email.lower()}"
+    retry_after = login_rate_limiter.retry_after(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente em instantes.",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.5)))},
+        )
+    return key
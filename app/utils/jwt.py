@@ -1,7 +1,11 @@
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Optional, Tuple
+from jose import JWTError, jwk, jwt
 from app.config import settings
+from app.utils.token_revocation import revocation_list
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -14,7 +18,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.access_token_expire_minutes
         )
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex, "type": "access"})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.secret_key,
@@ -33,7 +37,7 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
             days=settings.refresh_token_expire_days
         )
     
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": "refresh"})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.secret_key,
@@ -42,30 +46,55 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(
-            token,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
-        )
-        if payload.get("type") != "access":
-            return None
-        return payload
-    except JWTError:
-        return None
+class TokenVerifier:
+    """Valida JWTs com a chave já construída e lembra os tokens verificados recentemente.
 
+    O LRU é indexado pela assinatura, mas só vale para o mesmo token completo; num acerto
+    resta conferir ``exp``, o tipo e a lista de revogação, tudo em memória.
+    """
 
-def decode_refresh_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(
-            token,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
-        )
-        if payload.get("type") != "refresh":
+    def __init__(self, secret_key: str, algorithm: str, max_entries: int = 4096):
+        self._key = jwk.construct(secret_key, algorithm)
+        self._algorithms = [algorithm]
+        self.max_entries = max_entries
+        self._verified: "OrderedDict[str, Tuple[str, dict]]" = OrderedDict()
+
+    def decode(self, token: str, token_type: str) -> Optional[dict]:
+        signature = token.rpartition(".")[2]
+        entry = self._verified.get(signature)
+
+        if entry is not None and entry[0] == token:
+            payload = entry[1]
+            if payload.get("exp", 0) <= time.time():
+                del self._verified[signature]
+                return None
+            self._verified.move_to_end(signature)
+        else:
+            try:
+                payload = jwt.decode(token, self._key, algorithms=self._algorithms)
+            except JWTError:
+                return None
+            self._verified[signature] = (token, payload)
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+
+        if payload.get("type") != token_type:
+            return None
+        if revocation_list.is_revoked(payload.get("jti")):
             return None
         return payload
-    except JWTError:
-        return None
 
+
+token_verifier = TokenVerifier(
+    settings.secret_key,
+    settings.algorithm,
+    max_entries=settings.token_verify_cache_size,
+)
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    return token_verifier.decode(token, "access")
+
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    return token_verifier.decode(token, "refresh")
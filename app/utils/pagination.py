@@ -0,0 +1,34 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+def encode_cursor(sort_value: Any, row_id: uuid.UUID) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = f"{sort_value}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, uuid.UUID]]:
+    """Retorna ``(valor_de_ordenação, id)``; levanta ValueError para cursores malformados."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        sort_value, row_id = raw.rsplit("|", 1)
+        return sort_value, uuid.UUID(row_id)
+    except (UnicodeError, ValueError) as exc:
+        raise ValueError("Cursor de paginação inválido") from exc
+
+
+def decode_datetime_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+    decoded = decode_cursor(cursor)
+    if decoded is None:
+        return None
+    sort_value, row_id = decoded
+    try:
+        return datetime.fromisoformat(sort_value), row_id
+    except ValueError as exc:
+        raise ValueError("Cursor de paginação inválido") from exc
@@ -1,5 +1,16 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
 import bcrypt
 
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
 
 def hash_password(password: str) -> str:
     salt = bcrypt.gensalt()
@@ -13,3 +24,85 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         hashed_password.encode('utf-8')
     )
 
+
+class PasswordPoolBusy(Exception):
+    """A fila do pool de senhas atingiu ``max_pending``."""
+
+
+class PasswordHasherPool:
+    """Executa o bcrypt fora do event loop, em threads próprias e com fila limitada.
+
+    O bcrypt libera o GIL, então ``workers`` threads processam até ``workers`` senhas
+    em paralelo sem travar as demais requisições. Pedidos além de ``max_pending``
+    (em execução + aguardando) são recusados na hora, em vez de acumular latência.
+    Os contadores só são alterados no event loop.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(
+                "Pool de senhas cheio (%s pendentes); pedido recusado", self.pending
+            )
+            raise PasswordPoolBusy()
+
+        queued_at = time.monotonic()
+
+        def task():
+            return time.monotonic() - queued_at, func(*args)
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            waited, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), task
+            )
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self._total_wait += waited
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self._total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+password_pool = PasswordHasherPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
+
+class RateLimiter:
+    """Janela deslizante em memória: no máximo ``max_attempts`` por chave a cada ``window_seconds``.
+
+    ``retry_after`` só consulta; quem chama decide o que conta como tentativa com ``record``.
+    O estado é por worker; guarda no máximo ``max_keys`` chaves, descartando as menos recentes.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: float, max_keys: int = 10000):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _prune(self, key: str, now: float) -> Optional[Deque[float]]:
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and now - hits[0] >= self.window_seconds:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+    def retry_after(self, key: str) -> Optional[float]:
+        """Segundos de espera se a chave atingiu o limite; ``None`` se ainda pode tentar."""
+        now = time.monotonic()
+        hits = self._prune(key, now)
+        if hits is None or len(hits) < self.max_attempts:
+            return None
+        return self.window_seconds - (now - hits[0])
+
+    def record(self, key: str) -> None:
+        now = time.monotonic()
+        hits = self._prune(key, now)
+        if hits is None:
+            hits = deque()
+            self._hits[key] = hits
+        self._hits.move_to_end(key)
+        hits.append(now)
+        while len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
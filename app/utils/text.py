@@ -0,0 +1,20 @@
+import hashlib
+import re
+import unicodedata
+
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem acentos nem pontuação e com espaços colapsados; números são mantidos."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    cleaned = _NON_WORD.sub(" ", without_accents.lower())
+    return _SPACES.sub(" ", cleaned).strip()
+
+
+def text_fingerprint(*parts: str) -> str:
+    normalized = "\n".join(normalize_text(part) for part in parts)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,72 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+class RevocationList:
+    """``jti`` dos tokens revogados e ainda não expirados, consultados em memória.
+
+    A cada ``refresh_interval`` segundos busca no banco só as revogações registradas
+    desde a última leitura (com uma margem para transações lentas). Revogações feitas
+    neste worker valem na hora; as dos demais aparecem após o próximo refresh.
+    """
+
+    OVERLAP = timedelta(minutes=1)
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._lock = asyncio.Lock()
+        self._revoked: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return self._loaded and time.monotonic() - self._refreshed_at < self.refresh_interval
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+
+    async def refresh(self, session: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            since = self._watermark - self.OVERLAP if self._watermark else None
+            rows = await RevokedTokenRepository(session).get_active(since)
+            for row in rows:
+                self._revoked[row.jti] = row.expires_at.timestamp()
+                if self._watermark is None or row.revoked_at > self._watermark:
+                    self._watermark = row.revoked_at
+
+            # Tokens expirados já são recusados pela validação de exp
+            now = time.time()
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+    async def revoke(
+        self,
+        session: AsyncSession,
+        jti: str,
+        expires_at: float,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        await RevokedTokenRepository(session).revoke(
+            jti, datetime.fromtimestamp(expires_at, tz=timezone.utc), user_id
+        )
+        self.add(jti, expires_at)
+
+
+revocation_list = RevocationList(refresh_interval=settings.token_revocation_refresh_seconds)
@@ -0,0 +1,48 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class UserCache:
+    """Cópias imutáveis dos usuários autenticados recentes, por ``(sub, iat)`` do token,
+    com TTL curto e limite LRU. Nunca guarda instâncias presas à sessão de uma requisição.
+
+    Cada worker tem o seu cache; alterações feitas em outro processo aparecem no
+    máximo após ``ttl`` segundos.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, snapshot = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return snapshot
+
+    def set(self, key: Hashable, snapshot: Any) -> None:
+        self._entries[key] = (time.monotonic(), snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID | str) -> None:
+        user_id = str(user_id)
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+
+user_cache = UserCache(
+    ttl=settings.auth_user_cache_ttl_seconds,
+    max_entries=settings.auth_user_cache_max_entries,
+)
@@ -0,0 +1,19 @@
+import argparse
+import asyncio
+from datetime import date
+
+from app.database import AsyncSessionLocal
+from app.services.ai_insight_batch_service import AIInsightBatchService
+
+
+async def main(day: date | None):
+    async with AsyncSessionLocal() as session:
+        created = await AIInsightBatchService(session).generate_for_day(day)
+    print(f"Insights criados: {created}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera os insights de IA do dia em lote")
+    parser.add_argument("--day", type=date.fromisoformat, default=None, help="Data (AAAA-MM-DD); padrão: ontem")
+    args = parser.parse_args()
+    asyncio.run(main(args.day))
@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy import select, update
+
+from app.database import AsyncSessionLocal
+from app.models.text_library import TextLibrary
+from app.models.trail import TrailStory
+from app.services.text_indexing import index_text
+
+
+async def reindex(session, model) -> int:
+    result = await session.execute(select(model.id, model.content))
+    rows = [{"id": row_id, **index_text(content).as_columns()} for row_id, content in result.all()]
+    if rows:
+        # UPDATE em lote por chave primária (executemany)
+        await session.execute(update(model), rows)
+        await session.commit()
+    return len(rows)
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        texts = await reindex(session, TextLibrary)
+        stories = await reindex(session, TrailStory)
+    print(f"Textos indexados: {texts} | Histórias indexadas: {stories}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
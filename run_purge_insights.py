@@ -0,0 +1,14 @@
+import asyncio
+
+from app.database import AsyncSessionLocal
+from app.services.ai_insight_service import AIInsightService
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        deleted = await AIInsightService(session).purge_expired()
+    print(f"Insights expirados removidos: {deleted}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
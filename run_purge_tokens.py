@@ -0,0 +1,14 @@
+import asyncio
+
+from app.database import AsyncSessionLocal
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        deleted = await RevokedTokenRepository(session).delete_expired()
+    print(f"Revogações expiradas removidas: {deleted}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.repositories import activity_repository
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.student_repository import StudentRepository
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def one(self):
+        return self._rows[0]
+
+    def scalars(self):
+        return self
+
+
+class FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+
+def compile_pg(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_get_student_ids_by_activity_agrupa_uma_unica_consulta():
+    first, second, empty = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    students = [uuid.uuid4() for _ in range(3)]
+    session = FakeSession([(first, students[0]), (second, students[1]), (first, students[2])])
+
+    result = await ActivityRepository(session).get_student_ids_by_activity([first, second, empty])
+
+    assert result == {first: [students[0], students[2]], second: [students[1]], empty: []}
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_student_ids_by_activity_sem_atividades_nao_consulta():
+    session = FakeSession()
+
+    assert await ActivityRepository(session).get_student_ids_by_activity([]) == {}
+    assert session.statements == []
+
+
+@pytest.mark.asyncio
+async def test_count_summary_conta_status_com_filter():
+    row = SimpleNamespace(_mapping={"total": 4, "pending": 2, "in_progress": 1, "completed": 1})
+    session = FakeSession([row])
+    professional_id = uuid.uuid4()
+
+    counts = await ActivityRepository(session).count_summary(professional_id)
+
+    assert counts == {"total": 4, "pending": 2, "in_progress": 1, "completed": 1}
+    sql = compile_pg(session.statements[0])
+    assert sql.count("FILTER (WHERE activities.status = ") == 3
+    assert "activities.created_by = " in sql
+
+
+@pytest.mark.asyncio
+async def test_get_missing_ids_resolve_todos_os_ids_numa_consulta():
+    existing, deleted = uuid.uuid4(), uuid.uuid4()
+    session = FakeSession([existing])
+    professional_id = uuid.uuid4()
+
+    missing = await StudentRepository(session).get_missing_ids([existing, deleted], professional_id)
+
+    assert missing == {deleted}
+    sql = compile_pg(session.statements[0])
+    assert "students.id = ANY (ARRAY[" in sql
+    assert "students.deleted_at IS NULL" in sql
+    assert "students.professional_id = " in sql
+
+
+class FakeCopySession(FakeSession):
+    def __init__(self):
+        super().__init__()
+        self.copies = []
+        driver_connection = SimpleNamespace(copy_records_to_table=self._copy)
+        raw_connection = SimpleNamespace(driver_connection=driver_connection)
+
+        async def get_raw_connection():
+            return raw_connection
+
+        self._connection = SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def connection(self):
+        return self._connection
+
+    async def _copy(self, table_name, records, columns):
+        self.copies.append((table_name, records, columns))
+
+
+@pytest.mark.asyncio
+async def test_add_students_insere_em_lotes_ignorando_conflitos(monkeypatch):
+    monkeypatch.setattr(activity_repository, "INSERT_BATCH_SIZE", 2)
+    session = FakeCopySession()
+    activity_id = uuid.uuid4()
+
+    await ActivityRepository(session).add_students(activity_id, [uuid.uuid4() for _ in range(5)])
+
+    assert session.copies == []
+    assert len(session.statements) == 3
+    sql = compile_pg(session.statements[0])
+    assert "ON CONFLICT ON CONSTRAINT unique_student_activity DO NOTHING" in sql
+
+
+@pytest.mark.asyncio
+async def test_add_students_usa_copy_para_atividade_nova_com_muitos_alunos(monkeypatch):
+    monkeypatch.setattr(settings, "activity_copy_threshold", 3)
+    session = FakeCopySession()
+    activity_id = uuid.uuid4()
+    student_ids = [uuid.uuid4() for _ in range(3)]
+
+    await ActivityRepository(session).add_students(activity_id, student_ids, new_activity=True)
+
+    assert session.statements == []
+    ((table_name, records, columns),) = session.copies
+    assert table_name == "student_activities"
+    assert columns == ["id", "student_id", "activity_id", "status"]
+    assert [record[1:] for record in records] == [
+        (student_id, activity_id, "pending") for student_id in student_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_add_students_abaixo_do_limite_usa_insert_mesmo_em_atividade_nova(monkeypatch):
+    monkeypatch.setattr(settings, "activity_copy_threshold", 3)
+    session = FakeCopySession()
+
+    await ActivityRepository(session).add_students(uuid.uuid4(), [uuid.uuid4()], new_activity=True)
+
+    assert session.copies == []
+    assert len(session.statements) == 1
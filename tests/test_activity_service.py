@@ -0,0 +1,177 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.activity import ActivityStatus, ActivityType
+from app.models.user import UserRole
+from app.schemas.activity import ActivityCreate
+from app.services.activity_service import ActivityService
+
+BASE_TIME = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def make_activity(created_by, title="Leitura"):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=title,
+        description=None,
+        type=ActivityType.reading,
+        difficulty=None,
+        scheduled_date=None,
+        scheduled_time=None,
+        words=None,
+        status=ActivityStatus.pending,
+        created_by=created_by,
+        created_at=BASE_TIME,
+        updated_by=None,
+        updated_at=BASE_TIME,
+    )
+
+
+def professional(user_id):
+    return {"id": str(user_id), "role": UserRole.professional.value}
+
+
+def make_list_service(activities, student_ids_by_activity):
+    service = ActivityService(None)
+    calls = []
+
+    async def get_all(professional_id, status, skip, limit):
+        calls.append(("get_all", professional_id, status))
+        return activities
+
+    async def get_student_ids_by_activity(activity_ids):
+        calls.append(("get_student_ids_by_activity", activity_ids))
+        return {activity_id: student_ids_by_activity.get(activity_id, []) for activity_id in activity_ids}
+
+    async def get_student_ids(activity_id):
+        raise AssertionError("os alunos devem ser carregados para a página inteira")
+
+    async def count_summary(professional_id):
+        calls.append(("count_summary", professional_id))
+        return {"total": 5, "pending": 3, "in_progress": 1, "completed": 1}
+
+    service.activity_repository.get_all = get_all
+    service.activity_repository.get_student_ids_by_activity = get_student_ids_by_activity
+    service.activity_repository.get_student_ids = get_student_ids
+    service.activity_repository.count_summary = count_summary
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_listagem_busca_alunos_e_contagens_em_consultas_unicas():
+    user_id = uuid.uuid4()
+    first, second = make_activity(user_id), make_activity(user_id, "Escrita")
+    student_id = uuid.uuid4()
+    service, calls = make_list_service([first, second], {first.id: [student_id]})
+
+    response = await service.list_activities(professional(user_id), status_filter="pending")
+
+    assert [call[0] for call in calls] == ["get_all", "get_student_ids_by_activity", "count_summary"]
+    assert calls[0][1:] == (user_id, ActivityStatus.pending)
+    assert calls[1][1] == [first.id, second.id]
+    assert [activity.student_ids for activity in response.activities] == [[str(student_id)], []]
+    assert (response.total, response.pending, response.in_progress, response.completed) == (5, 3, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_profissional_nao_lista_atividades_de_outro():
+    service, calls = make_list_service([], {})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.list_activities(professional(uuid.uuid4()), professional_id=uuid.uuid4())
+
+    assert exc_info.value.status_code == 403
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_status_invalido_retorna_400():
+    service, _ = make_list_service([], {})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.list_activities(professional(uuid.uuid4()), status_filter="arquivada")
+
+    assert exc_info.value.status_code == 400
+
+
+def make_create_service(missing=frozenset()):
+    service = ActivityService(None)
+    lookups = []
+    created = {}
+
+    async def get_missing_ids(student_ids, professional_id=None):
+        lookups.append((student_ids, professional_id))
+        return set(missing) & set(student_ids)
+
+    async def create(activity_data, student_ids):
+        created.update(activity_data=activity_data, student_ids=student_ids)
+        return make_activity(activity_data["created_by"])
+
+    async def get_student_ids(activity_id):
+        return created["student_ids"]
+
+    service.student_repository.get_missing_ids = get_missing_ids
+    service.activity_repository.create = create
+    service.activity_repository.get_student_ids = get_student_ids
+    return service, lookups, created
+
+
+def activity_create(student_ids):
+    return ActivityCreate(title="Leitura", type=ActivityType.reading, student_ids=student_ids)
+
+
+@pytest.mark.asyncio
+async def test_criar_atividade_valida_todos_os_alunos_numa_consulta():
+    user_id = uuid.uuid4()
+    first, second = uuid.uuid4(), uuid.uuid4()
+    service, lookups, created = make_create_service()
+
+    response = await service.create_activity(
+        user_id, activity_create([str(first), str(second), str(first)])
+    )
+
+    assert lookups == [([first, second], user_id)]
+    assert created["student_ids"] == [first, second]
+    assert response.student_ids == [str(first), str(second)]
+
+
+@pytest.mark.asyncio
+async def test_criar_atividade_como_admin_nao_restringe_ao_profissional():
+    student_id = uuid.uuid4()
+    service, lookups, _ = make_create_service()
+
+    await service.create_activity(
+        uuid.uuid4(), activity_create([str(student_id)]), scope_to_professional=False
+    )
+
+    assert lookups == [([student_id], None)]
+
+
+@pytest.mark.asyncio
+async def test_criar_atividade_lista_todos_os_alunos_ausentes():
+    found, missing_a, missing_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    service, _, created = make_create_service(missing={missing_a, missing_b})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.create_activity(
+            uuid.uuid4(), activity_create([str(missing_a), str(found), str(missing_b)])
+        )
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == f"Aluno não encontrado: {missing_a}, {missing_b}"
+    assert created == {}
+
+
+@pytest.mark.asyncio
+async def test_criar_atividade_com_id_malformado_retorna_400():
+    service, lookups, _ = make_create_service()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.create_activity(uuid.uuid4(), activity_create(["abc"]))
+
+    assert exc_info.value.status_code == 400
+    assert lookups == []
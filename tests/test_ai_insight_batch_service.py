@@ -0,0 +1,124 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import ai_insight_batch_service
+from app.services.ai_insight_batch_service import AIInsightBatchService
+from app.services.genai.service import GeminiServiceError
+
+
+def _recording(student, created_by=None):
+    return SimpleNamespace(student=student, created_by=created_by)
+
+
+def _student(professional_id=None, deleted_at=None):
+    return SimpleNamespace(id=uuid.uuid4(), professional_id=professional_id, deleted_at=deleted_at)
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_group_by_professional_ignora_alunos_removidos_e_sem_dono():
+    professional_id = uuid.uuid4()
+    creator_id = uuid.uuid4()
+    student = _student(professional_id)
+    orphan = _student()
+    recordings = [
+        _recording(student),
+        _recording(student),
+        _recording(orphan, created_by=creator_id),
+        _recording(_student(professional_id, deleted_at=date.today())),
+        _recording(_student()),
+        _recording(None),
+    ]
+
+    grouped = AIInsightBatchService._group_by_professional(recordings)
+
+    assert set(grouped) == {professional_id, creator_id}
+    assert list(grouped[professional_id]) == [student.id]
+    assert len(grouped[professional_id][student.id]) == 2
+    assert list(grouped[creator_id]) == [orphan.id]
+
+
+def test_chunk_students_respeita_tamanho_do_lote():
+    service = AIInsightBatchService(FakeSession(), batch_size=2)
+    recordings_by_student = {uuid.uuid4(): [] for _ in range(5)}
+
+    chunks = service._chunk_students(recordings_by_student)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [key for chunk in chunks for key in chunk] == list(recordings_by_student)
+
+
+@pytest.mark.asyncio
+async def test_generate_for_day_faz_uma_chamada_por_lote_e_grava_tudo_de_uma_vez(monkeypatch):
+    professional_id = uuid.uuid4()
+    students = [_student(professional_id) for _ in range(3)]
+    recordings = [_recording(student) for student in students]
+    calls = []
+    created_rows = []
+
+    class FakeGemini:
+        def __init__(self, session):
+            pass
+
+        async def generate_batch_recording_insights(self, batch):
+            calls.append(list(batch))
+            if len(calls) == 2:
+                raise GeminiServiceError("indisponível")
+            return {
+                student_id: {
+                    "type": "progress",
+                    "priority": "low",
+                    "title": "Bom progresso",
+                    "description": "Continue praticando.",
+                }
+                for student_id in batch
+            }
+
+    monkeypatch.setattr(ai_insight_batch_service, "GeminiService", FakeGemini)
+    session = FakeSession()
+    service = AIInsightBatchService(session, batch_size=2)
+
+    async def get_completed_between(start, end):
+        return recordings
+
+    async def create_batch(rows, dedupe_since):
+        created_rows.extend(rows)
+        return len(rows)
+
+    service.recording_repository.get_completed_between = get_completed_between
+    service.ai_insight_repository.create_batch = create_batch
+
+    created = await service.generate_for_day(date(2024, 5, 10))
+
+    assert len(calls) == 2
+    assert created == 2
+    assert session.commits == 1
+    assert [row["related_students"] for row in created_rows] == [[students[0].id], [students[1].id]]
+    assert all(row["professional_id"] == professional_id for row in created_rows)
+
+
+@pytest.mark.asyncio
+async def test_generate_for_day_sem_gravacoes_nao_chama_o_gemini(monkeypatch):
+    def fail(session):
+        raise AssertionError("Gemini não deveria ser instanciado")
+
+    monkeypatch.setattr(ai_insight_batch_service, "GeminiService", fail)
+    session = FakeSession()
+    service = AIInsightBatchService(session)
+
+    async def get_completed_between(start, end):
+        return []
+
+    service.recording_repository.get_completed_between = get_completed_between
+
+    assert await service.generate_for_day(date(2024, 5, 10)) == 0
+    assert session.commits == 0
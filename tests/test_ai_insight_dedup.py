@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.repositories.ai_insight_repository import AIInsightRepository, insight_fingerprint
+from app.utils.text import normalize_text, text_fingerprint
+
+
+def test_normalize_text_remove_acentos_e_pontuacao_mas_mantem_numeros():
+    assert normalize_text("  Leu 12 palavras,   SEM erros! ") == "leu 12 palavras sem erros"
+    assert normalize_text("Atenção à fluência") == "atencao a fluencia"
+    assert normalize_text(None) == ""
+
+
+def test_text_fingerprint_ignora_diferencas_de_formatacao():
+    assert text_fingerprint("Ótimo progresso!", "Leu 12 palavras.") == text_fingerprint(
+        "otimo   progresso", "leu 12 PALAVRAS"
+    )
+    assert text_fingerprint("Leu 12 palavras") != text_fingerprint("Leu 15 palavras")
+    assert text_fingerprint("a b", "c") != text_fingerprint("a", "b c")
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, existing_rows):
+        self.existing_rows = existing_rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.existing_rows)
+
+
+def _row(professional_id, student_id, title="Bom progresso", description="Continue praticando."):
+    return {
+        "professional_id": professional_id,
+        "insight_type": "progress",
+        "priority": "low",
+        "title": title,
+        "description": description,
+        "related_students": [student_id],
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_batch_descarta_repetidos_no_lote_e_recentes_no_banco():
+    professional_id = uuid.uuid4()
+    student_a, student_b, student_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    fingerprint = insight_fingerprint("Bom progresso", "Continue praticando.")
+    session = FakeSession(existing_rows=[(professional_id, fingerprint, [student_b])])
+    repository = AIInsightRepository(session)
+
+    created = await repository.create_batch(
+        [
+            _row(professional_id, student_a),
+            _row(professional_id, student_a, title="Bom  progresso!"),
+            _row(professional_id, student_b),
+            _row(professional_id, student_c, title="Atenção"),
+        ],
+        dedupe_since=datetime(2024, 5, 1, tzinfo=timezone.utc),
+    )
+
+    assert created == 2
+    inserted = session.statements[-1].compile().params
+    assert {value for key, value in inserted.items() if key.startswith("title")} == {
+        "Bom progresso",
+        "Atenção",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_batch_sem_linhas_novas_nao_insere():
+    professional_id = uuid.uuid4()
+    student_id = uuid.uuid4()
+    fingerprint = insight_fingerprint("Bom progresso", "Continue praticando.")
+    session = FakeSession(existing_rows=[(professional_id, fingerprint, [student_id])])
+
+    created = await AIInsightRepository(session).create_batch(
+        [_row(professional_id, student_id)],
+        dedupe_since=datetime(2024, 5, 1, tzinfo=timezone.utc),
+    )
+
+    assert created == 0
+    assert len(session.statements) == 1
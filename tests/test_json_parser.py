@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.ai_insight import GeneratedInsight
+from app.services.genai.json_parser import parse_partial_json
+from app.services.genai.service import GeminiService
+
+
+@pytest.mark.parametrize(
+    "raw_text, expected",
+    [
+        ('{"a": 1, "b": [1, 2]}', {"a": 1, "b": [1, 2]}),
+        ('```json\n{"a": 1}\n```', {"a": 1}),
+        ('Segue a resposta: {"a": "x"} fim', {"a": "x"}),
+        ('{"a": {"b": "c"', {"a": {"b": "c"}}),
+        ('{"a": "x", "items": ["p", "q"],', {"a": "x", "items": ["p", "q"]}),
+    ],
+)
+def test_parse_partial_json_completa_objetos(raw_text, expected):
+    assert parse_partial_json(raw_text) == expected
+
+
+@pytest.mark.parametrize(
+    "raw_text, expected",
+    [
+        ('{"a": "x", "b": "texto cortad', {"a": "x"}),
+        ('{"a": "x", "items": ["p", "q', {"a": "x", "items": ["p"]}),
+        ('{"a": "x", "n": 12', {"a": "x"}),
+        ('{"a": "x", "b', {"a": "x"}),
+    ],
+)
+def test_parse_partial_json_descarta_par_incompleto(raw_text, expected):
+    assert parse_partial_json(raw_text) == expected
+
+
+@pytest.mark.parametrize(
+    "raw_text",
+    ["", "sem json", '{"a": "cortad', '{"a": 12', '["lista"]'],
+)
+def test_parse_partial_json_sem_objeto_valido(raw_text):
+    assert parse_partial_json(raw_text) is None
+
+
+def test_parse_partial_json_respeita_escapes_em_strings():
+    assert parse_partial_json('{"a": "chave \\" } ainda string", "b": 2}') == {
+        "a": 'chave " } ainda string',
+        "b": 2,
+    }
+
+
+def _service_returning(text):
+    service = GeminiService.__new__(GeminiService)
+    response = SimpleNamespace(parsed=None, text=text, usage_metadata=None)
+    service.client = SimpleNamespace(
+        models=SimpleNamespace(generate_content=lambda **kwargs: response)
+    )
+    service.model_config = {"model": "gemini-2.5-flash"}
+    return service
+
+
+def test_generate_structured_valida_resposta_parcial():
+    service = _service_returning(
+        '{"type": "progress", "priority": "low", "title": "Bom", "description": "Continue"'
+    )
+
+    payload = service._generate_structured("prompt", GeneratedInsight, "erro")
+
+    assert payload == {
+        "type": "progress",
+        "priority": "low",
+        "title": "Bom",
+        "description": "Continue",
+    }
+
+
+def test_generate_structured_descarta_payload_invalido(caplog):
+    service = _service_returning('{"type": "progress", "priority": "low", "title": "Cortad')
+
+    assert service._generate_structured("prompt", GeneratedInsight, "erro") is None
+    assert "descartada" in caplog.text
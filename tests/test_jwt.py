@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.utils import jwt as jwt_module
+from app.utils.jwt import TokenVerifier, create_access_token, create_refresh_token
+from app.utils.token_revocation import revocation_list
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    monkeypatch.setattr(revocation_list, "_revoked", {})
+    return TokenVerifier(settings.secret_key, settings.algorithm, max_entries=2)
+
+
+def test_decodifica_token_de_acesso_e_reaproveita_o_cache(verifier):
+    token = create_access_token({"sub": "usuario-1", "role": "admin"})
+
+    first = verifier.decode(token, "access")
+    second = verifier.decode(token, "access")
+
+    assert first["sub"] == "usuario-1"
+    assert second is first
+
+
+def test_recusa_tipo_errado_mesmo_em_cache(verifier):
+    refresh = create_refresh_token({"sub": "usuario-1"})
+
+    assert verifier.decode(refresh, "refresh")["sub"] == "usuario-1"
+    assert verifier.decode(refresh, "access") is None
+
+
+def test_recusa_payload_forjado_com_assinatura_em_cache(verifier):
+    token = create_access_token({"sub": "usuario-1"})
+    other = create_access_token({"sub": "admin"})
+    header, _, signature = token.split(".")
+    forged = ".".join([header, other.split(".")[1], signature])
+
+    assert verifier.decode(token, "access") is not None
+    assert verifier.decode(forged, "access") is None
+    assert verifier.decode("token-invalido", "access") is None
+
+
+def test_recusa_token_revogado_depois_de_verificado(verifier):
+    token = create_access_token({"sub": "usuario-1"})
+    payload = verifier.decode(token, "access")
+
+    revocation_list.add(payload["jti"], payload["exp"])
+
+    assert verifier.decode(token, "access") is None
+
+
+def test_recusa_token_em_cache_apos_expirar(verifier, monkeypatch):
+    token = create_access_token({"sub": "usuario-1"}, expires_delta=timedelta(minutes=1))
+    assert verifier.decode(token, "access") is not None
+
+    later = time.time() + 120
+    monkeypatch.setattr(jwt_module, "time", SimpleNamespace(time=lambda: later))
+
+    assert verifier.decode(token, "access") is None
+    assert len(verifier._verified) == 0
+
+
+def test_recusa_token_ja_expirado(verifier):
+    token = create_access_token({"sub": "usuario-1"}, expires_delta=timedelta(seconds=-5))
+
+    assert verifier.decode(token, "access") is None
+
+
+def test_cache_descarta_os_tokens_menos_recentes(verifier):
+    tokens = [create_access_token({"sub": f"usuario-{index}"}) for index in range(3)]
+    for token in tokens:
+        verifier.decode(token, "access")
+
+    cached = [entry[0] for entry in verifier._verified.values()]
+    assert cached == tokens[1:]
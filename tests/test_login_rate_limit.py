@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, status
+
+from app.api.routes import auth
+from app.database import get_db
+from app.utils import rate_limit
+from app.utils.dependencies import get_current_admin, login_rate_limiter
+from app.utils.rate_limit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_bloqueia_apos_o_limite_dentro_da_janela(clock):
+    limiter = RateLimiter(max_attempts=2, window_seconds=60)
+
+    assert limiter.retry_after("ip|ana") is None
+    limiter.record("ip|ana")
+    clock.now += 10
+    limiter.record("ip|ana")
+
+    assert limiter.retry_after("ip|ana") == 50
+    assert limiter.retry_after("ip|bruno") is None
+
+    clock.now += 50
+    assert limiter.retry_after("ip|ana") is None
+
+
+def test_reset_libera_a_chave(clock):
+    limiter = RateLimiter(max_attempts=1, window_seconds=60)
+    limiter.record("ip|ana")
+
+    limiter.reset("ip|ana")
+
+    assert limiter.retry_after("ip|ana") is None
+
+
+def test_limita_a_quantidade_de_chaves(clock):
+    limiter = RateLimiter(max_attempts=1, window_seconds=60, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.record(key)
+
+    assert limiter.retry_after("a") is None
+    assert limiter.retry_after("b") is not None
+    assert limiter.retry_after("c") is not None
+
+
+@pytest.fixture
+def api(monkeypatch, clock):
+    monkeypatch.setattr(login_rate_limiter, "_hits", OrderedDict())
+    monkeypatch.setattr(login_rate_limiter, "max_attempts", 2)
+    outcomes = []
+
+    async def authenticate_user(self, email, password):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, HTTPException):
+            raise outcome
+        return outcome
+
+    async def override_db():
+        yield None
+
+    monkeypatch.setattr(auth.AuthService, "authenticate_user", authenticate_user)
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[get_db] = override_db
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client, outcomes, app
+
+
+def credentials_error():
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email ou senha incorretos")
+
+
+@pytest.mark.asyncio
+async def test_login_bloqueia_o_par_ip_email_apos_falhas(api):
+    client, outcomes, _ = api
+    outcomes.extend([credentials_error(), credentials_error(), {"access_token": "x"}])
+    body = {"email": "ana@letrar.com", "password": "errada"}
+
+    async with client:
+        statuses = [(await client.post("/auth/login", json=body)).status_code for _ in range(2)]
+        blocked = await client.post("/auth/login", json={**body, "email": "ANA@letrar.com"})
+        other = await client.post("/auth/login", json={**body, "email": "bruno@letrar.com"})
+
+    assert statuses == [401, 401]
+    assert blocked.status_code == 429
+    assert blocked.headers["Retry-After"] == "60"
+    assert other.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_login_bem_sucedido_zera_as_falhas_e_servidor_ocupado_nao_conta(api):
+    client, outcomes, _ = api
+    busy = HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="ocupado")
+    outcomes.extend([credentials_error(), {"access_token": "x"}, credentials_error(), busy, busy])
+    body = {"email": "ana@letrar.com", "password": "senha"}
+
+    async with client:
+        responses = [(await client.post("/auth/login", json=body)).status_code for _ in range(5)]
+
+    assert responses == [401, 200, 401, 503, 503]
+
+
+@pytest.mark.asyncio
+async def test_estatisticas_do_pool_exigem_admin(api):
+    client, _, app = api
+
+    async with client:
+        anonymous = await client.get("/auth/password-pool")
+        app.dependency_overrides[get_current_admin] = lambda: SimpleNamespace()
+        admin = await client.get("/auth/password-pool")
+
+    assert anonymous.status_code == 403
+    assert set(admin.json()) >= {"workers", "pending", "queued", "rejected", "avg_queue_wait_ms"}
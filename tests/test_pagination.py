@@ -0,0 +1,48 @@
+import base64
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.pagination import decode_cursor, decode_datetime_cursor, encode_cursor
+
+
+def test_cursor_ida_e_volta():
+    row_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor("Ana|Maria", row_id)) == ("Ana|Maria", row_id)
+    assert decode_cursor(encode_cursor(0.75, row_id)) == ("0.75", row_id)
+
+
+def test_cursor_de_data_preserva_fuso():
+    row_id = uuid.uuid4()
+    created_at = datetime(2024, 5, 10, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    assert decode_datetime_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_cursor_vazio_significa_primeira_pagina(cursor):
+    assert decode_cursor(cursor) is None
+    assert decode_datetime_cursor(cursor) is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "não-é-base64",
+        base64.urlsafe_b64encode(b"sem-separador").decode(),
+        base64.urlsafe_b64encode(b"2024-05-10|nao-e-uuid").decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe|x").decode(),
+    ],
+)
+def test_cursor_malformado(cursor):
+    with pytest.raises(ValueError, match="Cursor de paginação inválido"):
+        decode_cursor(cursor)
+
+
+def test_cursor_de_data_com_valor_que_nao_e_data():
+    cursor = encode_cursor("ontem", uuid.uuid4())
+
+    with pytest.raises(ValueError, match="Cursor de paginação inválido"):
+        decode_datetime_cursor(cursor)
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.password import (
+    PasswordHasherPool,
+    PasswordPoolBusy,
+    hash_password,
+    verify_password,
+    verify_password_async,
+)
+
+
+def test_hash_e_verificacao():
+    hashed = hash_password("senha-secreta")
+
+    assert hashed != "senha-secreta"
+    assert verify_password("senha-secreta", hashed)
+    assert not verify_password("outra", hashed)
+
+
+@pytest.mark.asyncio
+async def test_verificacao_assincrona_usa_o_pool():
+    hashed = hash_password("senha-secreta")
+
+    assert await verify_password_async("senha-secreta", hashed) is True
+
+
+@pytest.mark.asyncio
+async def test_pool_recusa_pedidos_alem_do_limite_e_registra_estatisticas():
+    pool = PasswordHasherPool(workers=1, max_pending=2)
+    release = threading.Event()
+
+    def slow(value):
+        release.wait(timeout=5)
+        return value * 2
+
+    first = asyncio.create_task(pool.run(slow, 1))
+    second = asyncio.create_task(pool.run(slow, 2))
+    await asyncio.sleep(0)
+
+    assert pool.stats()["pending"] == 2
+    assert pool.stats()["queued"] == 1
+    with pytest.raises(PasswordPoolBusy):
+        await pool.run(slow, 3)
+
+    release.set()
+    assert await asyncio.gather(first, second) == [2, 4]
+
+    stats = pool.stats()
+    assert (stats["pending"], stats["peak_pending"], stats["completed"], stats["rejected"]) == (0, 2, 2, 1)
+    assert stats["avg_queue_wait_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_pool_libera_a_vaga_quando_a_funcao_falha():
+    pool = PasswordHasherPool(workers=1, max_pending=1)
+
+    def fail():
+        raise ValueError("hash inválido")
+
+    with pytest.raises(ValueError):
+        await pool.run(fail)
+
+    assert await pool.run(lambda: "ok") == "ok"
+    assert pool.stats()["pending"] == 0
+
+
+def test_pool_garante_fila_minima_do_tamanho_dos_workers():
+    pool = PasswordHasherPool(workers=4, max_pending=1)
+
+    assert (pool.workers, pool.max_pending) == (4, 4)
@@ -0,0 +1,95 @@
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.models.student import StudentStatus
+from app.repositories.student_repository import StudentRepository
+from app.schemas.professional import ProfessionalDashboardResponse
+from app.services.professional_service import ProfessionalService
+
+
+class FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def make_service(professional, rows):
+    service = ProfessionalService(FakeSession())
+
+    async def get_by_id(professional_id):
+        return professional
+
+    async def get_dashboard_rows(professional_id):
+        return rows
+
+    service.professional_repository.get_by_id = get_by_id
+    service.student_repository.get_dashboard_rows = get_dashboard_rows
+    return service
+
+
+@pytest.mark.asyncio
+async def test_dashboard_monta_indicadores_de_cada_aluno():
+    professional = SimpleNamespace(id=uuid.uuid4())
+    rows = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            name="Ana",
+            status=StudentStatus.active,
+            recording_count=3,
+            average_accuracy=Decimal("87.456"),
+            latest_ppm=62.3333,
+            last_recorded_at=None,
+            completed_activities=2,
+            unread_insights=1,
+        ),
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            name="Bruno",
+            status=StudentStatus.inactive,
+            recording_count=0,
+            average_accuracy=None,
+            latest_ppm=None,
+            last_recorded_at=None,
+            completed_activities=0,
+            unread_insights=0,
+        ),
+    ]
+
+    dashboard = ProfessionalDashboardResponse(
+        **await make_service(professional, rows).get_dashboard(str(professional.id))
+    )
+
+    assert dashboard.total_students == 2
+    ana, bruno = dashboard.students
+    assert (ana.latest_ppm, ana.average_accuracy, ana.status) == (62.33, 87.46, "active")
+    assert (bruno.latest_ppm, bruno.average_accuracy, bruno.recording_count) == (None, None, 0)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_de_profissional_inexistente_retorna_404():
+    with pytest.raises(HTTPException) as exc_info:
+        await make_service(None, []).get_dashboard(str(uuid.uuid4()))
+
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard_rows_faz_uma_unica_consulta():
+    session = FakeSession()
+
+    await StudentRepository(session).get_dashboard_rows(uuid.uuid4())
+
+    (statement,) = session.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.count("GROUP BY") == 3
+    assert "unnest(ai_insights.related_students)" in sql
+    assert "FILTER (WHERE recording_analysis.speed_wpm IS NOT NULL)" in sql
@@ -0,0 +1,111 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from app.repositories.progress_repository import StudentTrailProgressRepository
+from app.services import progress_service
+from app.services.progress_service import TrailProgressService
+from app.services.versioned_cache import VersionedCache
+
+
+class FakeSession:
+    def __init__(self, stories):
+        self.stories = stories
+        self.version = 0
+        self.commits = 0
+        self.statements = []
+        self.sync_session = Session()
+
+    async def get(self, model, story_id):
+        return self.stories.get(story_id)
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            self.version += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.version, scalar_one=lambda: self.version)
+
+    async def scalars(self, statement, execution_options=None):
+        self.statements.append(statement)
+        return SimpleNamespace(one=lambda: SimpleNamespace(id=uuid.uuid4()))
+
+    async def commit(self):
+        self.commits += 1
+        self.sync_session.commit()
+
+
+@pytest.fixture(autouse=True)
+def story_count_cache(monkeypatch):
+    cache = VersionedCache("trail_story_counts", check_interval=60)
+    monkeypatch.setattr(progress_service, "trail_story_count_cache", cache)
+    return cache
+
+
+def make_service(stories, story_count):
+    service = TrailProgressService(FakeSession(stories))
+    counts = []
+    completions = []
+
+    async def count_stories(trail_id):
+        counts.append(trail_id)
+        return story_count
+
+    async def mark_story_completed(**kwargs):
+        completions.append(kwargs)
+        return SimpleNamespace(**kwargs)
+
+    service.progress_repository.count_stories = count_stories
+    service.progress_repository.mark_story_completed = mark_story_completed
+    return service, counts, completions
+
+
+@pytest.mark.asyncio
+async def test_conclusao_usa_contagem_de_historias_em_cache_e_nao_faz_commit():
+    trail_id = uuid.uuid4()
+    stories = {uuid.uuid4(): SimpleNamespace(trail_id=trail_id) for _ in range(2)}
+    service, counts, completions = make_service(stories, story_count=2)
+    student_id = uuid.uuid4()
+
+    for story_id in stories:
+        assert await service.record_story_completion(student_id, story_id) is not None
+
+    assert counts == [trail_id]
+    assert [completion["story_id"] for completion in completions] == list(stories)
+    assert all(completion["story_count"] == 2 for completion in completions)
+    assert service.session.commits == 0
+
+
+@pytest.mark.asyncio
+async def test_conclusao_ignora_historia_inexistente_ou_trilha_vazia():
+    trail_id = uuid.uuid4()
+    story_id = uuid.uuid4()
+    service, counts, completions = make_service({story_id: SimpleNamespace(trail_id=trail_id)}, 0)
+
+    assert await service.record_story_completion(uuid.uuid4(), uuid.uuid4()) is None
+    assert await service.record_story_completion(uuid.uuid4(), story_id) is None
+    assert completions == []
+
+
+@pytest.mark.asyncio
+async def test_mark_story_completed_e_um_unico_upsert():
+    session = FakeSession({})
+    story_id = uuid.uuid4()
+
+    await StudentTrailProgressRepository(session).mark_story_completed(
+        student_id=uuid.uuid4(),
+        trail_id=uuid.uuid4(),
+        story_id=story_id,
+        story_count=4,
+    )
+
+    (statement,) = session.statements
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT ON CONSTRAINT unique_student_trail DO UPDATE" in sql
+    assert "array_append" in sql
+    assert "RETURNING" in sql
+    assert compiled.params["progress_percentage"] == 25.0
+    assert compiled.params["completed_at"] is None
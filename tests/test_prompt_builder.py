@@ -0,0 +1,72 @@
+from app.services.genai.prompt_builder import (
+    TRUNCATION_MARK,
+    PromptBuilder,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_truncate_to_tokens_corta_em_palavra_e_marca():
+    text = " ".join(["palavra"] * 50)
+
+    truncated = truncate_to_tokens(text, 10)
+
+    assert truncated.endswith(TRUNCATION_MARK)
+    assert estimate_tokens(truncated) <= 10
+    assert truncated[: -len(TRUNCATION_MARK)].split() == ["palavra"] * 4
+
+
+def test_truncate_to_tokens_mantem_texto_que_cabe():
+    assert truncate_to_tokens("curto", 10) == "curto"
+    assert truncate_to_tokens("curto", 0) == ""
+
+
+def test_build_mantem_ordem_de_insercao_e_ignora_secoes_vazias():
+    builder = PromptBuilder(budget_tokens=1000)
+    builder.add_section("Aluno", "Ana, 7 anos", priority=0)
+    builder.add_section("Vazio", "   ", priority=0)
+    builder.add_section("", "Pergunta final", priority=1)
+
+    assert builder.build() == "Aluno:\nAna, 7 anos\n\nPergunta final"
+
+
+def test_build_prioriza_secoes_mais_importantes():
+    builder = PromptBuilder(budget_tokens=60)
+    builder.add_section("Histórico", "h" * 200, priority=2)
+    builder.add_section("Aluno", "Ana", priority=0)
+    builder.add_section("Diagnóstico", "d" * 120, priority=1)
+
+    prompt = builder.build()
+
+    assert "Histórico" not in prompt
+    assert prompt.startswith("Aluno:\nAna\n\nDiagnóstico:")
+    assert prompt.endswith("d" * 120)
+
+
+def test_build_trunca_secao_que_nao_cabe_no_orcamento():
+    builder = PromptBuilder(budget_tokens=60)
+    builder.add_section("Longa", "palavra " * 100, priority=0)
+    builder.add_section("Curta", "ok", priority=1)
+
+    prompt = builder.build()
+
+    assert TRUNCATION_MARK in prompt
+    assert estimate_tokens(prompt) <= 60
+
+
+def test_build_usa_rank_dentro_da_mesma_prioridade_e_reserva_tokens():
+    builder = PromptBuilder(budget_tokens=40)
+    builder.add_section("Antiga", "a" * 100, priority=1, rank=1)
+    builder.add_section("Recente", "r" * 100, priority=1, rank=0)
+
+    prompt = builder.build(reserved_tokens=10)
+
+    assert "Recente" in prompt
+    assert "Antiga" not in prompt
+    assert estimate_tokens(prompt) <= 30
@@ -0,0 +1,172 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from app.models.trail import TrailDifficulty
+from app.services import recommendation_service
+from app.services.recommendation_service import (
+    RecommendationService,
+    TextVectorIndex,
+    frequency_vector,
+)
+
+BASE_TIME = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def index_row(title, graphemes, is_public=True, created_by=None, difficulty=None, updated_at=BASE_TIME):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=title,
+        difficulty=difficulty,
+        readability_score=80.0,
+        letter_frequency={"A": 3},
+        grapheme_frequency=graphemes,
+        is_public=is_public,
+        created_by=created_by,
+        updated_at=updated_at,
+    )
+
+
+def test_frequency_vector_e_unitario_e_pesa_mais_os_grafemas():
+    letters_only = frequency_vector({"A": 5}, {})
+    with_grapheme = frequency_vector({"A": 5}, {"LH": 1})
+
+    assert np.linalg.norm(letters_only) == pytest.approx(1.0)
+    assert np.linalg.norm(with_grapheme) == pytest.approx(1.0)
+    assert with_grapheme.max() == pytest.approx(2 / np.sqrt(5))
+    assert not frequency_vector({}, {}).any()
+
+
+def test_top_k_ordena_por_similaridade_e_respeita_visibilidade():
+    owner_id = uuid.uuid4()
+    index = TextVectorIndex(refresh_interval=60)
+    coelho = index_row("Coelho", {"LH": 3})
+    filho = index_row("Filho", {"LH": 2, "NH": 1}, is_public=False, created_by=owner_id)
+    outro = index_row("Privado", {"LH": 3}, is_public=False, created_by=uuid.uuid4())
+    chuva = index_row("Chuva", {"CH": 2})
+    index._apply("text_library", [coelho, filho, outro, chuva])
+    weakness = frequency_vector({"A": 1}, {"LH": 1})
+
+    titles = [entry.title for entry, _ in index.top_k(weakness, owner_id, limit=3)]
+    public_titles = [entry.title for entry, _ in index.top_k(weakness, None, limit=3)]
+
+    assert titles == ["Coelho", "Filho", "Chuva"]
+    assert public_titles == ["Coelho", "Chuva"]
+
+
+def test_top_k_filtra_por_dificuldade():
+    index = TextVectorIndex(refresh_interval=60)
+    index._apply(
+        "trail_story",
+        [
+            index_row("Fácil", {"LH": 1}, difficulty=TrailDifficulty.beginner),
+            index_row("Difícil", {"LH": 1}, difficulty=TrailDifficulty.advanced),
+        ],
+    )
+
+    results = index.top_k(frequency_vector({}, {"LH": 1}), None, 5, TrailDifficulty.advanced)
+
+    assert [entry.title for entry, _ in results] == ["Difícil"]
+
+
+class FakeIndexRepository:
+    rows = {}
+    counts = {}
+    calls = []
+
+    def __init__(self, session):
+        pass
+
+    async def get_index_rows(self, updated_since=None):
+        self.calls.append((self.source, updated_since))
+        return [row for row in self.rows[self.source] if updated_since is None or row.updated_at >= updated_since]
+
+    async def count_indexed(self):
+        return len(self.rows[self.source])
+
+
+class FakeTextRepository(FakeIndexRepository):
+    source = "text_library"
+
+
+class FakeStoryRepository(FakeIndexRepository):
+    source = "trail_story"
+
+
+@pytest.fixture
+def index_repositories(monkeypatch):
+    FakeIndexRepository.rows = {"text_library": [], "trail_story": []}
+    FakeIndexRepository.calls = []
+    monkeypatch.setattr(recommendation_service, "TextLibraryRepository", FakeTextRepository)
+    monkeypatch.setattr(recommendation_service, "TrailStoryRepository", FakeStoryRepository)
+    return FakeIndexRepository
+
+
+@pytest.mark.asyncio
+async def test_refresh_busca_so_alteracoes_e_reconstroi_apos_remocoes(index_repositories):
+    index = TextVectorIndex(refresh_interval=0)
+    first = index_row("Primeiro", {"LH": 1})
+    second = index_row("Segundo", {"NH": 1})
+    index_repositories.rows["text_library"] = [first, second]
+
+    await index.refresh(None)
+    assert index_repositories.calls[0] == ("text_library", None)
+
+    changed = index_row("Primeiro", {"CH": 1}, updated_at=BASE_TIME + timedelta(hours=1))
+    changed.id = first.id
+    index_repositories.rows["text_library"] = [changed, second]
+    await index.refresh(None)
+
+    assert index_repositories.calls[-1][1] == BASE_TIME - TextVectorIndex.OVERLAP
+    assert len(index._entries) == 2
+    assert index.top_k(frequency_vector({}, {"CH": 1}), None, 1)[0][0].id == first.id
+
+    index_repositories.rows["text_library"] = [second]
+    await index.refresh(None)
+
+    assert [entry.title for entry in index._entries] == ["Segundo"]
+
+
+@pytest.mark.asyncio
+async def test_recomendacao_parte_dos_erros_recentes(monkeypatch, index_repositories):
+    monkeypatch.setattr(recommendation_service, "text_vector_index", TextVectorIndex(refresh_interval=60))
+    index_repositories.rows["text_library"] = [
+        index_row("O coelho", {"LH": 3}),
+        index_row("A chuva", {"CH": 3}),
+    ]
+    student = SimpleNamespace(id=uuid.uuid4(), professional_id=uuid.uuid4())
+    service = RecommendationService(None)
+
+    async def get_by_id(student_id):
+        return student
+
+    async def get_recent_errors(student_id, window):
+        return [[{"expected": "coelho"}, {"expected": "filho"}, {"spoken": "x"}], None]
+
+    service.student_repository.get_by_id = get_by_id
+    service.recording_repository.get_recent_errors = get_recent_errors
+
+    response = await service.recommend_for_student(student.id, limit=1)
+
+    assert response.misread_words == 2
+    assert response.weak_graphemes == {"LH": 2}
+    assert [text.title for text in response.recommendations] == ["O coelho"]
+
+
+@pytest.mark.asyncio
+async def test_recomendacao_para_aluno_inexistente_retorna_404():
+    service = RecommendationService(None)
+
+    async def get_by_id(student_id):
+        return None
+
+    service.student_repository.get_by_id = get_by_id
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.recommend_for_student(uuid.uuid4())
+
+    assert exc_info.value.status_code == 404
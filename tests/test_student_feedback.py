@@ -0,0 +1,109 @@
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from app.api.routes import students
+from app.config import settings
+from app.database import get_db
+from app.models.user import UserRole
+from app.schemas.student import StudentFeedbackRequest
+from app.services.genai.service import GeminiServiceError
+from app.utils.dependencies import TokenUser, get_current_active_user
+
+
+def test_feedback_request_aceita_modelo_padrao_e_permitidos(monkeypatch):
+    monkeypatch.setattr(settings, "google_genai_model", "gemini-1.5-flash")
+    monkeypatch.setattr(settings, "google_genai_allowed_models", ["gemini-2.5-pro"])
+
+    assert StudentFeedbackRequest(question="Como está?").model is None
+    assert StudentFeedbackRequest(question="Como está?", model="models/gemini-1.5-flash").model == (
+        "gemini-1.5-flash"
+    )
+    assert StudentFeedbackRequest(question="Como está?", model="gemini-2.5-pro").model == "gemini-2.5-pro"
+
+
+def test_feedback_request_rejeita_modelo_fora_da_lista(monkeypatch):
+    monkeypatch.setattr(settings, "google_genai_model", "gemini-1.5-flash")
+    monkeypatch.setattr(settings, "google_genai_allowed_models", [])
+
+    with pytest.raises(ValidationError, match="Modelo não permitido"):
+        StudentFeedbackRequest(question="Como está?", model="gemini-ultra-caro")
+
+
+class FakeGemini:
+    chunks = ["Olá", ", Ana"]
+    fail_after = None
+
+    def __init__(self, session):
+        pass
+
+    async def stream_student_feedback(self, student_id, question, model=None):
+        async def chunks():
+            for index, text in enumerate(self.chunks):
+                if self.fail_after is not None and index >= self.fail_after:
+                    raise GeminiServiceError("Falha ao gerar conteúdo com o Gemini")
+                yield text
+
+        return chunks()
+
+
+@pytest.fixture
+def api(monkeypatch):
+    async def get_student_by_id(self, student_id, professional_id=None):
+        return None
+
+    async def override_db():
+        yield None
+
+    async def override_user():
+        return TokenUser(id=uuid.uuid4(), email="admin@letrar.com", role=UserRole.admin)
+
+    monkeypatch.setattr(students.StudentService, "get_student_by_id", get_student_by_id)
+    monkeypatch.setattr(students, "GeminiService", FakeGemini)
+    app = FastAPI()
+    app.include_router(students.router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_active_user] = override_user
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_stream_envia_cada_trecho_como_evento(api):
+    async with api as client:
+        response = await client.post(
+            f"/students/{uuid.uuid4()}/feedback/stream", json={"question": "Como está a leitura?"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'data: {"text": "Olá"}\n\n'
+        'data: {"text": ", Ana"}\n\n'
+        "event: end\ndata: {}\n\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_envia_evento_de_erro_quando_o_gemini_falha(api, monkeypatch):
+    monkeypatch.setattr(FakeGemini, "fail_after", 1)
+
+    async with api as client:
+        response = await client.post(
+            f"/students/{uuid.uuid4()}/feedback/stream", json={"question": "Como está a leitura?"}
+        )
+
+    assert response.text == (
+        'data: {"text": "Olá"}\n\n'
+        'event: error\ndata: {"detail": "Falha ao gerar conteúdo com o Gemini"}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_rejeita_id_invalido(api):
+    async with api as client:
+        response = await client.post("/students/abc/feedback/stream", json={"question": "Oi"})
+
+    assert response.status_code == 400
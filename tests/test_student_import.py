@@ -0,0 +1,161 @@
+import io
+import uuid
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.services import student_import_service
+from app.services.student_import_service import StudentImportService, iter_import_rows
+
+
+def rows(content: bytes, file_format: str = "csv"):
+    return list(iter_import_rows(io.BytesIO(content), file_format))
+
+
+def test_csv_com_virgula():
+    assert rows(b"name,age\nAna,7\nBruno,8\n") == [
+        (2, {"name": "Ana", "age": "7"}),
+        (3, {"name": "Bruno", "age": "8"}),
+    ]
+
+
+def test_csv_com_ponto_e_virgula_bom_e_linhas_vazias():
+    content = "\ufeffname;observations\nAna;lê bem, com pausas\n;\nBruno;\n".encode("utf-8")
+
+    assert rows(content) == [
+        (2, {"name": "Ana", "observations": "lê bem, com pausas"}),
+        (4, {"name": "Bruno", "observations": ""}),
+    ]
+
+
+def test_csv_em_windows_1252():
+    content = "name;age\nJoão;7\nMaria;8".encode("cp1252")
+
+    assert rows(content) == [
+        (2, {"name": "João", "age": "7"}),
+        (3, {"name": "Maria", "age": "8"}),
+    ]
+
+
+def test_csv_em_utf8_com_byte_invalido_depois_do_primeiro_bloco(monkeypatch):
+    monkeypatch.setattr(student_import_service, "READ_BLOCK_SIZE", 16)
+    content = "name,age\nAna,7\nJoão,8\n".encode("utf-8") + b"Br\xffuno,8\nCaio,9\n"
+
+    assert rows(content) == [
+        (2, {"name": "Ana", "age": "7"}),
+        (3, {"name": "João", "age": "8"}),
+        (4, "Caracteres inválidos para a codificação utf-8; salve o arquivo em UTF-8"),
+        (5, {"name": "Caio", "age": "9"}),
+    ]
+
+
+def test_csv_com_colunas_a_mais():
+    assert rows(b"name\nAna,extra\n") == [(2, "Quantidade de colunas maior que o cabeçalho")]
+
+
+def test_csv_le_o_arquivo_em_blocos(monkeypatch):
+    monkeypatch.setattr(student_import_service, "READ_BLOCK_SIZE", 8)
+    content = "name,age\n" + "".join(f"Aluno {index},{index}\n" for index in range(50))
+
+    parsed = rows(content.encode("utf-8"))
+
+    assert len(parsed) == 50
+    assert parsed[-1] == (51, {"name": "Aluno 49", "age": "49"})
+
+
+def test_jsonl():
+    content = b'{"name": "Ana"}\n\nnao e json\n[1, 2]\n{"name": "Bruno"}'
+
+    assert rows(content, "jsonl") == [
+        (1, {"name": "Ana"}),
+        (3, "JSON inválido: Expecting value"),
+        (4, "Cada linha deve ser um objeto JSON"),
+        (5, {"name": "Bruno"}),
+    ]
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def make_service(professional_ids, chunk_size=2, fail_on_chunk=None):
+    service = StudentImportService(FakeSession(), chunk_size=chunk_size)
+    batches = []
+    lookups = []
+
+    async def get_professional_ids(ids):
+        lookups.append(set(ids))
+        return set(ids) & set(professional_ids)
+
+    async def create_batch(students_data, commit=True):
+        batches.append(students_data)
+        if fail_on_chunk is not None and len(batches) == fail_on_chunk:
+            raise SQLAlchemyError("falha")
+        return len(students_data)
+
+    service.user_repository.get_professional_ids = get_professional_ids
+    service.student_repository.create_batch = create_batch
+    return service, batches, lookups
+
+
+@pytest.mark.asyncio
+async def test_importacao_grava_em_blocos_e_reporta_erros_por_linha():
+    professional_id, unknown_id, creator_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    content = (
+        "name;age;professional_id\n"
+        f"Ana;7;{professional_id}\n"
+        f"Bruno;200;{professional_id}\n"
+        f"Caio;8;{unknown_id}\n"
+        "Duda;9;\n"
+        f"Eva;6;{professional_id}\n"
+    ).encode("utf-8")
+    service, batches, lookups = make_service({professional_id})
+
+    response = await service.import_file(
+        io.BytesIO(content), "csv", creator_id, default_professional_id=professional_id
+    )
+
+    assert (response.total_rows, response.created, response.failed) == (5, 3, 2)
+    assert [error.row for error in response.errors] == [3, 4]
+    assert response.errors[1].detail == "Profissional não encontrado"
+    assert [[student["name"] for student in batch] for batch in batches] == [["Ana"], ["Duda"], ["Eva"]]
+    assert all(student["created_by"] == creator_id for batch in batches for student in batch)
+    assert sum(len(ids) for ids in lookups) == 2
+
+
+@pytest.mark.asyncio
+async def test_profissional_so_importa_para_si():
+    professional_id, other_id = uuid.uuid4(), uuid.uuid4()
+    content = f'{{"name": "Ana", "professional_id": "{other_id}"}}\n{{"name": "Bruno"}}\n'.encode()
+    service, batches, _ = make_service({professional_id, other_id})
+
+    response = await service.import_file(
+        io.BytesIO(content),
+        "jsonl",
+        professional_id,
+        default_professional_id=professional_id,
+        restrict_to_professional=True,
+    )
+
+    assert response.created == 1
+    assert response.errors[0].row == 1
+    assert batches == [[{**batches[0][0], "name": "Bruno", "professional_id": professional_id}]]
+
+
+@pytest.mark.asyncio
+async def test_falha_em_um_bloco_nao_desfaz_os_outros():
+    professional_id = uuid.uuid4()
+    content = "name\n" + "".join(f"Aluno {index}\n" for index in range(4))
+    service, _, _ = make_service({professional_id}, chunk_size=2, fail_on_chunk=1)
+
+    response = await service.import_file(
+        io.BytesIO(content.encode()), "csv", uuid.uuid4(), default_professional_id=professional_id
+    )
+
+    assert (response.created, response.failed) == (2, 2)
+    assert [error.row for error in response.errors] == [2, 3]
+    assert service.session.rollbacks == 1
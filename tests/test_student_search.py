@@ -0,0 +1,102 @@
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.dialects import postgresql
+
+from app.api.routes import students
+from app.database import get_db
+from app.models.student import StudentStatus
+from app.models.user import UserRole
+from app.repositories.student_repository import StudentRepository
+from app.utils.dependencies import TokenUser, get_current_user_claims
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: [])
+
+
+@pytest.mark.asyncio
+async def test_search_by_name_ordena_por_similaridade_de_trigramas():
+    session = FakeSession()
+    professional_id = uuid.uuid4()
+
+    await StudentRepository(session).search_by_name("joao", professional_id, limit=5)
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "greatest(similarity(students.name, " in sql
+    assert "word_similarity(" in sql
+    assert "students.name %% " in sql
+    assert " <%% students.name" in sql
+    assert "students.professional_id = " in sql
+    assert "ORDER BY score DESC, students.name ASC, students.id ASC" in sql
+
+
+def make_api(monkeypatch, role):
+    user = TokenUser(id=uuid.uuid4(), email="user@letrar.com", role=role)
+    calls = []
+
+    async def search_by_name(self, search, professional_id=None, limit=20):
+        calls.append((search, professional_id, limit))
+        student = SimpleNamespace(
+            id=uuid.uuid4(),
+            professional_id=professional_id or uuid.uuid4(),
+            name="João Pedro",
+            registration=None,
+            status=StudentStatus.active,
+        )
+        return [(student, 0.71428)]
+
+    async def override_db():
+        yield None
+
+    async def override_user():
+        return user
+
+    monkeypatch.setattr(StudentRepository, "search_by_name", search_by_name)
+    app = FastAPI()
+    app.include_router(students.router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user_claims] = override_user
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client, user, calls
+
+
+@pytest.mark.asyncio
+async def test_profissional_busca_apenas_entre_os_proprios_alunos(monkeypatch):
+    client, user, calls = make_api(monkeypatch, UserRole.professional)
+
+    async with client:
+        response = await client.get(
+            "/students/search", params={"q": " joao ", "professional_id": str(uuid.uuid4())}
+        )
+
+    assert response.status_code == 200
+    assert calls == [("joao", user.id, 20)]
+    assert response.json()["total"] == 1
+    assert response.json()["results"][0]["similarity"] == 0.7143
+
+
+@pytest.mark.asyncio
+async def test_admin_pode_filtrar_por_profissional(monkeypatch):
+    client, _, calls = make_api(monkeypatch, UserRole.admin)
+    professional_id = uuid.uuid4()
+
+    async with client:
+        ok = await client.get(
+            "/students/search", params={"q": "jo", "professional_id": str(professional_id), "limit": 5}
+        )
+        invalid = await client.get("/students/search", params={"q": "jo", "professional_id": "abc"})
+        too_short = await client.get("/students/search", params={"q": "j"})
+
+    assert ok.status_code == 200
+    assert calls == [("jo", professional_id, 5)]
+    assert invalid.status_code == 400
+    assert too_short.status_code == 422
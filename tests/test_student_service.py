@@ -0,0 +1,210 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.models.student import StudentStatus
+from app.repositories.student_repository import StudentRepository
+from app.services.student_service import StudentService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+BASE_TIME = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def make_student(name, professional_id=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        professional_id=professional_id or uuid.uuid4(),
+        name=name,
+        registration=None,
+        gender=None,
+        birth_date=None,
+        age=None,
+        observations=None,
+        profile_image=None,
+        special_needs=None,
+        status=StudentStatus.active,
+        created_at=BASE_TIME,
+        updated_at=BASE_TIME,
+        deleted_at=None,
+    )
+
+
+class FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(
+            all=lambda: self.rows,
+            one=lambda: self.rows[0],
+            scalar_one_or_none=lambda: None,
+        )
+
+    async def commit(self):
+        pass
+
+
+def compile_pg(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def make_list_service(students):
+    service = StudentService(FakeSession())
+    calls = []
+    summaries = []
+
+    async def get_page(professional_id, search, after, limit):
+        calls.append((professional_id, search, after, limit))
+        page = students[:limit]
+        counts = {"total": len(students), "active": len(students), "inactive": 0} if page else None
+        return page, counts
+
+    async def count_summary(professional_id, search):
+        summaries.append((professional_id, search))
+        return {"total": 0, "active": 0, "inactive": 0}
+
+    service.student_repository.get_page = get_page
+    service.student_repository.count_summary = count_summary
+    return service, calls, summaries
+
+
+@pytest.mark.asyncio
+async def test_listagem_traz_totais_por_status_junto_com_a_pagina():
+    students = [make_student(name) for name in ("Ana", "Bruno", "Caio")]
+    service, calls, summaries = make_list_service(students)
+
+    response = await service.get_all_students(search="a", limit=2)
+
+    assert calls[0][3] == 3
+    assert summaries == []
+    assert (response.total, response.active, response.inactive) == (3, 3, 0)
+    assert [student.name for student in response.students] == ["Ana", "Bruno"]
+    assert decode_cursor(response.next_cursor) == ("Bruno", students[1].id)
+
+
+@pytest.mark.asyncio
+async def test_pagina_vazia_conta_totais_separadamente():
+    service, calls, summaries = make_list_service([])
+    professional_id = uuid.uuid4()
+
+    response = await service.get_all_students(
+        professional_id=professional_id, cursor=encode_cursor("Zé", uuid.uuid4())
+    )
+
+    assert calls[0][2][0] == "Zé"
+    assert summaries == [(professional_id, None)]
+    assert response.total == 0
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_invalido_retorna_400():
+    service, calls, _ = make_list_service([])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_all_students(cursor="%%%")
+
+    assert exc_info.value.status_code == 400
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_page_conta_status_com_funcao_de_janela():
+    session = FakeSession()
+
+    students, counts = await StudentRepository(session).get_page(search="50%_a", after=("Ana", uuid.uuid4()))
+
+    assert (students, counts) == ([], None)
+    compiled = session.statements[0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "count(*) FILTER (WHERE students.status = " in sql
+    assert sql.count("OVER ()") == 3
+    assert "students.deleted_at IS NULL" in sql
+    assert r"%50\%\_a%" in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_count_summary_numa_consulta():
+    session = FakeSession([SimpleNamespace(_mapping={"total": 2, "active": 1, "inactive": 1})])
+
+    assert await StudentRepository(session).count_summary() == {"total": 2, "active": 1, "inactive": 1}
+    assert "OVER" not in compile_pg(session.statements[0])
+
+
+def make_scoped_service(student=None, exists=False):
+    service = StudentService(FakeSession())
+    calls = []
+
+    async def get_by_id(student_id, professional_id=None):
+        calls.append(("get_by_id", student_id, professional_id))
+        return student
+
+    async def delete(student_id, professional_id=None):
+        calls.append(("delete", student_id, professional_id))
+        return student is not None
+
+    async def exists_(student_id):
+        calls.append(("exists", student_id))
+        return exists
+
+    service.student_repository.get_by_id = get_by_id
+    service.student_repository.delete = delete
+    service.student_repository.exists = exists_
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_busca_do_aluno_leva_o_profissional_para_a_consulta():
+    professional_id = uuid.uuid4()
+    student = make_student("Ana", professional_id)
+    service, calls = make_scoped_service(student)
+
+    response = await service.get_student_by_id(str(student.id), professional_id)
+
+    assert response.name == "Ana"
+    assert calls == [("get_by_id", student.id, professional_id)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exists, status_code", [(True, 403), (False, 404)])
+async def test_aluno_fora_do_escopo_distingue_403_de_404(exists, status_code):
+    service, calls = make_scoped_service(None, exists=exists)
+    student_id = uuid.uuid4()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.delete_student(student_id, uuid.uuid4())
+
+    assert exc_info.value.status_code == status_code
+    assert [call[0] for call in calls] == ["delete", "exists"]
+
+
+@pytest.mark.asyncio
+async def test_exclusao_no_escopo_nao_consulta_existencia():
+    service, calls = make_scoped_service(make_student("Ana"))
+
+    assert await service.delete_student(uuid.uuid4(), uuid.uuid4()) is True
+    assert [call[0] for call in calls] == ["delete"]
+
+
+@pytest.mark.asyncio
+async def test_update_e_delete_filtram_pelo_dono_no_where():
+    session = FakeSession()
+    repository = StudentRepository(session)
+    professional_id = uuid.uuid4()
+
+    await repository.update(uuid.uuid4(), {"name": "Ana"}, professional_id)
+    await repository.delete(uuid.uuid4(), professional_id)
+
+    for statement in session.statements:
+        sql = compile_pg(statement)
+        assert sql.startswith("UPDATE students SET ")
+        assert "students.professional_id = " in sql
+        assert "students.deleted_at IS NULL" in sql
+        assert "RETURNING" in sql
+
@@ -0,0 +1,81 @@
+import pytest
+
+from app.services.text_indexing import count_syllables, index_text
+
+
+@pytest.mark.parametrize(
+    "word, syllables",
+    [
+        ("gato", 2),
+        ("escola", 3),
+        ("bebê", 2),
+        ("coração", 3),
+        # Ditongos e tritongos ficam numa sílaba só
+        ("mãe", 1),
+        ("pães", 1),
+        ("boi", 1),
+        ("fui", 1),
+        ("leão", 2),
+        ("averiguei", 4),
+        # u mudo depois de q/g
+        ("que", 1),
+        ("quero", 2),
+        ("guerra", 2),
+        ("aquele", 3),
+        ("seguiu", 2),
+        # mas pronunciado em qual/quando/língua
+        ("qual", 1),
+        ("quando", 2),
+        ("língua", 3),
+        # Hiatos
+        ("rio", 2),
+        ("dia", 2),
+        ("sua", 2),
+        ("água", 3),
+        ("saúde", 3),
+        ("país", 2),
+        ("praia", 2),
+        ("ideia", 3),
+        ("areia", 3),
+        ("caiu", 2),
+        ("contribuiu", 4),
+    ],
+)
+def test_count_syllables(word, syllables):
+    assert count_syllables(word) == syllables
+
+
+def test_count_syllables_ignora_maiusculas_e_conta_ao_menos_uma():
+    assert count_syllables("ÁGUA") == 3
+    assert count_syllables("pneu") == 1
+    assert count_syllables("sr") == 1
+
+
+def test_index_text_calcula_metricas_de_leitura():
+    index = index_text("O coelho chegou. A chuva caiu na praia!")
+
+    assert index.word_count == 8
+    assert index.syllable_count == 14
+    assert index.readability_score == 96.73
+    assert index.letter_frequency["C"] == 4
+    assert index.grapheme_frequency == {"CH": 2, "LH": 1, "PR": 1}
+
+
+def test_index_text_legibilidade_cai_com_palavras_longas():
+    easy = index_text("O gato bebe o leite.")
+    hard = index_text("Paralelepípedos extraordinariamente desproporcionais inviabilizaram deslocamentos.")
+
+    assert hard.readability_score < easy.readability_score
+    assert 0.0 <= hard.readability_score <= 100.0
+
+
+def test_index_text_vazio():
+    index = index_text("")
+
+    assert index.as_columns() == {
+        "word_count": 0,
+        "syllable_count": 0,
+        "readability_score": None,
+        "letter_frequency": {},
+        "grapheme_frequency": {},
+    }
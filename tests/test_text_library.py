@@ -0,0 +1,205 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.models.trail import TrailDifficulty
+from app.repositories.text_library_repository import TextLibraryRepository
+from app.services.text_library_service import TextLibraryService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+BASE_TIME = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def make_text(index=0):
+    created_at = BASE_TIME - timedelta(minutes=index)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=f"Texto {index}",
+        subtitle=None,
+        content="O sapo pulou no lago.",
+        difficulty=TrailDifficulty.beginner,
+        age_range_min=None,
+        age_range_max=None,
+        letters_focus=None,
+        tags=None,
+        word_count=5,
+        is_public=True,
+        created_by=None,
+        created_at=created_at,
+        updated_by=None,
+        updated_at=created_at,
+    )
+
+
+class FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def compile_pg(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def make_search_service(rows):
+    service = TextLibraryService(FakeSession())
+    calls = []
+
+    async def search(search_text, **filters):
+        calls.append((search_text, filters))
+        return rows[: filters["limit"]]
+
+    service.text_library_repository.search = search
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_busca_pagina_por_relevancia():
+    rows = [(make_text(index), 1.0 - index / 10, f"<mark>sapo</mark> {index}") for index in range(3)]
+    service, calls = make_search_service(rows)
+
+    response = await service.search_texts("sapo", limit=2)
+
+    assert calls[0][1]["limit"] == 3
+    assert [result.rank for result in response.results] == [1.0, 0.9]
+    assert response.results[0].headline == "<mark>sapo</mark> 0"
+    assert decode_cursor(response.next_cursor) == (repr(0.9), rows[1][0].id)
+
+
+@pytest.mark.asyncio
+async def test_busca_repassa_cursor_como_relevancia_e_id():
+    service, calls = make_search_service([])
+    text_id = uuid.uuid4()
+
+    response = await service.search_texts("sapo", cursor=encode_cursor(repr(0.42), text_id))
+
+    assert calls[0][1]["after"] == (0.42, text_id)
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_busca_com_cursor_invalido_retorna_400():
+    service, calls = make_search_service([])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.search_texts("sapo", cursor=encode_cursor("alto", uuid.uuid4()))
+
+    assert exc_info.value.status_code == 400
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_consulta_de_busca_combina_texto_completo_e_trigramas_sem_carregar_conteudo():
+    session = FakeSession()
+
+    await TextLibraryRepository(session).search("sapo no lago", after=(0.5, uuid.uuid4()))
+
+    sql = compile_pg(session.statements[0])
+    entity_columns = sql.split(" FROM ")[0].split("CAST(")[0]
+    assert "websearch_to_tsquery" in sql
+    assert "similarity(text_library.title" in sql
+    assert "text_library.title %% " in sql
+    assert "ts_headline" in sql
+    assert "text_library.content" not in entity_columns
+    assert "text_library.search_vector" not in entity_columns
+
+
+def make_list_service(texts):
+    service = TextLibraryService(FakeSession())
+    calls = []
+    counts = []
+
+    async def get_page(**kwargs):
+        calls.append(kwargs)
+        page = texts[: kwargs["limit"]]
+        return page, (len(texts) if page else None)
+
+    async def count_all(**filters):
+        counts.append(filters)
+        return 0
+
+    service.text_library_repository.get_page = get_page
+    service.text_library_repository.count_all = count_all
+    return service, calls, counts
+
+
+@pytest.mark.asyncio
+async def test_listagem_resumida_pagina_sem_conteudo():
+    texts = [make_text(index) for index in range(3)]
+    service, calls, counts = make_list_service(texts)
+
+    response = await service.get_all_texts(limit=2, summary=True)
+
+    assert calls[0]["limit"] == 3
+    assert calls[0]["with_content"] is False
+    assert counts == []
+    assert response.total == 3
+    assert [text.title for text in response.texts] == ["Texto 0", "Texto 1"]
+    assert not hasattr(response.texts[0], "content")
+    assert response.next_cursor == encode_cursor(texts[1].created_at, texts[1].id)
+
+
+@pytest.mark.asyncio
+async def test_listagem_vazia_conta_o_total_separadamente():
+    service, calls, counts = make_list_service([])
+
+    response = await service.get_all_texts(cursor=encode_cursor(BASE_TIME, uuid.uuid4()))
+
+    assert calls[0]["after"][0] == BASE_TIME
+    assert len(counts) == 1
+    assert response.total == 0
+    assert response.next_cursor is None
+
+
+class PageRow(tuple):
+    def __new__(cls, text, total):
+        return super().__new__(cls, (text, total))
+
+    @property
+    def total(self):
+        return self[1]
+
+
+@pytest.mark.asyncio
+async def test_pagina_traz_total_pela_funcao_de_janela():
+    texts = [make_text(index) for index in range(2)]
+    session = FakeSession(rows=[PageRow(text, 7) for text in texts])
+
+    page, total = await TextLibraryRepository(session).get_page(
+        after=(BASE_TIME, uuid.uuid4()), limit=3, with_content=False
+    )
+
+    sql = compile_pg(session.statements[0])
+    assert "count(*) OVER ()" in sql
+    assert "text_library.content" not in sql.split(" FROM ")[0]
+    assert page == texts
+    assert total == 7
+
+
+@pytest.mark.asyncio
+async def test_busca_repassa_filtros_de_grafemas_e_legibilidade():
+    service, calls = make_search_service([])
+
+    await service.search_texts("sapo", graphemes=["LH", "NH"], readability_min=70.0)
+
+    assert calls[0][1]["graphemes"] == ["LH", "NH"]
+    assert calls[0][1]["readability_min"] == 70.0
+
+
+@pytest.mark.asyncio
+async def test_consulta_de_busca_filtra_por_grafemas_e_legibilidade():
+    session = FakeSession()
+
+    await TextLibraryRepository(session).search("sapo", graphemes=["LH"], readability_min=70.0)
+
+    sql = compile_pg(session.statements[0])
+    assert "text_library.grapheme_frequency ?& ARRAY" in sql
+    assert "text_library.readability_score >= " in sql
@@ -0,0 +1,78 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.trail import TrailDifficulty
+from app.repositories.trail_repository import TrailRepository
+
+
+class FakeScalarResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def one(self):
+        (row,) = self._rows
+        return row
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        return FakeScalarResult(self.results.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def compile_pg(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.asyncio
+async def test_create_with_stories_usa_um_insert_returning_por_tabela():
+    trail = SimpleNamespace(id=uuid.uuid4())
+    stories = [SimpleNamespace(order_position=2), SimpleNamespace(order_position=1)]
+    session = FakeSession([trail], stories)
+    stories_data = [
+        {"title": "Segunda", "content": "b", "order_position": 2},
+        {"title": "Primeira", "content": "a", "order_position": 1},
+    ]
+
+    created_trail, created_stories = await TrailRepository(session).create_with_stories(
+        {"title": "Trilha", "difficulty": TrailDifficulty.beginner}, stories_data
+    )
+
+    assert created_trail is trail
+    assert [story.order_position for story in created_stories] == [1, 2]
+    assert session.commits == 1
+    assert len(session.statements) == 2
+
+    trail_insert, stories_insert = (compile_pg(statement) for statement in session.statements)
+    trail_id = trail_insert.params["id"]
+    assert "RETURNING" in str(trail_insert)
+    assert "RETURNING" in str(stories_insert)
+    assert stories_insert.params["trail_id_m0"] == trail_id
+    assert stories_insert.params["trail_id_m1"] == trail_id
+
+
+@pytest.mark.asyncio
+async def test_create_with_stories_sem_commit_deixa_a_transacao_aberta():
+    session = FakeSession([SimpleNamespace(id=uuid.uuid4())])
+
+    _, stories = await TrailRepository(session).create_with_stories(
+        {"title": "Trilha", "difficulty": TrailDifficulty.beginner}, [], commit=False
+    )
+
+    assert stories == []
+    assert len(session.statements) == 1
+    assert session.commits == 0
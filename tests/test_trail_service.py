@@ -0,0 +1,258 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from app.models.trail import TrailDifficulty
+from app.schemas.trail import TrailCreate, TrailStoryBase
+from app.services import trail_service
+from app.services.trail_service import TrailService
+from app.services.versioned_cache import VersionedCache
+from app.utils.pagination import decode_datetime_cursor, encode_cursor
+
+BASE_TIME = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def make_story(trail_id, position):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        trail_id=trail_id,
+        title=f"História {position}",
+        subtitle=None,
+        content="O gato pulou o muro.",
+        letters_focus=None,
+        phonemes_focus=None,
+        order_position=position,
+        difficulty=None,
+        word_count=5,
+        estimated_time=None,
+        created_by=None,
+        created_at=BASE_TIME,
+        updated_by=None,
+        updated_at=BASE_TIME,
+    )
+
+
+def make_trail(index=0, stories=0, is_default=False):
+    trail_id = uuid.uuid4()
+    created_at = BASE_TIME - timedelta(minutes=index)
+    return SimpleNamespace(
+        id=trail_id,
+        title=f"Trilha {index}",
+        description=None,
+        difficulty=TrailDifficulty.beginner,
+        is_default=is_default,
+        age_range_min=None,
+        age_range_max=None,
+        created_by=None,
+        created_at=created_at,
+        updated_by=None,
+        updated_at=created_at,
+        stories=[make_story(trail_id, position) for position in range(stories)],
+    )
+
+
+class FakeSession:
+    """Só atende as consultas de versão do cache; o resto vem dos repositórios falsos."""
+
+    def __init__(self):
+        self.commits = 0
+        self.version = 0
+        self.sync_session = Session()
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            self.version += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.version, scalar_one=lambda: self.version)
+
+    async def commit(self):
+        self.commits += 1
+        self.sync_session.commit()
+
+
+def make_service(trails):
+    service = TrailService(FakeSession())
+    calls = []
+
+    async def count_all(**filters):
+        return len(trails)
+
+    async def get_all(**filters):
+        calls.append(filters)
+        limit = filters.get("limit")
+        return trails[:limit] if limit else list(trails)
+
+    async def get_all_by_trail(trail_id):
+        raise AssertionError("as histórias devem vir carregadas com a trilha")
+
+    service.trail_repository.count_all = count_all
+    service.trail_repository.get_all = get_all
+    service.story_repository.get_all_by_trail = get_all_by_trail
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_listagem_usa_historias_carregadas_com_a_trilha():
+    trails = [make_trail(0, stories=2), make_trail(1, stories=1)]
+    service, calls = make_service(trails)
+
+    response = await service.get_all_trails()
+
+    assert len(calls) == 1
+    assert response.total == 2
+    assert [len(trail.stories) for trail in response.trails] == [2, 1]
+    assert response.trails[0].stories[1].title == "História 1"
+
+
+@pytest.mark.asyncio
+async def test_listagem_paginada_busca_uma_linha_a_mais_para_o_cursor():
+    trails = [make_trail(index) for index in range(3)]
+    service, calls = make_service(trails)
+
+    response = await service.get_all_trails(limit=2)
+
+    assert calls[0]["limit"] == 3
+    assert [trail.title for trail in response.trails] == ["Trilha 0", "Trilha 1"]
+    assert decode_datetime_cursor(response.next_cursor) == (trails[1].created_at, trails[1].id)
+
+
+@pytest.mark.asyncio
+async def test_ultima_pagina_nao_tem_cursor():
+    trails = [make_trail(index) for index in range(2)]
+    service, calls = make_service(trails)
+
+    response = await service.get_all_trails(limit=2)
+
+    assert len(response.trails) == 2
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_repassado_ao_repositorio():
+    trails = [make_trail(index) for index in range(3)]
+    service, calls = make_service(trails)
+
+    await service.get_all_trails(limit=2, cursor=encode_cursor(trails[1].created_at, trails[1].id))
+
+    assert calls[0]["after"] == (trails[1].created_at, trails[1].id)
+
+
+@pytest.mark.asyncio
+async def test_cursor_invalido_retorna_400():
+    service, calls = make_service([])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_all_trails(cursor="lixo")
+
+    assert exc_info.value.status_code == 400
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_modo_resumo_nao_carrega_conteudo():
+    trails = [make_trail(index) for index in range(3)]
+    service, calls = make_service(trails)
+
+    async def get_summaries(**filters):
+        return [(trail, 2, 10) for trail in trails[: filters["limit"]]]
+
+    service.trail_repository.get_summaries = get_summaries
+
+    response = await service.get_all_trails(limit=2, summary=True)
+
+    assert calls == []
+    assert [(trail.story_count, trail.total_words) for trail in response.trails] == [(2, 10), (2, 10)]
+    assert response.next_cursor is not None
+
+
+@pytest.fixture
+def default_trails_cache(monkeypatch):
+    cache = VersionedCache("default_trails", check_interval=60)
+    monkeypatch.setattr(trail_service, "default_trails_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_trilhas_padrao_vem_do_cache_na_segunda_listagem(default_trails_cache):
+    service, calls = make_service([make_trail(0, is_default=True)])
+
+    first = await service.get_all_trails(is_default=True, created_by=uuid.uuid4())
+    second = await service.get_all_trails(is_default=True, created_by=uuid.uuid4())
+
+    assert len(calls) == 1
+    assert calls[0]["created_by"] is None
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_trilhas_do_profissional_nao_usam_o_cache(default_trails_cache):
+    service, calls = make_service([make_trail(0)])
+
+    await service.get_all_trails(created_by=uuid.uuid4())
+    await service.get_all_trails(created_by=uuid.uuid4())
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_excluir_trilha_padrao_invalida_o_cache_na_mesma_transacao(default_trails_cache):
+    owner_id = uuid.uuid4()
+    trail = make_trail(0, is_default=True)
+    trail.created_by = owner_id
+    service, calls = make_service([trail])
+    await service.get_all_trails(is_default=True)
+
+    async def get_by_id(trail_id):
+        return trail
+
+    async def delete(trail_id, commit=True):
+        assert commit is False
+        return True
+
+    service.trail_repository.get_by_id = get_by_id
+    service.trail_repository.delete = delete
+
+    assert await service.delete_trail(trail.id, owner_id) is True
+    assert service.session.version == 1
+    assert service.session.commits == 1
+
+    await service.get_all_trails(is_default=True)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_criar_trilha_indexa_historias_e_faz_um_unico_commit(default_trails_cache):
+    creator_id = uuid.uuid4()
+    service, _ = make_service([])
+    received = {}
+
+    async def create_with_stories(trail_data, stories_data, commit=True):
+        received.update(trail_data=trail_data, stories_data=stories_data, commit=commit)
+        trail = make_trail(0, is_default=trail_data["is_default"])
+        stories = [make_story(trail.id, story["order_position"]) for story in stories_data]
+        return trail, stories
+
+    service.trail_repository.create_with_stories = create_with_stories
+
+    response = await service.create_trail(
+        TrailCreate(
+            title="Sons do P",
+            difficulty=TrailDifficulty.beginner,
+            is_default=True,
+            stories=[
+                TrailStoryBase(title="Pato", content="O pato pula na poça.", order_position=0),
+            ],
+        ),
+        creator_id,
+    )
+
+    assert received["commit"] is False
+    assert received["stories_data"][0]["word_count"] == 5
+    assert received["stories_data"][0]["created_by"] == creator_id
+    assert service.session.version == 1
+    assert service.session.commits == 1
+    assert len(response.stories) == 1
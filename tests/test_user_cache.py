@@ -0,0 +1,150 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+
+from app.models.user import User, UserRole
+from app.utils import dependencies, user_cache as user_cache_module
+from app.utils.dependencies import TokenUser, _load_user, get_current_user_claims
+from app.utils.user_cache import UserCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(user_cache_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_entradas_expiram_apos_o_ttl(clock):
+    cache = UserCache(ttl=30)
+    cache.set(("u1", 1), "snapshot")
+
+    clock.now += 30
+    assert cache.get(("u1", 1)) == "snapshot"
+    clock.now += 1
+    assert cache.get(("u1", 1)) is None
+
+
+def test_lru_descarta_a_entrada_menos_usada(clock):
+    cache = UserCache(ttl=30, max_entries=2)
+    cache.set(("a", 1), "a")
+    cache.set(("b", 1), "b")
+    cache.get(("a", 1))
+    cache.set(("c", 1), "c")
+
+    assert cache.get(("a", 1)) == "a"
+    assert cache.get(("b", 1)) is None
+    assert cache.get(("c", 1)) == "c"
+
+
+def test_invalidate_remove_todos_os_tokens_do_usuario(clock):
+    user_id = uuid.uuid4()
+    cache = UserCache(ttl=30)
+    cache.set((str(user_id), 1), "antigo")
+    cache.set((str(user_id), 2), "novo")
+    cache.set(("outro", 1), "outro")
+
+    cache.invalidate(user_id)
+
+    assert cache.get((str(user_id), 1)) is None
+    assert cache.get((str(user_id), 2)) is None
+    assert cache.get(("outro", 1)) == "outro"
+
+
+def make_user():
+    return User(
+        id=uuid.uuid4(),
+        email="ana@letrar.com",
+        password_hash="hash",
+        name="Ana",
+        role=UserRole.professional,
+    )
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    monkeypatch.setattr(dependencies, "user_cache", UserCache(ttl=30))
+    users = {}
+    lookups = []
+
+    async def get_by_id(self, user_id):
+        lookups.append(user_id)
+        return users.get(user_id)
+
+    monkeypatch.setattr(dependencies.UserRepository, "get_by_id", get_by_id)
+    return users, lookups
+
+
+@pytest.mark.asyncio
+async def test_load_user_consulta_o_banco_uma_vez_por_token(repository):
+    users, lookups = repository
+    user = make_user()
+    users[str(user.id)] = user
+    payload = {"sub": str(user.id), "iat": 1}
+
+    first = await _load_user(payload, None)
+    second = await _load_user(payload, None)
+    third = await _load_user({**payload, "iat": 2}, None)
+
+    assert first is user
+    assert lookups == [str(user.id), str(user.id)]
+    assert second is not user
+    assert (second.id, second.email, second.role) == (user.id, user.email, user.role)
+    assert inspect(second).detached
+    assert third is not None
+
+
+@pytest.mark.asyncio
+async def test_load_user_inexistente_retorna_401_sem_cachear(repository):
+    _, lookups = repository
+    payload = {"sub": str(uuid.uuid4()), "iat": 1}
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await _load_user(payload, None)
+        assert exc_info.value.status_code == 401
+
+    assert len(lookups) == 2
+
+
+@pytest.mark.asyncio
+async def test_claims_do_token_dispensam_o_banco_quando_habilitado(monkeypatch, repository):
+    _, lookups = repository
+    user_id = uuid.uuid4()
+    payload = {"sub": str(user_id), "role": "professional", "email": "ana@letrar.com"}
+
+    async def decode(credentials, db):
+        return payload
+
+    monkeypatch.setattr(dependencies, "_decode_credentials", decode)
+    monkeypatch.setattr(dependencies.settings, "auth_trust_token_claims", True)
+
+    user = await get_current_user_claims(None, None)
+
+    assert user == TokenUser(id=user_id, email="ana@letrar.com", role=UserRole.professional)
+    assert lookups == []
+
+
+@pytest.mark.asyncio
+async def test_claims_com_papel_invalido_retornam_401(monkeypatch, repository):
+    async def decode(credentials, db):
+        return {"sub": str(uuid.uuid4()), "role": "superuser"}
+
+    monkeypatch.setattr(dependencies, "_decode_credentials", decode)
+    monkeypatch.setattr(dependencies.settings, "auth_trust_token_claims", True)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user_claims(None, None)
+
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from app.services.versioned_cache import VersionedCache
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+
+class FakeSession:
+    """Guarda a versão em memória; ``sync_session`` é real para os eventos de commit."""
+
+    def __init__(self, version=0):
+        self.version = version
+        self.reads = 0
+        self.commits = 0
+        self.sync_session = Session()
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            self.version += 1
+        else:
+            self.reads += 1
+        return FakeResult(self.version)
+
+    async def commit(self):
+        self.commits += 1
+        self.sync_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_get_consulta_a_versao_no_maximo_uma_vez_por_intervalo():
+    cache = VersionedCache("teste", check_interval=60)
+    session = FakeSession()
+
+    value, generation = await cache.get(session, "chave")
+    cache.set("chave", "valor", generation)
+
+    assert value is None
+    assert (await cache.get(session, "chave"))[0] == "valor"
+    assert session.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_versao_alterada_por_outro_worker_limpa_o_cache():
+    cache = VersionedCache("teste", check_interval=0)
+    session = FakeSession(version=1)
+    _, generation = await cache.get(session, "chave")
+    cache.set("chave", "valor", generation)
+
+    session.version = 2
+
+    assert (await cache.get(session, "chave"))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_set_descarta_valor_lido_antes_de_uma_invalidacao():
+    cache = VersionedCache("teste", check_interval=60)
+    session = FakeSession()
+    _, generation = await cache.get(session, "chave")
+
+    await cache.invalidate(session)
+    cache.set("chave", "valor antigo", generation)
+
+    assert (await cache.get(session, "chave"))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_incrementa_a_versao_sem_commit_e_limpa_de_novo_no_commit():
+    cache = VersionedCache("teste", check_interval=60)
+    session = FakeSession()
+    await cache.get(session, "chave")
+
+    await cache.invalidate(session)
+    assert session.version == 1
+    assert session.commits == 0
+
+    # Leitura concorrente grava um valor antes do commit da escrita
+    _, generation = await cache.get(session, "chave")
+    cache.set("chave", "lido antes do commit", generation)
+
+    await session.commit()
+
+    assert (await cache.get(session, "chave"))[0] is None
+    assert session.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_respeita_max_entries():
+    cache = VersionedCache("teste", check_interval=60, max_entries=2)
+    session = FakeSession()
+    _, generation = await cache.get(session, "a")
+    cache.set("a", 1, generation)
+    cache.set("b", 2, generation)
+    await cache.get(session, "a")
+    cache.set("c", 3, generation)
+
+    assert (await cache.get(session, "a"))[0] == 1
+    assert (await cache.get(session, "b"))[0] is None
+    assert (await cache.get(session, "c"))[0] == 3